@@ -22,6 +22,13 @@ class AppError(Exception):
             "message": self.message,
         }
 
+    @property
+    def headers(self) -> dict:
+        """
+        Extra response headers for this error.
+        """
+        return {}
+
 
 class NotFoundError(AppError):
     status_code = 404
@@ -33,6 +40,11 @@ class UnauthorizedError(AppError):
     error_code = "unauthorized"
 
 
+class ForbiddenError(AppError):
+    status_code = 403
+    error_code = "forbidden"
+
+
 class ValidationError(AppError):
     status_code = 422
     error_code = "validation_error"
@@ -41,3 +53,24 @@ class ValidationError(AppError):
 class ConflictError(AppError):
     status_code = 409
     error_code = "conflict"
+
+
+class ServiceUnavailableError(AppError):
+    status_code = 503
+    error_code = "service_unavailable"
+
+
+class TooManyRequestsError(AppError):
+    status_code = 429
+    error_code = "too_many_requests"
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = max(int(retry_after), 1)
+
+    def to_dict(self):
+        return {**super().to_dict(), "retry_after": self.retry_after}
+
+    @property
+    def headers(self) -> dict:
+        return {"Retry-After": str(self.retry_after)}
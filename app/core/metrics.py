@@ -0,0 +1,58 @@
+# app/core/metrics.py
+import bisect
+import threading
+from typing import Callable, Dict, List, Sequence
+
+# name -> callable returning a JSON-serializable snapshot
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collect: Callable[[], dict]) -> None:
+    """
+    Register a snapshot function exposed under GET /metrics.
+    Registering the same name again replaces the previous collector.
+    """
+    _collectors[name] = collect
+
+
+def collect_all() -> dict:
+    return {name: collect() for name, collect in _collectors.items()}
+
+
+class Histogram:
+    """
+    Tiny thread-safe cumulative histogram (process-local).
+    Buckets are upper bounds in the unit you observe (seconds for timings).
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = 0
+        buckets = {}
+        for bound, n in zip(self.buckets + [float("inf")], counts):
+            cumulative += n
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "buckets": buckets,
+        }
@@ -0,0 +1,89 @@
+# app/core/order_numbers.py
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MS_PER_DAY = 86_400_000
+MAX_WORKERS = 1000      # 3 digits
+MAX_SEQUENCE = 1000     # 3 digits: 1000 numbers per millisecond per worker
+
+
+class OrderNumberGenerator:
+    """
+    Order numbers that are unique without asking the database:
+
+        YYYYMMDD-MMMMMMMMWWWSSS
+        20261018-52312045007001
+                 |       |  '-- sequence within that millisecond
+                 |       '----- worker id (one per live process)
+                 '------------- millisecond of the (UTC) day
+
+    Two processes never share a worker id, and one process never repeats
+    (millisecond, sequence): if the clock steps back, or a millisecond's
+    1000 sequence numbers run out, it keeps counting from the last
+    millisecond it used instead of waiting. Numbers sort by creation time
+    per worker (and roughly across workers).
+    """
+
+    def __init__(self, worker_source: Optional[Callable[[], int]] = None, clock: Callable[[], float] = time.time):
+        self._worker_source = worker_source or _configured_worker_id()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._seq = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def set_worker_source(self, worker_source: Callable[[], int]) -> None:
+        with self._lock:
+            self._worker_source = worker_source
+
+    def next(self) -> str:
+        with self._lock:
+            worker = self._worker_source()
+            now = int(self._clock() * 1000)
+            if now > self._last_ms:
+                self._last_ms, self._seq = now, 0
+            else:
+                self._seq += 1
+                if self._seq >= MAX_SEQUENCE:
+                    self._last_ms, self._seq = self._last_ms + 1, 0
+            ms, seq = self._last_ms, self._seq
+
+        day = time.strftime("%Y%m%d", time.gmtime(ms // 1000))
+        return f"{day}-{ms % MS_PER_DAY:08d}{worker:03d}{seq:03d}"
+
+    def _after_fork(self) -> None:
+        # the lock may have been held by another thread at fork time
+        self._lock = threading.Lock()
+        self._last_ms, self._seq = -1, 0
+        if settings.ORDER_WORKER_ID:
+            logger.warning(
+                "process forked with fixed ORDER_WORKER_ID=%s; order numbers may collide "
+                "unless every process gets its own id",
+                settings.ORDER_WORKER_ID,
+            )
+
+
+def _configured_worker_id() -> Callable[[], int]:
+    """
+    ORDER_WORKER_ID if set; otherwise a random id until a lease is
+    installed (see app/infrastructure/redis/worker_lease.py).
+    """
+    if settings.ORDER_WORKER_ID:
+        worker = int(settings.ORDER_WORKER_ID)
+        if not 0 <= worker < MAX_WORKERS:
+            raise ValueError(f"ORDER_WORKER_ID must be between 0 and {MAX_WORKERS - 1}")
+        return lambda: worker
+    worker = random.randrange(MAX_WORKERS)
+    return lambda: worker
+
+
+order_numbers = OrderNumberGenerator()
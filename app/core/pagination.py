@@ -0,0 +1,83 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from app.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 100
+
+
+class Page(Generic[T]):
+    """
+    One page of a keyset-paginated listing.
+    next_cursor is None on the last page.
+    """
+
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode_value(v: Any):
+    if isinstance(v, datetime):
+        return {"dt": v.isoformat()}
+    return v
+
+
+def _decode_value(v: Any):
+    if isinstance(v, dict) and "dt" in v:
+        return datetime.fromisoformat(v["dt"])
+    return v
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Opaque cursor for the sort key of the last row, e.g. (sort_key, id).
+    """
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Tuple]:
+    """
+    Decode a cursor made by encode_cursor() with `size` values.
+    Returns None for an empty cursor; raises ValidationError if it's garbage.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("wrong cursor size")
+        return tuple(_decode_value(v) for v in values)
+    except (ValueError, TypeError):
+        raise ValidationError("invalid cursor")
+
+
+def build_page(rows: Sequence[T], limit: int, key: Callable[[T], Sequence[Any]]) -> Page[T]:
+    """
+    rows were fetched with LIMIT limit + 1; the extra row only tells us
+    there is a next page.
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(*key(items[-1]))
+    return Page(items, next_cursor)
+
+
+def clamp_limit(limit: Optional[int], default: int = 50, maximum: int = MAX_PAGE_SIZE) -> int:
+    if not limit or limit < 1:
+        return default
+    return min(limit, maximum)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index
 from app.infrastructure.db.base import Base
 
 
@@ -16,3 +16,8 @@ class BlogPost(Base):
     published_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # keyset pagination of published posts: (published_at, id)
+        Index("ix_blog_posts_published", "is_published", "published_at", "id"),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, DECIMAL
 from app.infrastructure.db.base import Base
 
 
@@ -9,5 +9,9 @@ class Cart(Base):
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
     status = Column(String(50), default="ACTIVE")
+    # denormalized from cart_items, kept up to date by the repository
+    total_amount = Column(DECIMAL(12, 2), nullable=False, default=0)
+    item_count = Column(Integer, nullable=False, default=0)   # sum of quantities
+    version = Column(Integer, nullable=False, default=0)      # bumped on every change (ETag)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.infrastructure.db.base import Base
+
+
+class InventoryLedgerEntry(Base):
+    """
+    Append-only stock movements (never updated or deleted).
+    delta < 0 takes stock (RESERVE), delta > 0 gives it back (RELEASE,
+    RESTOCK); products.stock is the running balance.
+    """
+
+    __tablename__ = "inventory_ledger"
+
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True, index=True)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String(30), nullable=False)   # RESERVE, RELEASE, RESTOCK
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_inventory_ledger_product_id_id", "product_id", "id"),
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.infrastructure.db.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    Domain events written in the same transaction as the change they
+    describe, delivered later by the outbox dispatcher (at least once).
+    Delivered events are deleted; the table only holds the backlog and
+    events that gave up (DEAD).
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(64), nullable=False)      # order.created, order.paid, order.cancelled, payment.needs_refund
+    aggregate_id = Column(Integer)                       # e.g. the order id
+    payload = Column(Text, nullable=False)               # JSON
+    status = Column(String(20), nullable=False, default="PENDING")   # PENDING, PROCESSING, DEAD
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # retry backoff / end of a claim's lease
+    claimed_at = Column(DateTime)                        # set by the claim that is delivering it
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # dispatcher claim: WHERE status IN ('PENDING', 'PROCESSING') AND available_at <= ? ORDER BY id
+        Index("ix_outbox_events_pending", "status", "available_at", "id"),
+    )
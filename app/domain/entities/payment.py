@@ -9,9 +9,9 @@ class Payment(Base):
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     amount = Column(DECIMAL(10, 2), nullable=False)
-    status = Column(String(50), default="INIT")   # INIT, SUCCESS, FAILED
+    status = Column(String(50), default="INIT")   # INIT, PENDING, VERIFYING, SUCCESS, FAILED, NEEDS_REFUND
     gateway = Column(String(50))
-    gateway_ref = Column(String(255))
+    gateway_ref = Column(String(255), unique=True, index=True)   # gateway authority
     tracking_code = Column(String(255))
     raw_response = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
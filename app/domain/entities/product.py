@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, DECIMAL, Index
 from app.infrastructure.db.base import Base
 
 
@@ -23,3 +23,14 @@ class Product(Base):
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # MariaDB full-text search (see infrastructure/search/fulltext.py);
+        # SQLite uses an FTS5 table instead
+        Index(
+            "ft_products_search", "title", "slug", "platform", mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect=("mysql", "mariadb")),
+        # category pages: WHERE category_id = ? AND is_active = ? ORDER BY id DESC
+        # is a single index range, keyset cursors included
+        Index("ix_products_category_active_id", "category_id", "is_active", "id"),
+    )
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, DECIMAL
+from app.infrastructure.db.base import Base
+
+
+class ProductSalesDaily(Base):
+    """
+    Per product, per (UTC) day sales counters, maintained incrementally
+    when orders are created / paid. Feeds the top-sellers listing.
+    """
+
+    __tablename__ = "product_sales_daily"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True, index=True)
+
+    orders_count = Column(Integer, nullable=False, default=0)
+    units_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
+
+    paid_units = Column(Integer, nullable=False, default=0)
+    paid_revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
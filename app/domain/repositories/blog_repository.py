@@ -1,6 +1,7 @@
 # app/domain/repositories/blog_repository.py
 from abc import ABC, abstractmethod
 from typing import Optional, List
+from app.core.pagination import Page
 from app.domain.entities.blog_post import BlogPost
 
 
@@ -22,8 +23,12 @@ class IBlogRepository(ABC):
         self,
         is_published: Optional[bool] = True,
         limit: int = 50,
-        offset: int = 0,
-    ) -> List[BlogPost]:
+        cursor: Optional[str] = None,
+    ) -> Page[BlogPost]:
+        """
+        Latest published_at first (unscheduled posts last), keyset-paginated
+        on (published_at, id).
+        """
         ...
 
     @abstractmethod
@@ -1,12 +1,20 @@
 # app/domain/repositories/cart_repository.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from app.domain.entities.cart import Cart
 from app.domain.entities.cart_item import CartItem
 
 
 class ICartRepository(ABC):
+    """
+    Cart repository interface. Item mutations keep the cart's
+    total_amount / item_count / version up to date.
+    """
+
+    # False: writes apply immediately, not with the caller's transaction
+    transactional: bool = True
+
     @abstractmethod
     def get_by_user(self, user_id: int) -> Optional[Cart]:
         ...
@@ -23,10 +31,21 @@ class ICartRepository(ABC):
     def get_items(self, cart_id: int) -> List[CartItem]:
         ...
 
+    @abstractmethod
+    def get_cart_with_items(self, cart_id: int) -> Optional[Tuple[Cart, List[CartItem]]]:
+        """
+        The cart (with its totals) and its items in one query.
+        """
+        ...
+
     @abstractmethod
     def get_item_by_id(self, item_id: int) -> Optional[CartItem]:
         ...
 
+    @abstractmethod
+    def get_item_with_cart(self, item_id: int) -> Optional[Tuple[CartItem, Cart]]:
+        ...
+
     @abstractmethod
     def get_item_by_cart_and_product(
         self, cart_id: int, product_id: int
@@ -37,6 +56,15 @@ class ICartRepository(ABC):
     def add_item(self, item: CartItem) -> CartItem:
         ...
 
+    @abstractmethod
+    def add_quantity(self, item: CartItem) -> CartItem:
+        """
+        Add item.quantity units of item.product_id to the cart in one atomic
+        step: onto the cart's existing line for that product (keeping its
+        price snapshot), else `item` becomes a new line. Returns the line.
+        """
+        ...
+
     @abstractmethod
     def update_item(self, item: CartItem) -> CartItem:
         ...
@@ -0,0 +1,37 @@
+# app/domain/repositories/category_repository.py
+from abc import ABC, abstractmethod
+from typing import Optional, List
+from app.domain.entities.category import Category
+
+
+class ICategoryRepository(ABC):
+    """
+    Product category repository interface.
+    """
+
+    @abstractmethod
+    def get_by_id(self, category_id: int) -> Optional[Category]:
+        ...
+
+    @abstractmethod
+    def get_by_slug(self, slug: str) -> Optional[Category]:
+        ...
+
+    @abstractmethod
+    def get_id_by_slug(self, slug: str) -> Optional[int]:
+        """
+        id of the active category with this slug (used by product filters).
+        """
+        ...
+
+    @abstractmethod
+    def list_categories(self, is_active: Optional[bool] = True) -> List[Category]:
+        ...
+
+    @abstractmethod
+    def create(self, category: Category) -> Category:
+        ...
+
+    @abstractmethod
+    def update(self, category: Category) -> Category:
+        ...
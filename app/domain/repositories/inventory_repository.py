@@ -0,0 +1,37 @@
+# app/domain/repositories/inventory_repository.py
+from abc import ABC, abstractmethod
+from typing import Dict, List
+from app.domain.entities.inventory_ledger import InventoryLedgerEntry
+
+
+class IInventoryRepository(ABC):
+    """
+    Stock reservation on products.stock plus the inventory ledger.
+    NULL stock means unlimited and is never reserved.
+    """
+
+    @abstractmethod
+    def reserve(self, product_id: int, quantity: int) -> bool:
+        """
+        Take `quantity` units in one conditional UPDATE.
+        False if there is not enough stock (nothing changed).
+        """
+        ...
+
+    @abstractmethod
+    def release(self, product_id: int, quantity: int) -> None:
+        ...
+
+    @abstractmethod
+    def append(self, entries: List[InventoryLedgerEntry]) -> None:
+        """
+        Write ledger entries (one multi-row INSERT).
+        """
+        ...
+
+    @abstractmethod
+    def reserved_for_order(self, order_id: int) -> Dict[int, int]:
+        """
+        {product_id: units still held} for an order, from its ledger entries.
+        """
+        ...
@@ -1,6 +1,8 @@
 # app/domain/repositories/order_repository.py
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, List
+from app.core.pagination import Page
 from app.domain.entities.order import Order
 from app.domain.entities.order_item import OrderItem
 
@@ -15,12 +17,23 @@ class IOrderRepository(ABC):
     def get_by_id(self, order_id: int) -> Optional[Order]:
         ...
 
+    @abstractmethod
+    def get_for_update(self, order_id: int) -> Optional[Order]:
+        """
+        The current row, locked until the transaction ends (SELECT ... FOR
+        UPDATE).
+        """
+        ...
+
     @abstractmethod
     def get_by_order_number(self, order_number: str) -> Optional[Order]:
         ...
 
     @abstractmethod
-    def list_by_user(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Order]:
+    def list_by_user(self, user_id: int, limit: int = 50, cursor: Optional[str] = None) -> Page[Order]:
+        """
+        Newest first, keyset-paginated on id.
+        """
         ...
 
     @abstractmethod
@@ -37,3 +50,32 @@ class IOrderRepository(ABC):
     @abstractmethod
     def update(self, order: Order) -> Order:
         ...
+
+    @abstractmethod
+    def get_items(self, order_id: int) -> List[OrderItem]:
+        ...
+
+    @abstractmethod
+    def mark_paid(self, order_id: int) -> bool:
+        """
+        Atomically flip an unpaid PENDING order to PAID.
+        Returns False if it was already paid, is no longer PENDING
+        (cancelled / expired) or doesn't exist, so callers can make their
+        side effects run once.
+        """
+        ...
+
+    @abstractmethod
+    def cancel(self, order_id: int, status: str = "CANCELLED") -> bool:
+        """
+        Atomically move an unpaid PENDING order to `status`
+        (CANCELLED / EXPIRED). False if it wasn't cancellable anymore.
+        """
+        ...
+
+    @abstractmethod
+    def list_expired_ids(self, created_before: datetime, limit: int = 100) -> List[int]:
+        """
+        Unpaid PENDING orders created before the cutoff, oldest first.
+        """
+        ...
@@ -0,0 +1,53 @@
+# app/domain/repositories/outbox_repository.py
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from app.domain.entities.outbox_event import OutboxEvent
+
+
+class IOutboxRepository(ABC):
+    """
+    Transactional outbox: services add() events inside their unit of work;
+    the dispatcher claims, deletes and reschedules them, each step in its
+    own short transaction.
+    """
+
+    @abstractmethod
+    def add(self, event_type: str, aggregate_id: Optional[int], payload: dict) -> None:
+        ...
+
+    @abstractmethod
+    def claim(self, limit: int, now: datetime, lease_until: datetime) -> List[OutboxEvent]:
+        """
+        Mark up to `limit` due events (oldest first) PROCESSING with
+        claimed_at = now until `lease_until`, skipping rows another
+        dispatcher is claiming. Due: PENDING and available, or PROCESSING
+        past its lease (the dispatcher that claimed it died).
+        """
+        ...
+
+    @abstractmethod
+    def delete(self, event_ids: List[int], claimed_at: datetime) -> None:
+        """
+        Delete delivered events that are still held by the claim made at
+        `claimed_at` (not re-claimed after their lease ran out).
+        """
+        ...
+
+    @abstractmethod
+    def reschedule(
+        self, event_id: int, claimed_at: datetime, available_at: datetime, error: str, dead: bool = False
+    ) -> None:
+        """
+        Back to PENDING (or DEAD) after a failed delivery, if still held by
+        the claim made at `claimed_at`.
+        """
+        ...
+
+    @abstractmethod
+    def backlog(self, now: datetime) -> dict:
+        """
+        {"pending": n, "processing": n, "dead": n, "oldest_pending_age_seconds": s | None}
+        """
+        ...
@@ -0,0 +1,47 @@
+# app/domain/repositories/payment_gateway.py
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class GatewayError(Exception):
+    """
+    The gateway could not be reached or answered with something unusable
+    (after retries). The operation may be retried later.
+    """
+
+
+class PaymentRequestResult:
+    def __init__(self, authority: str, payment_url: str, raw: str = ""):
+        self.authority = authority
+        self.payment_url = payment_url
+        self.raw = raw
+
+
+class VerificationResult:
+    def __init__(self, ok: bool, ref_id: Optional[str] = None, code: Optional[int] = None, raw: str = ""):
+        self.ok = ok
+        self.ref_id = ref_id
+        self.code = code
+        self.raw = raw
+
+
+class IPaymentGateway(ABC):
+    """
+    Payment gateway interface (Zarinpal-style redirect flow):
+    request an authority, send the user to payment_url, verify on callback.
+    Implementations do blocking HTTP; call them off the request thread.
+    """
+
+    name: str = "gateway"
+
+    @abstractmethod
+    def request(self, amount: int, description: str, callback_url: str) -> PaymentRequestResult:
+        ...
+
+    @abstractmethod
+    def verify(self, authority: str, amount: int) -> VerificationResult:
+        ...
+
+    @abstractmethod
+    def payment_url(self, authority: str) -> str:
+        ...
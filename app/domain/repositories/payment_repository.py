@@ -1,6 +1,7 @@
 # app/domain/repositories/payment_repository.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Sequence
 from app.domain.entities.payment import Payment
 
 
@@ -14,6 +15,10 @@ class IPaymentRepository(ABC):
     def get_by_id(self, payment_id: int) -> Optional[Payment]:
         ...
 
+    @abstractmethod
+    def get_by_gateway_ref(self, gateway_ref: str) -> Optional[Payment]:
+        ...
+
     @abstractmethod
     def list_by_order(self, order_id: int) -> List[Payment]:
         ...
@@ -25,3 +30,15 @@ class IPaymentRepository(ABC):
     @abstractmethod
     def update(self, payment: Payment) -> Payment:
         ...
+
+    @abstractmethod
+    def transition(self, payment_id: int, from_statuses: Sequence[str], to_status: str, **values) -> bool:
+        """
+        Move a payment to to_status (setting values) only if it is in one
+        of from_statuses; False if it was not (someone else got there first).
+        """
+        ...
+
+    @abstractmethod
+    def list_ids_by_status(self, statuses: Sequence[str], created_before: datetime, limit: int = 100) -> List[int]:
+        ...
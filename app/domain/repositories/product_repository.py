@@ -1,6 +1,7 @@
 # app/domain/repositories/product_repository.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
+from app.core.pagination import Page
 from app.domain.entities.product import Product
 
 
@@ -18,6 +19,21 @@ class IProductRepository(ABC):
     def get_by_slug(self, slug: str) -> Optional[Product]:
         ...
 
+    @abstractmethod
+    def get_for_update(self, product_id: int) -> Optional[Product]:
+        """
+        The current row, locked until the transaction ends (SELECT ... FOR
+        UPDATE), for read-modify-write. Never served from a cache.
+        """
+        ...
+
+    @abstractmethod
+    def get_many_by_ids(self, product_ids: Iterable[int]) -> Dict[int, Product]:
+        """
+        Products found, keyed by id (one query); unknown ids are absent.
+        """
+        ...
+
     @abstractmethod
     def list_products(
         self,
@@ -25,8 +41,13 @@ class IProductRepository(ABC):
         search: Optional[str] = None,
         is_active: Optional[bool] = True,
         limit: int = 50,
-        offset: int = 0,
-    ) -> List[Product]:
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
+        """
+        With `search`, results are full-text matches ordered by relevance;
+        otherwise newest first. Pass the previous page's next_cursor to
+        continue.
+        """
         ...
 
     @abstractmethod
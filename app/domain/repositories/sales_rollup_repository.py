@@ -0,0 +1,41 @@
+# app/domain/repositories/sales_rollup_repository.py
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional
+from app.domain.entities.order import Order
+from app.domain.entities.order_item import OrderItem
+
+
+class ISalesRollupRepository(ABC):
+    """
+    product_sales_daily rollup: daily per-product sales counters.
+    """
+
+    @abstractmethod
+    def record_order(self, order: Order, items: List[OrderItem]) -> None:
+        """
+        Add a newly created order to the day it was created on.
+        """
+        ...
+
+    @abstractmethod
+    def record_payment(self, order: Order, items: List[OrderItem]) -> None:
+        """
+        Add a paid order to the paid_* counters of the day it was created on.
+        """
+        ...
+
+    @abstractmethod
+    def record_cancellation(self, order: Order, items: List[OrderItem]) -> None:
+        """
+        Take a cancelled/expired (unpaid) order back out of its day.
+        """
+        ...
+
+    @abstractmethod
+    def rebuild(self, since: Optional[date] = None) -> int:
+        """
+        Recompute the rollup from orders/order_items (all days, or from
+        `since`). Returns the number of rollup rows written.
+        """
+        ...
@@ -0,0 +1,77 @@
+# app/domain/repositories/sms_provider.py
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class SmsError(Exception):
+    """
+    The provider did not accept the message. retryable=False for answers
+    that will not change on a retry (invalid number, unknown template).
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class SmsMessage:
+    """
+    One SMS: either a provider template filled with `token` (OTP codes)
+    or free `text`. Serialized as JSON on the Redis queue.
+
+    expires_at (unix time): don't deliver after it (an OTP that expired
+    while queued is useless). provider: None = the default one.
+    """
+
+    def __init__(
+        self,
+        to: str,
+        text: Optional[str] = None,
+        template: Optional[str] = None,
+        token: Optional[str] = None,
+        provider: Optional[str] = None,
+        expires_at: Optional[float] = None,
+        id: Optional[str] = None,
+        attempts: int = 0,
+        created_at: Optional[float] = None,
+    ):
+        self.to = to
+        self.text = text
+        self.template = template
+        self.token = token
+        self.provider = provider
+        self.expires_at = expires_at
+        self.id = id or uuid.uuid4().hex
+        self.attempts = attempts
+        self.created_at = created_at or time.time()
+
+    def to_json(self) -> str:
+        return json.dumps(self.__dict__, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw) -> "SmsMessage":
+        return cls(**json.loads(raw))
+
+    def __repr__(self) -> str:
+        return f"<SmsMessage {self.id} to={self.to} attempts={self.attempts}>"
+
+
+class ISmsProvider(ABC):
+    """
+    SMS provider client. send() does blocking HTTP: only the SMS worker
+    calls it, never a request thread. One instance is shared by all the
+    worker's threads, at most `concurrency` of them sending at a time.
+    """
+
+    name: str = "sms"
+    concurrency: int = 4
+
+    @abstractmethod
+    def send(self, message: SmsMessage) -> None:
+        """
+        Raise SmsError if the message was not accepted.
+        """
+        ...
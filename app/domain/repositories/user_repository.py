@@ -1,6 +1,7 @@
 # app/domain/repositories/user_repository.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
+from app.core.pagination import Page
 from app.domain.entities.user import User
 from app.domain.entities.role import Role
 
@@ -23,7 +24,10 @@ class IUserRepository(ABC):
         ...
 
     @abstractmethod
-    def list_users(self, limit: int = 50, offset: int = 0) -> List[User]:
+    def list_users(self, limit: int = 50, cursor: Optional[str] = None) -> Page[User]:
+        """
+        Newest first, keyset-paginated on id.
+        """
         ...
 
     @abstractmethod
@@ -40,4 +44,30 @@ class IUserRepository(ABC):
         Return all roles for a user.
         Needed to embed roles into JWT.
         """
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    def get_roles_for_users(self, user_ids: Iterable[int]) -> Dict[int, List[Role]]:
+        """
+        Roles of several users in one query (admin listings).
+        Every requested id is in the result; users without roles map to [].
+        """
+        ...
+
+    @abstractmethod
+    def get_role_by_name(self, name: str) -> Optional[Role]:
+        ...
+
+    @abstractmethod
+    def add_role(self, user_id: int, role_id: int) -> bool:
+        """
+        Returns False if the user already had the role.
+        """
+        ...
+
+    @abstractmethod
+    def remove_role(self, user_id: int, role_id: int) -> bool:
+        """
+        Returns False if the user did not have the role.
+        """
+        ...
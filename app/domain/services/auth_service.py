@@ -1,5 +1,5 @@
 # app/domain/services/auth_service.py
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
 
 from app.core import exceptions
 from app.core.security import hash_password, verify_password, create_access_token
@@ -112,3 +112,39 @@ class AuthService:
             is_phone_verified=False,
         )
         return self.user_repo.create(new_user)
+
+    # ---- roles ----------
+    def get_roles_for_users(self, user_ids: Iterable[int]) -> Dict[int, List[str]]:
+        """
+        Role names per user, for listings (one query, not one per user).
+        """
+        if not self.user_repo:
+            raise RuntimeError("UserRepository is not set on AuthService")
+        return {
+            uid: [r.name for r in roles]
+            for uid, roles in self.user_repo.get_roles_for_users(user_ids).items()
+        }
+
+    def _user_and_role(self, user_id: int, role_name: str):
+        if not self.user_repo:
+            raise RuntimeError("UserRepository is not set on AuthService")
+        if not self.user_repo.get_by_id(user_id):
+            raise exceptions.NotFoundError("user not found")
+        role = self.user_repo.get_role_by_name(role_name)
+        if not role:
+            raise exceptions.NotFoundError(f"role {role_name!r} not found")
+        return role
+
+    def assign_role(self, user_id: int, role_name: str) -> bool:
+        """
+        Give the user a role; False if they already had it.
+        Role checks see the change as soon as it commits; tokens already
+        issued keep their old "roles" claim until they expire.
+        """
+        role = self._user_and_role(user_id, role_name)
+        return self.user_repo.add_role(user_id, role.id)
+
+    def revoke_role(self, user_id: int, role_name: str) -> None:
+        role = self._user_and_role(user_id, role_name)
+        if not self.user_repo.remove_role(user_id, role.id):
+            raise exceptions.NotFoundError(f"user does not have role {role_name!r}")
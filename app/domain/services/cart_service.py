@@ -1,12 +1,17 @@
+import logging
 from decimal import Decimal
-from typing import List
+from typing import Callable, List, Tuple
 
 from app.domain.entities.cart import Cart
 from app.domain.entities.cart_item import CartItem
+from app.domain.entities.order import Order
 from app.domain.repositories.cart_repository import ICartRepository
 from app.domain.repositories.product_repository import IProductRepository
+from app.domain.services.order_service import OrderService
 from app.core import exceptions
 
+logger = logging.getLogger(__name__)
+
 
 class CartService:
     def __init__(
@@ -59,49 +64,36 @@ class CartService:
             raise exceptions.NotFoundError("product not available")
 
         cart = self.get_or_create_cart(user_id)
-        existing = self.cart_repo.get_item_by_cart_and_product(cart.id, product_id)
-        if existing:
-            existing.quantity = existing.quantity + quantity
-            existing.line_total = Decimal(str(existing.unit_price)) * existing.quantity
-            self.cart_repo.update_item(existing)
-            return cart
-
         unit_price = Decimal(str(product.price))
-        line_total = unit_price * quantity
-        item = CartItem(
+        # added to the existing line for this product, if there is one
+        self.cart_repo.add_quantity(CartItem(
             cart_id=cart.id,
             product_id=product.id,
             title_snapshot=product.title,
             unit_price=unit_price,
             quantity=quantity,
-            line_total=line_total,
-        )
-        self.cart_repo.add_item(item)
+            line_total=unit_price * quantity,
+        ))
         return cart
 
-    def update_item(self, item_id: int, quantity: int) -> Cart:
+    def update_item(self, item_id: int, quantity: int, user_id: int | None = None) -> Cart:
         if not self.cart_repo:
             raise RuntimeError("CartRepository not set")
         if quantity <= 0:
             raise exceptions.ValidationError("quantity must be greater than zero")
 
-        item = self.cart_repo.get_item_by_id(item_id)
-        if not item:
-            raise exceptions.NotFoundError("cart item not found")
-
+        item, cart = self._get_item_with_cart(item_id, user_id)
         item.quantity = quantity
         item.line_total = Decimal(str(item.unit_price)) * quantity
         self.cart_repo.update_item(item)
-        return self._get_cart_by_item(item)
+        return cart
 
-    def remove_item(self, item_id: int) -> Cart:
+    def remove_item(self, item_id: int, user_id: int | None = None) -> Cart:
         if not self.cart_repo:
             raise RuntimeError("CartRepository not set")
-        item = self.cart_repo.get_item_by_id(item_id)
-        if not item:
-            raise exceptions.NotFoundError("cart item not found")
+        item, cart = self._get_item_with_cart(item_id, user_id)
         self.cart_repo.delete_item(item)
-        return self._get_cart_by_item(item)
+        return cart
 
     def clear_cart(self, user_id: int) -> None:
         if not self.cart_repo:
@@ -111,37 +103,94 @@ class CartService:
             return
         self.cart_repo.clear_items(cart.id)
 
+    def checkout(
+        self,
+        user_id: int,
+        order_service: OrderService,
+        after_commit: Callable[[Callable[[], None]], None] | None = None,
+    ) -> Order:
+        """
+        Turn the user's cart into an order and empty the cart, all in the
+        caller's transaction. Products are revalidated (and priced) in bulk
+        by OrderService.create_order; the cart's price snapshots are only
+        what the user was shown.
+
+        With a non-transactional cart store (Redis) the cart is emptied via
+        `after_commit` instead, so a failed order commit leaves it intact.
+        """
+        if not self.cart_repo:
+            raise RuntimeError("CartRepository not set")
+        cart = self.get_cart(user_id)
+        found = self.cart_repo.get_cart_with_items(cart.id) if cart else None
+        if not found or not found[1]:
+            raise exceptions.ValidationError("cart is empty")
+        cart, items = found
+
+        order = order_service.create_order(
+            user_id=user_id,
+            items=[{"product_id": it.product_id, "quantity": it.quantity} for it in items],
+        )
+        cart_id = cart.id
+        if after_commit is not None and not self.cart_repo.transactional:
+            def clear() -> None:
+                # the order is committed by now: a failure here must not fail the request
+                try:
+                    self.cart_repo.clear_items(cart_id)
+                except Exception:
+                    logger.exception("checkout: order %s committed but cart %s was not emptied", order.id, cart_id)
+
+            after_commit(clear)
+        else:
+            self.cart_repo.clear_items(cart_id)
+        return order
+
     def list_items(self, cart: Cart) -> List[CartItem]:
         if not self.cart_repo:
             raise RuntimeError("CartRepository not set")
         return self.cart_repo.get_items(cart.id)
 
+    @staticmethod
+    def etag(cart_id: int, version: int | None) -> str:
+        """
+        Changes whenever the cart's contents do (the repository bumps
+        cart.version on every item mutation).
+        """
+        return f"cart-{cart_id}-v{version or 0}"
+
     def to_dict(self, cart: Cart | None) -> dict:
         if not cart:
-            return {"cart_id": None, "user_id": None, "items": [], "total_amount": 0}
+            return {"cart_id": None, "user_id": None, "items": [], "total_amount": 0, "item_count": 0}
 
-        items = self.list_items(cart)
-        total = sum((item.line_total for item in items), Decimal("0.00"))
+        # re-read cart + items together: totals come from the cart row
+        found = self.cart_repo.get_cart_with_items(cart.id)
+        if not found:
+            raise exceptions.NotFoundError("cart not found")
+        cart, items = found
         return {
             "cart_id": cart.id,
             "user_id": cart.user_id,
             "status": cart.status,
+            "version": cart.version or 0,
             "items": [
                 {
                     "id": item.id,
                     "product_id": item.product_id,
                     "title_snapshot": item.title_snapshot,
-                    "unit_price": float(item.unit_price),
+                    "unit_price": item.unit_price,
                     "quantity": item.quantity,
-                    "line_total": float(item.line_total),
+                    "line_total": item.line_total,
                 }
                 for item in items
             ],
-            "total_amount": float(total),
+            "item_count": cart.item_count or 0,
+            "total_amount": cart.total_amount or 0,
         }
 
-    def _get_cart_by_item(self, item: CartItem) -> Cart:
-        cart = self.cart_repo.get_by_id(item.cart_id)
-        if not cart:
-            raise exceptions.NotFoundError("cart not found")
-        return cart
+    def _get_item_with_cart(self, item_id: int, user_id: int | None = None) -> Tuple[CartItem, Cart]:
+        """
+        user_id: only find the item in that user's cart (None: any cart).
+        """
+        found = self.cart_repo.get_item_with_cart(item_id)
+        if not found or (user_id is not None and found[1].user_id != user_id):
+            raise exceptions.NotFoundError("cart item not found")
+        return found
@@ -1,5 +1,6 @@
 # app/domain/services/content_service.py
 from typing import List, Optional
+from app.core.pagination import Page
 from app.domain.repositories.blog_repository import IBlogRepository
 from app.domain.entities.blog_post import BlogPost
 from app.core import exceptions
@@ -12,10 +13,10 @@ class ContentService:
     def set_blog_repo(self, blog_repo: IBlogRepository):
         self.blog_repo = blog_repo
 
-    def list_posts(self, limit: int = 50, offset: int = 0) -> List[BlogPost]:
+    def list_posts(self, limit: int = 50, cursor: Optional[str] = None) -> Page[BlogPost]:
         if not self.blog_repo:
             raise RuntimeError("BlogRepository not set")
-        return self.blog_repo.list_posts(is_published=True, limit=limit, offset=offset)
+        return self.blog_repo.list_posts(is_published=True, limit=limit, cursor=cursor)
 
     def get_post(self, slug: str) -> BlogPost:
         if not self.blog_repo:
@@ -34,5 +35,5 @@ class ContentService:
             "excerpt": p.excerpt,
             "content": p.content,
             "cover_image": p.cover_image,
-            "published_at": p.published_at.isoformat() if p.published_at else None,
+            "published_at": p.published_at,
         }
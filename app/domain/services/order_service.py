@@ -1,22 +1,25 @@
 # app/domain/services/order_service.py
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
 from decimal import Decimal
-from datetime import datetime
-import random
-import string
+from datetime import datetime, timedelta
 
+from app.core.order_numbers import order_numbers
+from app.core.pagination import Page
 from app.domain.repositories.order_repository import IOrderRepository
 from app.domain.repositories.product_repository import IProductRepository
+from app.domain.repositories.sales_rollup_repository import ISalesRollupRepository
+from app.domain.repositories.inventory_repository import IInventoryRepository
+from app.domain.repositories.outbox_repository import IOutboxRepository
+from app.domain.entities.inventory_ledger import InventoryLedgerEntry
 from app.domain.entities.order import Order
 from app.domain.entities.order_item import OrderItem
 from app.core import exceptions
 
 
 def _generate_order_number() -> str:
-    # simple human-readable order number
-    return datetime.utcnow().strftime("%Y%m%d") + "-" + "".join(
-        random.choices(string.digits, k=6)
-    )
+    # human-readable date prefix, unique per worker; see app/core/order_numbers.py
+    return order_numbers.next()
 
 
 class OrderService:
@@ -24,9 +27,15 @@ class OrderService:
         self,
         order_repo: IOrderRepository | None = None,
         product_repo: IProductRepository | None = None,
+        sales_repo: ISalesRollupRepository | None = None,
+        inventory_repo: IInventoryRepository | None = None,
+        outbox_repo: IOutboxRepository | None = None,
     ):
         self.order_repo = order_repo
         self.product_repo = product_repo
+        self.sales_repo = sales_repo
+        self.inventory_repo = inventory_repo
+        self.outbox_repo = outbox_repo
 
     def set_repos(self, order_repo: IOrderRepository, product_repo: IProductRepository):
         self.order_repo = order_repo
@@ -45,16 +54,31 @@ class OrderService:
         if not items:
             raise exceptions.ValidationError("order must contain at least one item")
 
+        lines = []
+        for it in items:
+            try:
+                lines.append((int(it.get("product_id")), int(it.get("quantity", 1))))
+            except (TypeError, ValueError):
+                raise exceptions.ValidationError("product_id and quantity must be integers")
+            if lines[-1][1] < 1:
+                raise exceptions.ValidationError("quantity must be greater than zero")
+
+        # one IN query (or cache round trip) for every product of the order
+        products = self.product_repo.get_many_by_ids(pid for pid, _ in lines)
+        unavailable = list(dict.fromkeys(
+            pid for pid, _ in lines
+            if pid not in products or not products[pid].is_active
+        ))
+        if unavailable:
+            noun = "product" if len(unavailable) == 1 else "products"
+            ids = ", ".join(str(pid) for pid in unavailable)
+            raise exceptions.NotFoundError(f"{noun} {ids} not available")
+
         order_items: List[OrderItem] = []
         total = Decimal("0.00")
 
-        for it in items:
-            product_id = it.get("product_id")
-            qty = int(it.get("quantity", 1))
-
-            product = self.product_repo.get_by_id(product_id)
-            if not product or not product.is_active:
-                raise exceptions.NotFoundError(f"product {product_id} not available")
+        for product_id, qty in lines:
+            product = products[product_id]
 
             unit_price = Decimal(str(product.price))
             line_total = unit_price * qty
@@ -79,8 +103,34 @@ class OrderService:
         )
 
         created_order = self.order_repo.create_order(order, order_items)
+
+        # hot rows (per product/day counters, product stock) last, so their
+        # row locks are held for as short as possible before the commit
+        if self.sales_repo:
+            self.sales_repo.record_order(created_order, order_items)
+        if self.inventory_repo:
+            self._reserve_stock(created_order, lines, products)
+        self._publish("order.created", created_order, lines)
         return created_order
 
+    def _reserve_stock(self, order: Order, lines, products) -> None:
+        wanted: Dict[int, int] = defaultdict(int)
+        for product_id, qty in lines:
+            if products[product_id].stock is not None:  # NULL stock = unlimited
+                wanted[product_id] += qty
+        if not wanted:
+            return
+
+        # ledger first: if a reservation fails the whole transaction rolls back
+        self.inventory_repo.append([
+            InventoryLedgerEntry(product_id=pid, order_id=order.id, delta=-qty, reason="RESERVE")
+            for pid, qty in wanted.items()
+        ])
+        # fixed order so two multi-item orders can't deadlock on each other
+        for product_id in sorted(wanted):
+            if not self.inventory_repo.reserve(product_id, wanted[product_id]):
+                raise exceptions.ConflictError(f"product {product_id} is out of stock")
+
     def get_order(self, order_id: int) -> Order:
         if not self.order_repo:
             raise RuntimeError("OrderService repositories not set")
@@ -90,6 +140,100 @@ class OrderService:
             raise exceptions.NotFoundError("order not found")
         return order
 
+    def mark_paid(self, order_id: int) -> Order:
+        """
+        Idempotent: paying an already paid order changes nothing. An order
+        cancelled or expired in the meantime can't be paid anymore (its
+        stock was released): ConflictError.
+        """
+        if not self.order_repo:
+            raise RuntimeError("OrderService repositories not set")
+
+        order = self.order_repo.get_by_id(order_id)
+        if not order:
+            raise exceptions.NotFoundError("order not found")
+
+        if self.order_repo.mark_paid(order_id):
+            items = self.order_repo.get_items(order_id)
+            if self.sales_repo:
+                self.sales_repo.record_payment(order, items)
+            self._publish("order.paid", order, [(i.product_id, i.quantity) for i in items])
+        elif self.order_repo.get_for_update(order_id).payment_status != "PAID":
+            raise exceptions.ConflictError("order can no longer be paid")
+        return order
+
+    def cancel_order(self, order_id: int, status: str = "CANCELLED") -> Order:
+        """
+        Cancel (or expire) an unpaid pending order and give its reserved
+        stock back.
+        """
+        if not self.order_repo:
+            raise RuntimeError("OrderService repositories not set")
+
+        order = self.order_repo.get_by_id(order_id)
+        if not order:
+            raise exceptions.NotFoundError("order not found")
+
+        if not self.order_repo.cancel(order_id, status=status):
+            raise exceptions.ConflictError("order can no longer be cancelled")
+
+        if self.inventory_repo:
+            held = self.inventory_repo.reserved_for_order(order_id)
+            self.inventory_repo.append([
+                InventoryLedgerEntry(product_id=pid, order_id=order_id, delta=qty, reason="RELEASE")
+                for pid, qty in held.items()
+            ])
+            for product_id in sorted(held):
+                self.inventory_repo.release(product_id, held[product_id])
+
+        items = self.order_repo.get_items(order_id)
+        if self.sales_repo:
+            self.sales_repo.record_cancellation(order, items)
+        self._publish("order.cancelled", order, [(i.product_id, i.quantity) for i in items])
+        return order
+
+    def _publish(self, event_type: str, order: Order, lines) -> None:
+        """
+        Record the event in the outbox, in this same transaction: SMS,
+        fulfilment and cache invalidation happen in the dispatcher, after
+        the commit (app/infrastructure/outbox/).
+        """
+        if not self.outbox_repo:
+            return
+        self.outbox_repo.add(event_type, order.id, {
+            "order_id": order.id,
+            "order_number": order.order_number,
+            "user_id": order.user_id,
+            "status": order.status,
+            "total_amount": str(order.total_amount),
+            "items": [{"product_id": pid, "quantity": qty} for pid, qty in lines],
+        })
+
+    def expire_pending_orders(self, older_than: timedelta, limit: int = 100) -> List[int]:
+        """
+        Expire up to `limit` unpaid orders older than `older_than`;
+        returns the ids that were expired.
+        """
+        if not self.order_repo:
+            raise RuntimeError("OrderService repositories not set")
+
+        expired = []
+        cutoff = datetime.utcnow() - older_than
+        for order_id in self.order_repo.list_expired_ids(cutoff, limit=limit):
+            try:
+                self.cancel_order(order_id, status="EXPIRED")
+                expired.append(order_id)
+            except exceptions.ConflictError:
+                pass  # paid or cancelled meanwhile
+        return expired
+
+    def list_user_orders(self, user_id: int, limit: int = 50, cursor: Optional[str] = None) -> Page[Order]:
+        if not self.order_repo:
+            raise RuntimeError("OrderService repositories not set")
+        if user_id is None:
+            raise exceptions.ValidationError("user_id is required")
+        return self.order_repo.list_by_user(user_id, limit=limit, cursor=cursor)
+
     # helper for controllers
     def to_dict(self, order: Order) -> dict:
         return {
@@ -98,7 +242,7 @@ class OrderService:
             "user_id": order.user_id,
             "status": order.status,
             "payment_status": order.payment_status,
-            "total_amount": float(order.total_amount) if order.total_amount is not None else 0,
+            "total_amount": order.total_amount if order.total_amount is not None else 0,
             "currency": order.currency,
-            "created_at": order.created_at.isoformat() if order.created_at else None,
+            "created_at": order.created_at,
         }
@@ -1,9 +1,13 @@
 # app/domain/services/otp_service.py
+import time
+
 from app.infrastructure.redis.otp_store import OTPStore
+from app.infrastructure.redis.sms_queue import SmsQueue, sms_queue
 from app.domain.services.auth_service import AuthService
+from app.domain.repositories.sms_provider import SmsMessage
 from app.core import exceptions
+from app.core.config import settings
 from app.domain.repositories.user_repository import IUserRepository
-from kavenegar import *
 
 
 class OTPService:
@@ -17,24 +21,38 @@ class OTPService:
         self,
         user_repo: IUserRepository | None = None,
         otp_store: OTPStore | None = None,
+        sms: SmsQueue | None = None,
     ):
         self.otp_store = otp_store or OTPStore()
+        self.sms = sms or sms_queue
         self.auth_service = AuthService(user_repo=user_repo)
 
     def send_otp(self, phone: str) -> str:
         """
-        Generate + store OTP. (Integrate with SMS gateway here.)
+        Generate + store OTP and queue the SMS (sent by the SMS worker;
+        this does not wait for the provider).
+        Raises TooManyRequestsError during the resend cooldown or a lockout.
         Returns code for debug/dev.
         """
-        # code = self.otp_store.generate_code()
-        code = 123456
-        self.otp_store.set_code(phone, code)
-        # TODO: integrate with SMS provider
-        #self.send_message(phone, code, '')
+        code = self.otp_store.generate_code()
+        wait = self.otp_store.set_code(phone, code)
+        if wait:
+            raise exceptions.TooManyRequestsError(f"no new code can be sent yet, retry in {wait}s", retry_after=wait)
+        self.sms.enqueue(SmsMessage(
+            to=phone,
+            template=settings.KAVENEGAR_OTP_TEMPLATE,
+            token=code,
+            text=f"Your MithraPay code: {code}",
+            expires_at=time.time() + self.otp_store.ttl,
+        ))
         return code
 
     def verify_otp_and_issue_token(self, phone: str, code: str) -> str:
-        ok = self.otp_store.verify_code(phone, code)
+        ok, locked_for = self.otp_store.verify_code(phone, code)
+        if locked_for:
+            raise exceptions.TooManyRequestsError(
+                f"too many wrong codes, retry in {locked_for}s", retry_after=locked_for
+            )
         if not ok:
             raise exceptions.UnauthorizedError("invalid or expired otp")
 
@@ -48,22 +66,3 @@ class OTPService:
 
         token = self.auth_service.issue_token(user)
         return token
-
-
-    def send_message(phone, otp, pattern):
-        try:
-            api = KavenegarAPI(
-                '54623179656C6B4D4747443459324D33754D5235684D352B356C4C38466C2F743445346C696B393348436B3D')
-            params = {
-                'receptor': phone,
-                'template': pattern,
-                'token': otp,
-                'type': 'sms'
-            }
-            response = api.verify_lookup(params)
-            print(response)
-        except APIException as e:
-            print(e)
-        except HTTPException as e:
-            print(e)
-
@@ -0,0 +1,191 @@
+# app/domain/services/payment_service.py
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.domain.entities.payment import Payment
+from app.domain.repositories.payment_gateway import (
+    IPaymentGateway,
+    PaymentRequestResult,
+    VerificationResult,
+)
+from app.domain.repositories.outbox_repository import IOutboxRepository
+from app.domain.repositories.payment_repository import IPaymentRepository
+from app.domain.services.order_service import OrderService
+from app.core import exceptions
+
+
+class PaymentService:
+    """
+    Payment lifecycle (Payment.status):
+
+        INIT ──request ok──> PENDING ──callback OK──> VERIFYING ──verify ok──> SUCCESS
+          └──request failed──> FAILED <──callback NOK / verify failed──┘     │
+                                                  order cancelled/expired meanwhile
+                                                                              v
+                                                                        NEEDS_REFUND
+
+    Every step is a conditional status change, so duplicate callbacks or
+    two workers racing on the same payment cannot apply it twice. Nothing
+    here talks to the gateway: the blocking calls run on the payment worker
+    pool (app/infrastructure/payments/pipeline.py), which hands their
+    results to complete_request / complete_verification.
+    """
+
+    def __init__(
+        self,
+        payment_repo: IPaymentRepository | None = None,
+        order_service: OrderService | None = None,
+        gateway: IPaymentGateway | None = None,
+        outbox_repo: IOutboxRepository | None = None,
+    ):
+        self.payment_repo = payment_repo
+        self.order_service = order_service
+        self.gateway = gateway
+        self.outbox_repo = outbox_repo
+
+    def _check(self) -> None:
+        if not self.payment_repo or not self.order_service:
+            raise RuntimeError("PaymentService repositories not set")
+
+    def _get_order(self, order_id: int, user_id: int | None):
+        order = self.order_service.get_order(order_id)
+        if user_id is not None and order.user_id != user_id:
+            raise exceptions.NotFoundError("order not found")
+        return order
+
+    def get_payment(self, payment_id: int, user_id: int | None = None) -> Payment:
+        """
+        user_id: only a payment of that user's orders (None: any payment).
+        """
+        self._check()
+        payment = self.payment_repo.get_by_id(payment_id)
+        if not payment or (
+            user_id is not None and self.order_service.get_order(payment.order_id).user_id != user_id
+        ):
+            raise exceptions.NotFoundError("payment not found")
+        return payment
+
+    def start(self, order_id: int, user_id: int | None = None) -> Payment:
+        """
+        Open a payment attempt for an unpaid pending order (of `user_id`,
+        unless None). The gateway request itself runs in the background
+        and moves it to PENDING.
+        """
+        self._check()
+        if not order_id:
+            raise exceptions.ValidationError("order_id is required")
+        order = self._get_order(order_id, user_id)
+        if order.payment_status == "PAID":
+            raise exceptions.ConflictError("order is already paid")
+        if order.status != "PENDING":
+            raise exceptions.ConflictError("order can no longer be paid")
+
+        return self.payment_repo.create(Payment(
+            order_id=order.id,
+            amount=order.total_amount,
+            status="INIT",
+            gateway=self.gateway.name if self.gateway else None,
+        ))
+
+    def complete_request(
+        self, payment_id: int, result: Optional[PaymentRequestResult], error: Optional[str] = None
+    ) -> bool:
+        self._check()
+        if result is None:
+            return self.payment_repo.transition(payment_id, ("INIT",), "FAILED", raw_response=error)
+        return self.payment_repo.transition(
+            payment_id, ("INIT",), "PENDING", gateway_ref=result.authority, raw_response=result.raw
+        )
+
+    def handle_callback(self, authority: str, ok: bool) -> Payment:
+        """
+        The user came back from the gateway. Returns the payment; if it now
+        needs verifying, its status is VERIFYING.
+        """
+        self._check()
+        if not authority:
+            raise exceptions.ValidationError("Authority is required")
+        payment = self.payment_repo.get_by_gateway_ref(authority)
+        if not payment:
+            raise exceptions.NotFoundError("payment not found")
+
+        if ok:
+            self.payment_repo.transition(payment.id, ("PENDING",), "VERIFYING")
+        else:
+            self.payment_repo.transition(payment.id, ("PENDING",), "FAILED", raw_response="cancelled by user")
+        return payment
+
+    def complete_verification(self, payment_id: int, result: VerificationResult) -> Payment:
+        self._check()
+        payment = self.get_payment(payment_id)
+        if result.ok:
+            if self.payment_repo.transition(
+                payment_id, ("VERIFYING",), "SUCCESS", tracking_code=result.ref_id, raw_response=result.raw
+            ):
+                try:
+                    self.order_service.mark_paid(payment.order_id)
+                except exceptions.ConflictError:
+                    self._set_aside(payment)
+        else:
+            self.payment_repo.transition(payment_id, ("VERIFYING",), "FAILED", raw_response=result.raw)
+        return payment
+
+    def _set_aside(self, payment: Payment) -> None:
+        """
+        The money arrived for an order that was cancelled or expired while
+        the gateway was verifying: nothing is fulfilled, the payment waits
+        for a refund and a payment.needs_refund event goes out.
+        """
+        self.payment_repo.transition(payment.id, ("SUCCESS",), "NEEDS_REFUND")
+        if not self.outbox_repo:
+            return
+        order = self.order_service.get_order(payment.order_id)
+        self.outbox_repo.add("payment.needs_refund", order.id, {
+            "payment_id": payment.id,
+            "order_id": order.id,
+            "order_number": order.order_number,
+            "user_id": order.user_id,
+            "amount": str(payment.amount),
+            "tracking_code": payment.tracking_code,
+        })
+
+    def fail_unsent(self, older_than: timedelta, limit: int = 100) -> int:
+        """
+        INIT payments whose gateway request never ran (pool full, worker
+        restarted) are abandoned by now; mark them FAILED.
+        """
+        self._check()
+        cutoff = datetime.utcnow() - older_than
+        failed = 0
+        for payment_id in self.payment_repo.list_ids_by_status(("INIT",), cutoff, limit=limit):
+            if self.payment_repo.transition(
+                payment_id, ("INIT",), "FAILED", raw_response="gateway request was never sent"
+            ):
+                failed += 1
+        return failed
+
+    def list_unverified(self, older_than: timedelta, limit: int = 100) -> List[int]:
+        """
+        VERIFYING payments whose verification never finished (gateway down,
+        pool full, worker restarted); safe to verify again.
+        """
+        self._check()
+        cutoff = datetime.utcnow() - older_than
+        return self.payment_repo.list_ids_by_status(("VERIFYING",), cutoff, limit=limit)
+
+    # helper for controllers
+    def to_dict(self, payment: Payment) -> dict:
+        return {
+            "id": payment.id,
+            "order_id": payment.order_id,
+            "amount": payment.amount if payment.amount is not None else 0,
+            "status": payment.status,
+            "gateway": payment.gateway,
+            "payment_url": (
+                self.gateway.payment_url(payment.gateway_ref)
+                if self.gateway and payment.gateway_ref and payment.status == "PENDING"
+                else None
+            ),
+            "tracking_code": payment.tracking_code,
+            "created_at": payment.created_at,
+        }
@@ -1,13 +1,20 @@
 # app/domain/services/product_service.py
 from typing import Optional, List
+from app.core.pagination import Page
 from app.domain.repositories.product_repository import IProductRepository
+from app.domain.repositories.category_repository import ICategoryRepository
 from app.domain.entities.product import Product
 from app.core import exceptions
 
 
 class ProductService:
-    def __init__(self, product_repo: IProductRepository | None = None):
+    def __init__(
+        self,
+        product_repo: IProductRepository | None = None,
+        category_repo: ICategoryRepository | None = None,
+    ):
         self.product_repo = product_repo
+        self.category_repo = category_repo
 
     def set_product_repo(self, product_repo: IProductRepository):
         self.product_repo = product_repo
@@ -18,18 +25,25 @@ class ProductService:
         search: Optional[str] = None,
         is_active: bool = True,
         limit: int = 50,
-        offset: int = 0,
-    ) -> List[Product]:
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
         if not self.product_repo:
             raise RuntimeError("ProductRepository not set")
 
-        # Note: if repo expects category_id, you can map slug -> id in repo impl
+        category_id = None
+        if category_slug:
+            if not self.category_repo:
+                raise RuntimeError("CategoryRepository not set")
+            category_id = self.category_repo.get_id_by_slug(category_slug)
+            if category_id is None:
+                raise exceptions.NotFoundError("category not found")
+
         products = self.product_repo.list_products(
-            category_id=None,  # leave None here; map in infra if needed
+            category_id=category_id,
             search=search,
             is_active=is_active,
             limit=limit,
-            offset=offset,
+            cursor=cursor,
         )
         return products
 
@@ -105,8 +119,8 @@ class ProductService:
             "title": p.title,
             "slug": p.slug,
             "category_id": p.category_id,
-            "price": float(p.price) if p.price is not None else None,
-            "compare_at_price": float(p.compare_at_price) if p.compare_at_price else None,
+            "price": p.price,
+            "compare_at_price": p.compare_at_price or None,
             "delivery_type": p.delivery_type,
             "platform": p.platform,
             "duration": p.duration,
@@ -0,0 +1 @@
+# app/infrastructure/cache/__init__.py
@@ -0,0 +1,21 @@
+# app/infrastructure/cache/app_cache.py
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.infrastructure.cache.local_cache import LocalLRUCache
+from app.infrastructure.cache.redis_cache import RedisTagCache
+from app.infrastructure.cache.two_tier import TwoTierCache
+
+# One shared cache for the whole app
+if settings.CACHE_LOCAL_ENABLED:
+    cache: RedisTagCache = TwoTierCache(
+        local=LocalLRUCache(
+            max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+            max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+            ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+        ),
+        channel=settings.CACHE_INVALIDATION_CHANNEL,
+    )
+else:
+    cache = RedisTagCache()
+
+register_collector("cache", cache.snapshot)
@@ -0,0 +1,84 @@
+# app/infrastructure/cache/category_map.py
+"""
+Per-process slug -> id map of active categories.
+
+There are few categories and they rarely change, so the whole table is
+loaded in one query and product listings resolve ?category=<slug> with a
+dict lookup. The map is dropped and reloaded on next use when:
+- a "categories" tag invalidation is heard on the cache channel (any
+  process, see TwoTierCache.add_listener) or this process commits a change
+- it is older than CATEGORY_MAP_TTL_SECONDS (safety net if pub/sub is down)
+- a slug misses and the map is older than MISS_RELOAD_SECONDS (a category
+  created by a process we didn't hear from)
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import register_collector
+
+MISS_RELOAD_SECONDS = 5.0
+
+CATEGORIES_TAG = "categories"
+
+
+class CategorySlugMap:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._map: Optional[Dict[str, int]] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self.loads = 0
+
+    def resolve(self, slug: str, loader: Callable[[], Dict[str, int]]) -> Optional[int]:
+        now = time.monotonic()
+        current = self._map
+        if current is None or now - self._loaded_at > self.ttl:
+            current = self._load(loader)
+        category_id = current.get(slug)
+        if category_id is None and now - self._loaded_at > MISS_RELOAD_SECONDS:
+            category_id = self._load(loader).get(slug)
+        return category_id
+
+    def _load(self, loader: Callable[[], Dict[str, int]]) -> Dict[str, int]:
+        generation = self._generation
+        fresh = dict(loader())
+        with self._lock:
+            self.loads += 1
+            # don't keep what we read if an invalidation raced with the query
+            if generation == self._generation:
+                self._map, self._loaded_at = fresh, time.monotonic()
+        return fresh
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._map = None
+            self._generation += 1
+
+    def on_cache_invalidate(self, tags) -> None:
+        # tags is None after a pub/sub reconnect: we may have missed one
+        if tags is None or CATEGORIES_TAG in tags:
+            self.invalidate()
+
+    def stats(self) -> dict:
+        current = self._map
+        return {
+            "loaded": current is not None,
+            "categories": len(current) if current is not None else 0,
+            "loads": self.loads,
+        }
+
+
+# One map per process
+category_slugs = CategorySlugMap(ttl=settings.CATEGORY_MAP_TTL_SECONDS)
+
+
+def install_category_map(invalidation_source=None) -> None:
+    """
+    `invalidation_source` is a cache exposing add_listener(fn(tags|None)).
+    """
+    if invalidation_source is not None and hasattr(invalidation_source, "add_listener"):
+        invalidation_source.add_listener(category_slugs.on_cache_invalidate)
+    register_collector("category_map", category_slugs.stats)
@@ -0,0 +1,251 @@
+# app/infrastructure/cache/redis_cache.py
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.infrastructure.cache.serialization import dumps, loads
+from app.infrastructure.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+MISS = object()
+
+# KEYS: the invalidation sequence, then per tag its set and its generation.
+# Delete every key listed in the tag sets and the sets themselves, and stamp
+# each tag's generation (kept ARGV[1] seconds) with the next sequence number.
+# Optionally publish ARGV[3] on channel ARGV[2] in the same round trip.
+_INVALIDATE_LUA = """
+local seq = redis.call('INCR', KEYS[1])
+for t = 2, #KEYS, 2 do
+    local members = redis.call('SMEMBERS', KEYS[t])
+    for i = 1, #members, 500 do
+        redis.call('DEL', unpack(members, i, math.min(i + 499, #members)))
+    end
+    redis.call('DEL', KEYS[t])
+    redis.call('SET', KEYS[t + 1], seq, 'EX', ARGV[1])
+end
+if ARGV[2] then
+    redis.call('PUBLISH', ARGV[2], ARGV[3])
+end
+return 1
+"""
+
+# KEYS: the entry, then per tag its set and its generation.
+# Store ARGV[1] for ARGV[2] seconds under its tags (sets kept ARGV[3]
+# seconds), unless one of them was invalidated after sequence ARGV[4]:
+# the value was read before that invalidation and is stale already.
+_SET_IF_CURRENT_LUA = """
+for t = 3, #KEYS, 2 do
+    local generation = redis.call('GET', KEYS[t])
+    if generation and tonumber(generation) > tonumber(ARGV[4]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for t = 2, #KEYS, 2 do
+    redis.call('SADD', KEYS[t], KEYS[1])
+    redis.call('EXPIRE', KEYS[t], ARGV[3])
+end
+return 1
+"""
+
+
+class CacheStats:
+    """
+    Per-name hit/miss/error counters (process-local).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: {"hits": 0, "local_hits": 0, "misses": 0, "errors": 0})
+
+    def incr(self, name: str, field: str) -> None:
+        with self._lock:
+            self._counts[name][field] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            out = {}
+            for name, c in self._counts.items():
+                hits = c["hits"] + c["local_hits"]
+                lookups = hits + c["misses"]
+                out[name] = dict(c, hit_ratio=round(hits / lookups, 4) if lookups else None)
+            return out
+
+
+class RedisTagCache:
+    """
+    Read-through cache in Redis with tag based invalidation.
+
+    Key format:  cache:{key}        -> serialized {"t": tags, "v": value} (with TTL)
+                 cache:tag:{tag}    -> set of cache keys carrying the tag
+                 cache:gen:{tag}    -> sequence number of the tag's last invalidation
+                 cache:seq          -> invalidation sequence
+
+    A read-through load notes the sequence before it queries the database
+    and only stores its result if none of the result's tags has been
+    invalidated since, so an admin edit landing between the query and the
+    SET doesn't leave the old row cached for the whole TTL.
+
+    Redis problems never fail the request: reads fall back to the
+    database and are counted as errors.
+    """
+
+    def __init__(self, client: redis.Redis = redis_client, prefix: str = "cache"):
+        self.client = client
+        self.prefix = prefix
+        self.tag_ttl = settings.CACHE_TAG_TTL_SECONDS
+        self.stats = CacheStats()
+        self._invalidate_script = client.register_script(_INVALIDATE_LUA)
+        self._set_if_current_script = client.register_script(_SET_IF_CURRENT_LUA)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.prefix}:gen:{tag}"
+
+    def _tag_keys(self, tags: Iterable[str]) -> List[str]:
+        keys = []
+        for tag in tags:
+            keys += [self._tag_key(tag), self._generation_key(tag)]
+        return keys
+
+    def _fetch(self, name: str, key: str):
+        """
+        Return (value, tags, ttl, size) from Redis or None.
+        """
+        return self._fetch_many(name, [key]).get(key)
+
+    def _fetch_many(self, name: str, keys: List[str]) -> Dict[str, tuple]:
+        """
+        {key: (value, tags, ttl, size)} for the keys found, in one round trip.
+        """
+        if not keys:
+            return {}
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(self._key(key))
+                pipe.ttl(self._key(key))
+            replies = pipe.execute()
+        except redis.RedisError:
+            logger.warning("cache get failed for %s", keys, exc_info=True)
+            for _ in keys:
+                self.stats.incr(name, "errors")
+            return {}
+
+        found = {}
+        for key, raw, ttl in zip(keys, replies[0::2], replies[1::2]):
+            if raw is None:
+                self.stats.incr(name, "misses")
+                continue
+            self.stats.incr(name, "hits")
+            envelope = loads(raw)
+            found[key] = (envelope["v"], envelope["t"], ttl, len(raw))
+        return found
+
+    def get(self, name: str, key: str) -> Any:
+        """
+        Return the cached value or MISS. `name` is the counter bucket
+        (usually "<repo>.<method>").
+        """
+        found = self._fetch(name, key)
+        return MISS if found is None else found[0]
+
+    def get_many(self, name: str, keys: List[str]) -> Dict[str, Any]:
+        """
+        {key: value} for the keys that are cached; misses are left out.
+        """
+        return {key: found[0] for key, found in self._fetch_many(name, keys).items()}
+
+    def version(self) -> Optional[int]:
+        """
+        The invalidation sequence; read it before loading what you are
+        going to set(..., since=version). None if Redis is unreachable.
+        """
+        try:
+            return int(self.client.get(f"{self.prefix}:seq") or 0)
+        except redis.RedisError:
+            logger.warning("cache version read failed", exc_info=True)
+            return None
+
+    def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = (), since: Optional[int] = None) -> Optional[int]:
+        """
+        Store value; returns its serialized size in bytes (None if it was
+        not stored, see set_many).
+        """
+        return self.set_many([(key, value, ttl, tags)], since=since)[0]
+
+    def set_many(
+        self, entries: Iterable[Tuple[str, Any, int, Iterable[str]]], since: Optional[int] = None
+    ) -> List[Optional[int]]:
+        """
+        Store (key, value, ttl, tags) entries in one round trip; returns
+        their serialized sizes. With `since` (a version() read before the
+        values were loaded) an entry is skipped, size None, if one of its
+        tags was invalidated after that.
+        """
+        serialized = []
+        for key, value, ttl, tags in entries:
+            tags = list(tags)
+            serialized.append((self._key(key), dumps({"t": tags, "v": value}), ttl, tags))
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for full_key, raw, ttl, tags in serialized:
+                if since is not None:
+                    self._set_if_current_script(
+                        keys=[full_key, *self._tag_keys(tags)], args=[raw, ttl, self.tag_ttl, since], client=pipe
+                    )
+                    continue
+                pipe.set(full_key, raw, ex=ttl)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, full_key)
+                    pipe.expire(tag_key, self.tag_ttl)
+            replies = pipe.execute()
+        except redis.RedisError:
+            logger.warning("cache set failed for %s", [e[0] for e in serialized], exc_info=True)
+            return [None if since is not None else len(raw) for _, raw, _, _ in serialized]
+        if since is None:
+            return [len(raw) for _, raw, _, _ in serialized]
+        return [len(raw) if stored else None for (_, raw, _, _), stored in zip(serialized, replies)]
+
+    def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+        self._invalidate_remote(tags)
+
+    def _invalidate_remote(self, tags, publish_args=()) -> None:
+        try:
+            self._invalidate_script(
+                keys=[f"{self.prefix}:seq", *self._tag_keys(tags)], args=[self.tag_ttl, *publish_args]
+            )
+        except redis.RedisError:
+            # entries stay until their TTL runs out
+            logger.error("cache invalidation failed for tags %s", tags, exc_info=True)
+
+    def snapshot(self) -> dict:
+        return self.stats.snapshot()
+
+    def get_or_load(self, name: str, key: str, ttl: int, loader, tags_for=None) -> Tuple[Any, bool]:
+        """
+        Return (value, from_cache). On a miss call loader(); a non-None
+        result is stored under tags_for(value), unless one of those tags
+        was invalidated while loader() ran.
+        """
+        cached = self.get(name, key)
+        if cached is not MISS:
+            return cached, True
+        since = self.version()
+        value = loader()
+        if value is not None and ttl > 0 and since is not None:
+            self.set(key, value, ttl, tags_for(value) if tags_for else (), since=since)
+        return value, False
@@ -0,0 +1,58 @@
+# app/infrastructure/cache/serialization.py
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Type
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return {"__dec__": str(value)}
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__d__": value.isoformat()}
+    raise TypeError(f"cannot cache value of type {type(value).__name__}")
+
+
+def _object_hook(obj: dict):
+    if len(obj) == 1:
+        if "__dec__" in obj:
+            return Decimal(obj["__dec__"])
+        if "__dt__" in obj:
+            return datetime.fromisoformat(obj["__dt__"])
+        if "__d__" in obj:
+            return date.fromisoformat(obj["__d__"])
+    return obj
+
+
+def dumps(value: Any) -> bytes:
+    """
+    JSON that round-trips Decimal/datetime exactly (prices must not go through float).
+    """
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+def loads(raw: bytes | str) -> Any:
+    return json.loads(raw, object_hook=_object_hook)
+
+
+def entity_to_dict(obj) -> dict:
+    """
+    Column values of an ORM entity (no relationships).
+    """
+    mapper = inspect(obj).mapper
+    return {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+
+
+def entity_from_dict(cls: Type, data: dict):
+    """
+    Rebuild an entity from entity_to_dict() output as a *detached* instance:
+    it reads like a loaded row, and session.merge() of it emits a normal UPDATE.
+    """
+    obj = cls(**data)
+    make_transient_to_detached(obj)
+    return obj
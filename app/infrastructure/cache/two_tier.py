@@ -0,0 +1,164 @@
+# app/infrastructure/cache/two_tier.py
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from app.infrastructure.cache.local_cache import LocalLRUCache
+from app.infrastructure.cache.redis_cache import MISS, RedisTagCache
+from app.infrastructure.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class TwoTierCache(RedisTagCache):
+    """
+    In-process LRU in front of the Redis tag cache.
+
+    Every invalidation is published on a Redis channel; each worker process
+    runs a subscriber thread that evicts the published tags from its local
+    tier. The local tier is only used while that subscriber is connected
+    (and is cleared on every (re)subscribe), so a worker that can't hear
+    invalidations falls back to Redis instead of serving stale data.
+    """
+
+    def __init__(
+        self,
+        local: LocalLRUCache,
+        channel: str,
+        client: redis.Redis = redis_client,
+        prefix: str = "cache",
+    ):
+        super().__init__(client=client, prefix=prefix)
+        self.local = local
+        self.channel = channel
+        self._listening = False
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, callback) -> None:
+        """
+        Also call callback(tags) for every invalidation heard on the channel
+        (from any process, this one included), and callback(None) after a
+        reconnect, when messages may have been missed.
+        """
+        self._listeners.append(callback)
+        self._ensure_listener()
+
+    def _notify(self, tags) -> None:
+        for callback in self._listeners:
+            try:
+                callback(tags)
+            except Exception:
+                logger.exception("cache invalidation listener failed")
+
+    # ---- reads ----------
+    def get(self, name: str, key: str) -> Any:
+        self._ensure_listener()
+        if self._listening:
+            value = self.local.get(key)
+            if value is not MISS:
+                self.stats.incr(name, "local_hits")
+                return value
+
+        found = self._fetch(name, key)
+        if found is None:
+            return MISS
+        value, tags, ttl, size = found
+        if self._listening and ttl and ttl > 0:
+            self.local.set(key, value, size, ttl, tags)
+        return value
+
+    def get_many(self, name: str, keys: List[str]) -> Dict[str, Any]:
+        self._ensure_listener()
+        values: Dict[str, Any] = {}
+        remote = keys
+        if self._listening:
+            remote = []
+            for key in keys:
+                value = self.local.get(key)
+                if value is MISS:
+                    remote.append(key)
+                else:
+                    self.stats.incr(name, "local_hits")
+                    values[key] = value
+
+        for key, (value, tags, ttl, size) in self._fetch_many(name, remote).items():
+            if self._listening and ttl and ttl > 0:
+                self.local.set(key, value, size, ttl, tags)
+            values[key] = value
+        return values
+
+    def set_many(
+        self, entries: Iterable[Tuple[str, Any, int, Iterable[str]]], since: Optional[int] = None
+    ) -> List[Optional[int]]:
+        entries = [(key, value, ttl, list(tags)) for key, value, ttl, tags in entries]
+        sizes = super().set_many(entries, since=since)
+        if self._listening:
+            for (key, value, ttl, tags), size in zip(entries, sizes):
+                if size is not None:
+                    self.local.set(key, value, size, ttl, tags)
+        return sizes
+
+    # ---- invalidation ----------
+    def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+        self.local.invalidate(tags)
+        self._invalidate_remote(tags, publish_args=(self.channel, json.dumps(list(tags))))
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._start_lock:
+            if self._listener_pid == pid:
+                return
+            # first use in this process (or we were forked by gunicorn):
+            # whatever the parent cached locally can't be trusted
+            self._listener_pid = pid
+            self._listening = False
+            self.local.clear()
+            threading.Thread(target=self._listen, name="cache-invalidation", daemon=True).start()
+
+    def _listen(self) -> None:
+        backoff = 0.5
+        reconnect = False
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # anything published while we were away is lost
+                        self.local.clear()
+                        self._listening = True
+                        backoff = 0.5
+                        if reconnect:
+                            self._notify(None)
+                        reconnect = True
+                    elif message["type"] == "message":
+                        tags = json.loads(message["data"])
+                        self.local.invalidate(tags)
+                        self._notify(tags)
+            except Exception:
+                logger.warning("cache invalidation subscriber disconnected", exc_info=True)
+            finally:
+                self._listening = False
+                self.local.clear()
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def snapshot(self) -> dict:
+        out = super().snapshot()
+        out["local"] = dict(self.local.stats(), subscribed=self._listening)
+        return out
@@ -0,0 +1,19 @@
+# app/infrastructure/db/keyset.py
+"""
+Keyset ("seek") predicates for cursor pagination.
+
+A page ordered by (sort_key, id) continues with
+    sort_key < :last_key OR (sort_key = :last_key AND id < :last_id)
+which an index on the sort columns answers with a range scan, so deep
+pages cost the same as the first one (unlike OFFSET).
+"""
+from sqlalchemy import and_, or_
+
+
+def seek_after(sort_col, last_key, id_col, last_id, descending: bool = True):
+    """
+    Rows after (last_key, last_id) for ORDER BY sort_col [DESC|ASC], id DESC.
+    """
+    beyond = sort_col < last_key if descending else sort_col > last_key
+    return or_(beyond, and_(sort_col == last_key, id_col < last_id))
+
@@ -1,32 +1,100 @@
 # app/infrastructure/db/maria_engine.py
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
+import time
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.pool import QueuePool
+
 from app.core.config import settings
+from app.core.metrics import Histogram, register_collector
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection
+    (including the time to open a new one) and how many checkouts timed out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
 
 
-def get_engine():
+def _pool_kwargs() -> dict:
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_stats(engine: Engine) -> dict:
+    """
+    Live statistics of an engine's pool (this process only).
+    """
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["checkout_timeouts"] = pool.checkout_timeouts
+        stats["checkout_wait_seconds"] = pool.checkout_wait.snapshot()
+    return stats
+
+
+def get_engine(name: str = "primary", url: str | None = None) -> Engine:
+    """
+    Build the primary engine from DB_* settings, or an engine for an
+    explicit URL (used for read replicas). Both share the pool settings.
+    """
+    if url:
+        connect_args = {}
+        if url.startswith("mysql"):
+            connect_args = {"charset": "utf8mb4", "collation": "utf8mb4_unicode_ci"}
+        engine = create_engine(url, echo=False, future=True, connect_args=connect_args, **_pool_kwargs())
     # if you ever want sqlite, keep this
-    if os.getenv("DB_ENGINE", "").lower() == "sqlite":
-        return create_engine("sqlite:///./mithrapay.db", echo=False, future=True)
-
-    url = URL.create(
-        drivername="mysql+mysqlconnector",
-        username=settings.DB_USER,
-        password=settings.DB_PASS,
-        host=settings.DB_HOST,
-        port=int(settings.DB_PORT),
-        database=settings.DB_NAME,
-    )
-
-    # tell the connector to use a collation MariaDB actually has
-    engine = create_engine(
-        url,
-        echo=False,
-        future=True,
-        connect_args={
-            "charset": "utf8mb4",
-            "collation": "utf8mb4_unicode_ci",
-        },
-    )
+    elif os.getenv("DB_ENGINE", "").lower() == "sqlite":
+        engine = create_engine("sqlite:///./mithrapay.db", echo=False, future=True, **_pool_kwargs())
+    else:
+        url = URL.create(
+            drivername="mysql+mysqlconnector",
+            username=settings.DB_USER,
+            password=settings.DB_PASS,
+            host=settings.DB_HOST,
+            port=int(settings.DB_PORT),
+            database=settings.DB_NAME,
+        )
+
+        # tell the connector to use a collation MariaDB actually has
+        engine = create_engine(
+            url,
+            echo=False,
+            future=True,
+            connect_args={
+                "charset": "utf8mb4",
+                "collation": "utf8mb4_unicode_ci",
+            },
+            **_pool_kwargs(),
+        )
+
+    register_collector(f"db_pool.{name}", lambda: pool_stats(engine))
     return engine
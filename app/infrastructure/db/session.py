@@ -1,19 +1,86 @@
 # app/infrastructure/db/session.py
+import random
+from contextlib import contextmanager
+
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
 from app.infrastructure.db.maria_engine import get_engine
 
 # Create the engine once
 engine = get_engine()
 
+# Optional read replicas (empty list = everything on the primary)
+replica_engines = [
+    get_engine(name=f"replica{i}", url=url)
+    for i, url in enumerate(settings.DB_REPLICA_URLS)
+]
+
+
+class RoutingSession(Session):
+    """
+    Session that may read from a replica.
+
+    Reads (plain SELECTs) go to a replica only when the session was opened
+    with info["use_replica"] = True and replicas are configured. Flushes,
+    INSERT/UPDATE/DELETE, raw SQL and every read after the session has
+    written anything go to the primary (read-your-writes).
+    A session sticks to a single replica for its whole life.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            replica_engines
+            and self.info.get("use_replica")
+            and not self.info.get("wrote")
+            and not self._flushing
+            and isinstance(clause, Select)
+        ):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = random.choice(replica_engines)
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
 # Session factory
 SessionLocal = sessionmaker(
     bind=engine,
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
 )
 
 
+@contextmanager
+def primary_reads(session: Session):
+    """
+    Send the reads inside the block to the primary, whatever the session
+    was opened with (e.g. rows about to be stored in a shared cache).
+    """
+    previous = session.info.get("use_replica")
+    session.info["use_replica"] = False
+    try:
+        yield session
+    finally:
+        session.info["use_replica"] = previous
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_wrote(orm_execute_state):
+    # bulk query.delete()/update() and session.execute(insert(...)) skip flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
 def get_db() -> Session:
     """
     Dependency-style helper (useful in Flask views or services):
@@ -0,0 +1,166 @@
+# app/infrastructure/db/unit_of_work.py
+from typing import Callable, List
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.domain.repositories.blog_repository import IBlogRepository
+from app.domain.repositories.cart_repository import ICartRepository
+from app.domain.repositories.category_repository import ICategoryRepository
+from app.domain.repositories.inventory_repository import IInventoryRepository
+from app.domain.repositories.product_repository import IProductRepository
+from app.domain.repositories.user_repository import IUserRepository
+from app.infrastructure.cache.app_cache import cache
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.repositories.blog_sqlalchemy import SQLAlchemyBlogRepository
+from app.infrastructure.repositories.cart_redis import RedisCartRepository
+from app.infrastructure.repositories.cart_sqlalchemy import SQLAlchemyCartRepository
+from app.infrastructure.repositories.category_sqlalchemy import SQLAlchemyCategoryRepository
+from app.infrastructure.repositories.inventory_sqlalchemy import SQLAlchemyInventoryRepository
+from app.infrastructure.repositories.order_sqlalchemy import SQLAlchemyOrderRepository
+from app.infrastructure.repositories.outbox_sqlalchemy import SQLAlchemyOutboxRepository
+from app.infrastructure.repositories.payment_sqlalchemy import SQLAlchemyPaymentRepository
+from app.infrastructure.repositories.product_sqlalchemy import SQLAlchemyProductRepository
+from app.infrastructure.repositories.sales_rollup_sqlalchemy import SQLAlchemySalesRollupRepository
+from app.infrastructure.repositories.user_sqlalchemy import SQLAlchemyUserRepository
+from app.infrastructure.repositories.cached import (
+    CachedBlogRepository,
+    CachedCategoryRepository,
+    CachedInventoryRepository,
+    CachedProductRepository,
+    CachedUserRepository,
+)
+
+
+class UnitOfWork:
+    """
+    One session + one transaction, shared by every repository built from it.
+
+    Repositories only flush; the owner of the unit of work decides when to
+    commit. In HTTP requests that is done once per request (see
+    app/interfaces/http/controllers/__init__.py). In scripts use it as a
+    context manager:
+
+        with UnitOfWork() as uow:
+            uow.products.create(...)
+        # committed here (or rolled back if the block raised)
+
+    read_only=True lets plain reads go to a read replica (when configured)
+    until the first write; see RoutingSession.
+
+    With use_cache (default: settings.CACHE_ENABLED) products, blog posts
+    and user roles are served through the Redis read-through cache, and
+    category slugs through the per-process slug map.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        read_only: bool = False,
+        use_cache: bool | None = None,
+    ):
+        self.session: Session = session_factory()
+        self.session.info["use_replica"] = read_only
+        self.use_cache = settings.CACHE_ENABLED if use_cache is None else use_cache
+        self._repos: dict = {}
+        self._after_commit: List[Callable[[], None]] = []
+
+    # ---- repositories (built lazily, one per unit of work) ----------
+    def _repo(self, name: str, factory):
+        repo = self._repos.get(name)
+        if repo is None:
+            repo = factory(self.session)
+            self._repos[name] = repo
+        return repo
+
+    def _cached(self, wrapper, factory):
+        if not self.use_cache:
+            return factory
+        return lambda session: wrapper(factory(session), cache, after_commit=self.after_commit)
+
+    @property
+    def users(self) -> IUserRepository:
+        return self._repo("users", self._cached(CachedUserRepository, SQLAlchemyUserRepository))
+
+    @property
+    def products(self) -> IProductRepository:
+        return self._repo("products", self._cached(CachedProductRepository, SQLAlchemyProductRepository))
+
+    @property
+    def categories(self) -> ICategoryRepository:
+        return self._repo("categories", self._cached(CachedCategoryRepository, SQLAlchemyCategoryRepository))
+
+    @property
+    def orders(self) -> SQLAlchemyOrderRepository:
+        return self._repo("orders", SQLAlchemyOrderRepository)
+
+    @property
+    def carts(self) -> ICartRepository:
+        if settings.CART_STORE == "redis":
+            return self._repo("carts", RedisCartRepository)
+        return self._repo("carts", SQLAlchemyCartRepository)
+
+    @property
+    def blog(self) -> IBlogRepository:
+        return self._repo("blog", self._cached(CachedBlogRepository, SQLAlchemyBlogRepository))
+
+    @property
+    def payments(self) -> SQLAlchemyPaymentRepository:
+        return self._repo("payments", SQLAlchemyPaymentRepository)
+
+    @property
+    def inventory(self) -> IInventoryRepository:
+        return self._repo("inventory", self._cached(CachedInventoryRepository, SQLAlchemyInventoryRepository))
+
+    @property
+    def sales(self) -> SQLAlchemySalesRollupRepository:
+        return self._repo("sales", SQLAlchemySalesRollupRepository)
+
+    @property
+    def outbox(self) -> SQLAlchemyOutboxRepository:
+        return self._repo("outbox", SQLAlchemyOutboxRepository)
+
+    # ---- replica routing ----------
+    def use_primary(self) -> None:
+        """
+        Send every following read to the primary (read-your-writes paths).
+        """
+        self.session.info["use_replica"] = False
+
+    @property
+    def wrote(self) -> bool:
+        return bool(self.session.info.get("wrote"))
+
+    # ---- transaction control ----------
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run callback once the current transaction is committed.
+        Dropped if the transaction is rolled back.
+        """
+        self._after_commit.append(callback)
+
+    def commit(self) -> None:
+        self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for cb in callbacks:
+            cb()
+
+    def rollback(self) -> None:
+        self._after_commit = []
+        self.session.rollback()
+
+    def close(self) -> None:
+        self._after_commit = []
+        self.session.close()
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
@@ -0,0 +1 @@
+# app/infrastructure/outbox/__init__.py
@@ -0,0 +1,228 @@
+# app/infrastructure/outbox/dispatcher.py
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import Histogram, register_collector
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.redis import process_stats
+from app.infrastructure.repositories.outbox_sqlalchemy import SQLAlchemyOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY_PREFIX = "outbox:dispatcher:"
+
+
+class Event:
+    """
+    What handlers get: a plain copy of an outbox row (safe to use from
+    any thread, no session attached).
+    """
+
+    def __init__(self, id: int, type: str, aggregate_id: Optional[int], payload: dict, created_at: datetime, attempts: int):
+        self.id = id
+        self.type = type
+        self.aggregate_id = aggregate_id
+        self.payload = payload
+        self.created_at = created_at
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"<Event {self.id} {self.type} {self.aggregate_id}>"
+
+
+Handler = Callable[[Event], None]
+
+
+class OutboxDispatcher:
+    """
+    Delivers outbox events to handlers, at least once.
+
+    Each round:
+      1. claim a batch in a short transaction: SELECT ... FOR UPDATE SKIP
+         LOCKED (several dispatchers split the backlog), mark the rows
+         PROCESSING with claimed_at and a lease, commit;
+      2. run every handler of every event concurrently on a thread pool,
+         with no transaction or pooled connection held;
+      3. in a second short transaction, delete the events whose handlers
+         all succeeded and reschedule the rest with exponential backoff
+         (DEAD after max_attempts).
+    A dispatcher that dies in between leaves its batch PROCESSING; once
+    the lease runs out another one claims it and delivers it again, so
+    handlers must be idempotent. Outcomes only apply to rows still held by
+    the claim that delivered them.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, List[Handler]],
+        session_factory: sessionmaker = SessionLocal,
+        batch_size: int = 100,
+        workers: int = 8,
+        max_attempts: int = 10,
+        handler_timeout: float = 30.0,
+        lease_seconds: float = 120.0,
+    ):
+        self.handlers = handlers
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.handler_timeout = handler_timeout
+        # longer than a round's deliveries (which give up after handler_timeout)
+        self.lease = timedelta(seconds=max(lease_seconds, handler_timeout * 2))
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outbox")
+        self.lag = Histogram(buckets=(0.1, 0.5, 1, 2, 5, 10, 30, 60, 300, 900, 3600))
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+        self.rounds = 0
+        self.last_round_at: Optional[float] = None
+
+    def dispatch_once(self) -> int:
+        """
+        One batch; returns how many events were claimed.
+        """
+        try:
+            # claimed_at identifies the claim and DATETIME drops fractions:
+            # whole seconds, rounded up so what became due this second is in
+            claimed_at = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=1)
+            events = self._claim(claimed_at)
+            if not events:
+                return 0
+
+            errors = self._deliver(events)
+            self._record(events, errors, claimed_at)
+
+            delivered_at = datetime.utcnow()
+            for e in events:
+                if e.id not in errors:
+                    self.lag.observe((delivered_at - e.created_at).total_seconds())
+            self.delivered += len(events) - len(errors)
+            return len(events)
+        finally:
+            self.rounds += 1
+            self.last_round_at = time.time()
+
+    def _claim(self, claimed_at: datetime) -> List[Event]:
+        session = self.session_factory()
+        try:
+            rows = SQLAlchemyOutboxRepository(session).claim(self.batch_size, claimed_at, claimed_at + self.lease)
+            events = [
+                Event(r.id, r.event_type, r.aggregate_id, json.loads(r.payload), r.created_at, r.attempts)
+                for r in rows
+            ]
+            session.commit()
+            return events
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _record(self, events: List[Event], errors: Dict[int, str], claimed_at: datetime) -> None:
+        session = self.session_factory()
+        try:
+            repo = SQLAlchemyOutboxRepository(session)
+            repo.delete([e.id for e in events if e.id not in errors], claimed_at)
+            for e in events:
+                if e.id in errors:
+                    attempts = e.attempts + 1
+                    dead = attempts >= self.max_attempts
+                    retry_at = datetime.utcnow() + timedelta(seconds=min(2 ** attempts, 3600))
+                    repo.reschedule(e.id, claimed_at, retry_at, errors[e.id], dead=dead)
+                    if dead:
+                        self.dead += 1
+                        logger.error("outbox event %s (%s) is DEAD after %s attempts: %s", e.id, e.type, attempts, errors[e.id])
+                    else:
+                        self.retried += 1
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _deliver(self, events: List[Event]) -> Dict[int, str]:
+        """
+        Run all handlers of all events concurrently; {event id: error} for failures.
+        """
+        futures = []
+        for e in events:
+            for handler in self.handlers.get(e.type, []):
+                futures.append((e, handler, self.pool.submit(handler, e)))
+
+        errors: Dict[int, str] = {}
+        deadline = time.monotonic() + self.handler_timeout
+        for e, handler, future in futures:
+            name = getattr(handler, "__name__", type(handler).__name__)
+            try:
+                future.result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeout:
+                errors.setdefault(e.id, f"{name}: timed out after {self.handler_timeout}s")
+            except Exception as exc:
+                logger.warning("outbox handler %s failed for %r", name, e, exc_info=True)
+                errors.setdefault(e.id, f"{name}: {type(exc).__name__}: {exc}")
+        return errors
+
+    def run_forever(self, poll_interval: float = 1.0) -> None:
+        while True:
+            try:
+                claimed = self.dispatch_once()
+            except Exception:
+                logger.exception("outbox dispatch round failed")
+                claimed = 0
+            process_stats.publish(STATS_KEY_PREFIX, self.stats(), ttl=max(int(poll_interval * 5), 30))
+            if claimed < self.batch_size:
+                time.sleep(poll_interval)
+
+    # ---- metrics ----------
+    def stats(self) -> dict:
+        return {
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead": self.dead,
+            "rounds": self.rounds,
+            "last_round_at": self.last_round_at,
+            "lag_seconds": self.lag.snapshot(),
+        }
+
+
+def outbox_metrics(session_factory: sessionmaker = SessionLocal) -> Callable[[], dict]:
+    """
+    /metrics collector: backlog from the table plus the stats running
+    dispatchers publish to Redis.
+    """
+
+    def collect() -> dict:
+        session = session_factory()
+        try:
+            out = SQLAlchemyOutboxRepository(session).backlog(datetime.utcnow())
+        finally:
+            session.close()
+        out["dispatchers"] = process_stats.collect(STATS_KEY_PREFIX)
+        return out
+
+    return collect
+
+
+def install_outbox_metrics(session_factory: sessionmaker = SessionLocal) -> None:
+    register_collector("outbox", outbox_metrics(session_factory))
+
+
+def build_dispatcher(batch_size: int | None = None, workers: int | None = None) -> OutboxDispatcher:
+    from app.infrastructure.outbox.handlers import default_handlers
+
+    return OutboxDispatcher(
+        default_handlers(),
+        batch_size=batch_size or settings.OUTBOX_BATCH_SIZE,
+        workers=workers or settings.OUTBOX_WORKERS,
+        max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        handler_timeout=settings.OUTBOX_HANDLER_TIMEOUT_SECONDS,
+        lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+    )
@@ -0,0 +1,109 @@
+# app/infrastructure/outbox/handlers.py
+"""
+What happens after an order event is committed. Every handler may run
+more than once for the same event (at-least-once delivery), so each one
+is idempotent: cache invalidation trivially, notifications and
+fulfilment by keying on the order.
+"""
+import logging
+from typing import Dict, List
+
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.repositories.sms_provider import SmsMessage
+from app.infrastructure.cache.app_cache import cache
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.db.unit_of_work import UnitOfWork
+from app.infrastructure.outbox.dispatcher import Event, Handler
+from app.infrastructure.redis.sms_queue import SmsQueue, sms_queue
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = "order.created"
+ORDER_PAID = "order.paid"
+ORDER_CANCELLED = "order.cancelled"
+PAYMENT_NEEDS_REFUND = "payment.needs_refund"
+
+_MESSAGES = {
+    ORDER_CREATED: "Order {order_number} was placed.",
+    ORDER_PAID: "Payment for order {order_number} was received.",
+    ORDER_CANCELLED: "Order {order_number} was cancelled.",
+    PAYMENT_NEEDS_REFUND: "Order {order_number} was cancelled before your payment arrived; it will be refunded.",
+}
+
+
+def invalidate_stock(event: Event) -> None:
+    """
+    Reserving or releasing stock updates products.stock directly, so the
+    cached product rows are stale until dropped.
+    """
+    tags = {f"product:{item['product_id']}" for item in event.payload.get("items", [])}
+    if tags:
+        cache.invalidate(*tags)
+
+
+def invalidate_catalog_lists(event: Event) -> None:
+    # best-seller lists read the sales rollup a payment just changed
+    cache.invalidate("catalog:lists")
+
+
+def report_refund(event: Event) -> None:
+    # refunds are manual for now: payments in NEEDS_REFUND are the worklist
+    p = event.payload
+    logger.error(
+        "payment %s (%s) for order %s arrived after the order was closed; refund it",
+        p["payment_id"], p["amount"], p["order_number"],
+    )
+
+
+class CustomerNotifier:
+    """
+    Queues an SMS to the customer; once per order and event type, however
+    many times the event is delivered.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal, sms: SmsQueue = sms_queue):
+        self.session_factory = session_factory
+        self.sms = sms
+
+    def __call__(self, event: Event) -> None:
+        p = event.payload
+        with UnitOfWork(self.session_factory, read_only=True) as uow:
+            user = uow.users.get_by_id(p["user_id"])
+        if user is None or not user.phone:
+            return
+        text = _MESSAGES[event.type].format(order_number=p["order_number"])
+        self.sms.enqueue(SmsMessage(to=user.phone, text=text), dedupe_key=f"{event.type}:{p['order_id']}")
+
+
+class InstantCodeFulfiller:
+    """
+    Paid orders with INSTANT_CODE products are delivered without a human.
+    There is no code inventory yet: this finds the lines that need a code
+    and hands them on (logged for now).
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        self.session_factory = session_factory
+
+    def __call__(self, event: Event) -> None:
+        p = event.payload
+        quantities = {item["product_id"]: item["quantity"] for item in p.get("items", [])}
+        with UnitOfWork(self.session_factory, read_only=True) as uow:
+            products = uow.products.get_many_by_ids(quantities)
+        lines = [
+            (pid, quantities[pid]) for pid, product in products.items()
+            if product.delivery_type == "INSTANT_CODE"
+        ]
+        for product_id, quantity in lines:
+            logger.info("order %s: deliver %s code(s) of product %s", p["order_number"], quantity, product_id)
+
+
+def default_handlers(session_factory: sessionmaker = SessionLocal) -> Dict[str, List[Handler]]:
+    notify = CustomerNotifier(session_factory)
+    return {
+        ORDER_CREATED: [invalidate_stock, notify],
+        ORDER_PAID: [invalidate_catalog_lists, InstantCodeFulfiller(session_factory), notify],
+        ORDER_CANCELLED: [invalidate_stock, notify],
+        PAYMENT_NEEDS_REFUND: [report_refund, notify],
+    }
@@ -0,0 +1 @@
+# app/infrastructure/payments/__init__.py
@@ -0,0 +1,181 @@
+# app/infrastructure/payments/pipeline.py
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.domain.repositories.payment_gateway import GatewayError, IPaymentGateway
+from app.domain.services.order_service import OrderService
+from app.domain.services.payment_service import PaymentService
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.db.unit_of_work import UnitOfWork
+from app.infrastructure.payments.zarinpal import ZarinpalGateway
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentPipeline:
+    """
+    Runs the blocking gateway calls of a payment on a bounded thread pool,
+    never on a request thread: at most `workers` calls in flight and
+    `queue_size` waiting. When both are used up submit_* returns False
+    instead of queueing without bound; the payment then stays INIT /
+    VERIFYING for `flask retry-payments` to pick up.
+
+    Each job reads what it needs in a short transaction, calls the gateway
+    with no DB connection held, then records the result in a second
+    transaction. Jobs are submitted after the request's commit, so they
+    always see the row the request wrote.
+    """
+
+    def __init__(
+        self,
+        gateway: IPaymentGateway,
+        workers: int = 8,
+        queue_size: int = 100,
+        session_factory: sessionmaker = SessionLocal,
+    ):
+        self.gateway = gateway
+        self.workers = workers
+        self.queue_size = queue_size
+        self.session_factory = session_factory
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._in_flight = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def service(self, uow: UnitOfWork) -> PaymentService:
+        order_service = OrderService(
+            order_repo=uow.orders,
+            product_repo=uow.products,
+            sales_repo=uow.sales,
+            inventory_repo=uow.inventory,
+            outbox_repo=uow.outbox,
+        )
+        return PaymentService(uow.payments, order_service, self.gateway, outbox_repo=uow.outbox)
+
+    # ---- submission ----------
+    def has_capacity(self) -> bool:
+        self._ensure_pool()
+        return self._in_flight < self.workers + self.queue_size
+
+    def submit_request(self, payment_id: int, callback_url: str) -> bool:
+        return self._submit(self.run_request, payment_id, callback_url)
+
+    def submit_verify(self, payment_id: int) -> bool:
+        return self._submit(self.run_verify, payment_id)
+
+    def _submit(self, job, *args) -> bool:
+        self._ensure_pool()
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            logger.warning("payment pool full, %s%s left for retry-payments", job.__name__, args)
+            return False
+        with self._lock:
+            self._in_flight += 1
+            self.submitted += 1
+        self._pool.submit(self._run, job, args)
+        return True
+
+    def _run(self, job, args) -> None:
+        try:
+            job(*args)
+            self.completed += 1
+        except GatewayError:
+            self.failed += 1  # already logged by the job
+        except Exception:
+            self.failed += 1
+            logger.exception("payment job %s%s failed", job.__name__, args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _ensure_pool(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # first use in this process (threads don't survive a fork)
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="payment")
+            self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+            self._in_flight = 0
+            self._pid = pid
+
+    # ---- jobs (also run inline by the CLI) ----------
+    def run_request(self, payment_id: int, callback_url: str) -> None:
+        with UnitOfWork(self.session_factory) as uow:
+            payment = uow.payments.get_by_id(payment_id)
+            if payment is None or payment.status != "INIT":
+                return
+            order = uow.orders.get_by_id(payment.order_id)
+            amount, description = int(payment.amount), f"Order {order.order_number}"
+
+        result, error = None, None
+        try:
+            result = self.gateway.request(amount, description, callback_url)
+        except GatewayError as e:
+            error = str(e)
+            logger.warning("payment %s: gateway request failed: %s", payment_id, e)
+
+        with UnitOfWork(self.session_factory) as uow:
+            self.service(uow).complete_request(payment_id, result, error)
+
+    def run_verify(self, payment_id: int) -> None:
+        with UnitOfWork(self.session_factory) as uow:
+            payment = uow.payments.get_by_id(payment_id)
+            if payment is None or payment.status != "VERIFYING":
+                return
+            authority, amount = payment.gateway_ref, int(payment.amount)
+
+        try:
+            result = self.gateway.verify(authority, amount)
+        except GatewayError as e:
+            # stays VERIFYING; retry-payments tries again later
+            logger.warning("payment %s: verification failed: %s", payment_id, e)
+            raise
+
+        with UnitOfWork(self.session_factory) as uow:
+            self.service(uow).complete_verification(payment_id, result)
+
+    def stats(self) -> dict:
+        out = {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self._in_flight,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+        latency = getattr(self.gateway, "latency", None)
+        if latency is not None:
+            out["gateway_latency_seconds"] = latency.snapshot()
+        return out
+
+
+payment_pipeline: Optional[PaymentPipeline] = None
+
+
+def install_payment_pipeline(session_factory: sessionmaker = SessionLocal) -> PaymentPipeline:
+    global payment_pipeline
+    payment_pipeline = PaymentPipeline(
+        ZarinpalGateway(),
+        workers=settings.PAYMENT_WORKERS,
+        queue_size=settings.PAYMENT_QUEUE_SIZE,
+        session_factory=session_factory,
+    )
+    register_collector("payments", payment_pipeline.stats)
+    return payment_pipeline
@@ -0,0 +1,130 @@
+# app/infrastructure/payments/stub_server.py
+"""
+Local stand-in for the Zarinpal v4 API, for development and load tests:
+
+    python -m app.infrastructure.payments.stub_server --port 8099 --delay 0.5
+    PAYMENT_GATEWAY_URL=http://127.0.0.1:8099 flask --app app.main run
+
+POST /pg/v4/payment/request.json  -> authority
+GET  /pg/StartPay/<authority>     -> redirects to the callback with Status=OK
+                                     (?status=NOK to simulate a cancel)
+POST /pg/v4/payment/verify.json   -> 100 the first time, 101 afterwards
+
+--delay adds latency to every API call and --fail-rate answers that share
+of them with 503, to watch timeouts, retries and the worker pool.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+class _State:
+    def __init__(self, delay: float, fail_rate: float):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.payments = {}   # authority -> {"amount", "callback_url", "verified", "ref_id"}
+
+
+def make_handler(state: _State):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real gateway
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _json(self, status: int, body: dict) -> None:
+            raw = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _simulate(self) -> bool:
+            if state.delay:
+                time.sleep(state.delay)
+            if random.random() < state.fail_rate:
+                self._json(503, {"errors": {"code": -1, "message": "stub outage"}})
+                return False
+            return True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not self._simulate():
+                return
+            path = urlparse(self.path).path
+
+            if path == "/pg/v4/payment/request.json":
+                authority = "A" + uuid.uuid4().hex[:35].upper()
+                with state.lock:
+                    state.payments[authority] = {
+                        "amount": payload.get("amount"),
+                        "callback_url": payload.get("callback_url"),
+                        "verified": False,
+                        "ref_id": random.randint(10**9, 10**10),
+                    }
+                self._json(200, {"data": {"code": 100, "message": "Success", "authority": authority}, "errors": []})
+
+            elif path == "/pg/v4/payment/verify.json":
+                with state.lock:
+                    p = state.payments.get(payload.get("authority"))
+                    if p is None or p["amount"] != payload.get("amount"):
+                        self._json(200, {"data": [], "errors": {"code": -51, "message": "not paid"}})
+                        return
+                    code = 101 if p["verified"] else 100
+                    p["verified"] = True
+                self._json(200, {"data": {"code": code, "message": "Verified", "ref_id": p["ref_id"]}, "errors": []})
+
+            else:
+                self._json(404, {"errors": {"code": -404, "message": "not found"}})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.startswith("/pg/StartPay/"):
+                authority = url.path.rsplit("/", 1)[-1]
+                p = state.payments.get(authority)
+                if p is None:
+                    self._json(404, {"errors": {"code": -54, "message": "invalid authority"}})
+                    return
+                status = parse_qs(url.query).get("status", ["OK"])[0]
+                location = f"{p['callback_url']}?{urlencode({'Authority': authority, 'Status': status})}"
+                self.send_response(302)
+                self.send_header("Location", location)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._json(404, {"errors": {"code": -404, "message": "not found"}})
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8099, delay: float = 0.0, fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stub in a background thread (handy from scripts); returns the server.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(_State(delay, fail_rate)))
+    threading.Thread(target=server.serve_forever, name="gateway-stub", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Zarinpal v4 stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every API call")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of API calls answered with 503")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(_State(args.delay, args.fail_rate)))
+    print(f"gateway stub on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
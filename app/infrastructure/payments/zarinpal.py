@@ -0,0 +1,123 @@
+# app/infrastructure/payments/zarinpal.py
+import logging
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+from app.domain.repositories.payment_gateway import (
+    GatewayError,
+    IPaymentGateway,
+    PaymentRequestResult,
+    VerificationResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# data.code: 100 = ok, 101 = already verified (a repeated verify)
+_OK_CODES = (100, 101)
+
+
+class ZarinpalGateway(IPaymentGateway):
+    """
+    Zarinpal REST v4 client (also talks to the local stub server, see
+    app/infrastructure/payments/stub_server.py).
+
+    One pooled requests.Session per process: keep-alive connections,
+    connect/read timeouts on every call, and urllib3 retries with backoff
+    on connection errors and 502/503/504. Both endpoints are safe to
+    retry: an unused authority just expires, and a repeated verify
+    answers 101.
+    """
+
+    name = "zarinpal"
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        merchant_id: str | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        retries: int | None = None,
+        pool_size: int | None = None,
+    ):
+        self.base_url = (base_url or settings.PAYMENT_GATEWAY_URL).rstrip("/")
+        self.merchant_id = merchant_id or settings.PAYMENT_MERCHANT_ID
+        self.timeout = (
+            connect_timeout or settings.PAYMENT_CONNECT_TIMEOUT,
+            read_timeout or settings.PAYMENT_READ_TIMEOUT,
+        )
+        self.retries = settings.PAYMENT_RETRIES if retries is None else retries
+        self.pool_size = pool_size or settings.PAYMENT_WORKERS
+        self.latency = Histogram()
+        self._new_session()
+        if hasattr(os, "register_at_fork"):
+            # never share the parent's keep-alive sockets with a child
+            os.register_at_fork(after_in_child=self._new_session)
+
+    def _new_session(self) -> None:
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+
+    def request(self, amount: int, description: str, callback_url: str) -> PaymentRequestResult:
+        body, raw = self._post("/pg/v4/payment/request.json", {
+            "merchant_id": self.merchant_id,
+            "amount": amount,
+            "description": description,
+            "callback_url": callback_url,
+        })
+        data = body.get("data") or {}
+        if data.get("code") != 100 or not data.get("authority"):
+            raise GatewayError(f"payment request rejected: {raw[:500]}")
+        return PaymentRequestResult(data["authority"], self.payment_url(data["authority"]), raw)
+
+    def verify(self, authority: str, amount: int) -> VerificationResult:
+        body, raw = self._post("/pg/v4/payment/verify.json", {
+            "merchant_id": self.merchant_id,
+            "amount": amount,
+            "authority": authority,
+        })
+        data = body.get("data") or {}
+        code = data.get("code")
+        if code is None:
+            # errors come back as {"data": [], "errors": {"code": -51, ...}}
+            code = (body.get("errors") or {}).get("code")
+        ref_id = data.get("ref_id")
+        return VerificationResult(
+            ok=code in _OK_CODES,
+            ref_id=str(ref_id) if ref_id is not None else None,
+            code=code,
+            raw=raw,
+        )
+
+    def payment_url(self, authority: str) -> str:
+        return f"{self.base_url}/pg/StartPay/{authority}"
+
+    def _post(self, path: str, payload: dict):
+        started = time.perf_counter()
+        try:
+            resp = self.session.post(self.base_url + path, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise GatewayError(f"{path}: {e}") from e
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+        if resp.status_code >= 500:
+            raise GatewayError(f"{path}: HTTP {resp.status_code}")
+        try:
+            return resp.json(), resp.text
+        except ValueError as e:
+            raise GatewayError(f"{path}: invalid JSON (HTTP {resp.status_code})") from e
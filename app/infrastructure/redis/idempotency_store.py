@@ -0,0 +1,158 @@
+# app/infrastructure/redis/idempotency_store.py
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.core.exceptions import ConflictError, ValidationError
+from .redis_client import redis_client
+
+# store the result; drop the lock only if it is still ours
+_COMPLETE_LUA = """
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+    redis.call('DEL', KEYS[2])
+end
+return 1
+"""
+
+# keep the lock for ARGV[2] seconds, if it is still ours
+_HOLD_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Stable hash of whatever identifies "the same request".
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        h.update(part if isinstance(part, bytes) else repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Run-once results in Redis.
+    Key format:
+        idem:{scope}:{key}        stored result (JSON), kept for ttl seconds
+        idem:{scope}:{key}:lock   owner token while the first call is running
+
+    The first caller takes the lock and runs; duplicates arriving meanwhile
+    poll until the result is stored (or give up after `wait` seconds with a
+    409). Failures are not stored, so a retry after an error runs again.
+    Callers with a transaction hold() the lock before committing it, so
+    a crash between the commit and complete() leaves the key in progress
+    instead of free to run a second time.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis = redis_client,
+        ttl: int | None = None,
+        lock_ttl: int | None = None,
+        wait: float | None = None,
+    ):
+        self.client = client
+        self.ttl = ttl or settings.IDEMPOTENCY_TTL_SECONDS
+        self.lock_ttl = lock_ttl or settings.IDEMPOTENCY_LOCK_SECONDS
+        self.wait = settings.IDEMPOTENCY_WAIT_SECONDS if wait is None else wait
+        self._complete = client.register_script(_COMPLETE_LUA)
+        self._hold = client.register_script(_HOLD_LUA)
+        self._release = client.register_script(_RELEASE_LUA)
+
+    @staticmethod
+    def _key(scope: str, key: str) -> str:
+        return f"idem:{scope}:{key}"
+
+    def _stored(self, scope: str, key: str, fp: str) -> Optional[dict]:
+        raw = self.client.get(self._key(scope, key))
+        if raw is None:
+            return None
+        stored = json.loads(raw)
+        if stored["fingerprint"] != fp:
+            raise ValidationError("Idempotency-Key was already used for a different request")
+        return stored
+
+    def begin(self, scope: str, key: str, fp: str = "") -> Tuple[Optional[dict], Optional[str]]:
+        """
+        (stored, None) if this key already has a result, otherwise
+        (None, token): the caller now owns the key and must call
+        complete() or release() with the token.
+        """
+        lock_key = self._key(scope, key) + ":lock"
+        deadline = time.monotonic() + self.wait
+        delay = 0.02
+        while True:
+            stored = self._stored(scope, key, fp)
+            if stored is not None:
+                return stored, None
+
+            token = uuid.uuid4().hex
+            if self.client.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                # the previous owner may have finished between GET and SET
+                stored = self._stored(scope, key, fp)
+                if stored is not None:
+                    self.release(scope, key, token)
+                    return stored, None
+                return None, token
+
+            if time.monotonic() >= deadline:
+                raise ConflictError("a request with this Idempotency-Key is still in progress")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    def hold(self, scope: str, key: str, token: str) -> bool:
+        """
+        Keep owning the key for the result's ttl. False if the lock has
+        expired meanwhile (another request may be running it now).
+        """
+        return bool(self._hold(keys=[self._key(scope, key) + ":lock"], args=[token, self.ttl]))
+
+    def complete(self, scope: str, key: str, token: str, fp: str, result: Any) -> None:
+        value = json.dumps({"fingerprint": fp, "result": result}, separators=(",", ":"))
+        base = self._key(scope, key)
+        self._complete(keys=[base, base + ":lock"], args=[token, value, self.ttl])
+
+    def release(self, scope: str, key: str, token: str) -> None:
+        self._release(keys=[self._key(scope, key) + ":lock"], args=[token])
+
+    def run_once(self, scope: str, key: str, fn: Callable[[], Any], fp: str = "") -> Any:
+        """
+        Call fn() once per (scope, key) and return its JSON-serializable
+        result; duplicates (concurrent or later, within ttl) get the first
+        call's result instead. E.g. webhooks keyed on their delivery id:
+
+            idempotency_store.run_once("webhook", delivery_id, handle)
+        """
+        stored, token = self.begin(scope, key, fp)
+        if stored is not None:
+            return stored["result"]
+        try:
+            result = fn()
+        except BaseException:
+            self.release(scope, key, token)
+            raise
+        self.complete(scope, key, token, fp, result)
+        return result
+
+
+idempotency_store = IdempotencyStore()
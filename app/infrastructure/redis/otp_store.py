@@ -1,33 +1,110 @@
 # app/infrastructure/redis/otp_store.py
-import random
+import secrets
+from typing import Tuple
+
 from app.core.config import settings
 from .redis_client import redis_client
 
+# KEYS: code, attempts, cooldown
+# ARGV: code, ttl, cooldown, max attempts
+# -> 0 stored, or seconds to wait (cooldown / lockout)
+_SET_LUA = """
+local attempts = tonumber(redis.call('GET', KEYS[2]) or '0')
+if attempts >= tonumber(ARGV[4]) then
+    return math.max(redis.call('TTL', KEYS[2]), 1)
+end
+if not redis.call('SET', KEYS[3], '1', 'NX', 'EX', ARGV[3]) then
+    return math.max(redis.call('TTL', KEYS[3]), 1)
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 0
+"""
+
+# KEYS: code, attempts
+# ARGV: code, max attempts, attempt window, lockout
+# -> {1, 0} accepted (code consumed), {0, 0} wrong, {0, n} locked for n seconds
+_VERIFY_LUA = """
+local attempts = tonumber(redis.call('GET', KEYS[2]) or '0')
+local max = tonumber(ARGV[2])
+if attempts >= max then
+    return {0, math.max(redis.call('TTL', KEYS[2]), 1)}
+end
+local saved = redis.call('GET', KEYS[1])
+if not saved then
+    -- nothing to guess (expired, or already used by a concurrent verify)
+    return {0, 0}
+end
+if saved == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return {1, 0}
+end
+attempts = redis.call('INCR', KEYS[2])
+if attempts >= max then
+    -- burn the code too: it has to be requested again after the lockout
+    redis.call('DEL', KEYS[1])
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+    return {0, tonumber(ARGV[4])}
+end
+if attempts == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return {0, 0}
+"""
+
 
 class OTPStore:
     """
-    Small helper around Redis for OTPs.
-    Key format: otp:{phone}
+    Small helper around Redis for OTPs; every operation is one Lua call
+    (one round trip, atomic).
+    Key format:
+        otp:{phone}            the code, expires after ttl
+        otp:{phone}:attempts   wrong guesses at a live code; max_attempts locks the phone
+                               for `lockout` seconds (counted over the code's
+                               ttl, and kept across resends)
+        otp:{phone}:cooldown   set when a code is sent; no resend until it expires
     """
 
-    def __init__(self, ttl: int | None = None):
+    def __init__(
+        self,
+        ttl: int | None = None,
+        cooldown: int | None = None,
+        max_attempts: int | None = None,
+        lockout: int | None = None,
+        client=redis_client,
+    ):
         self.ttl = ttl or settings.OTP_EXPIRE_SECONDS
+        self.cooldown = settings.OTP_RESEND_COOLDOWN_SECONDS if cooldown is None else cooldown
+        self.max_attempts = max_attempts or settings.OTP_MAX_ATTEMPTS
+        self.lockout = lockout or settings.OTP_LOCKOUT_SECONDS
+        self._set = client.register_script(_SET_LUA)
+        self._verify = client.register_script(_VERIFY_LUA)
+
+    @staticmethod
+    def _keys(phone: str):
+        key = f"otp:{phone}"
+        return [key, f"{key}:attempts", f"{key}:cooldown"]
 
     def generate_code(self, length: int | None = None) -> str:
         length = length or settings.OTP_LENGTH
-        return "".join(str(random.randint(0, 9)) for _ in range(length))
+        return "".join(secrets.choice("0123456789") for _ in range(length))
 
-    def set_code(self, phone: str, code: str):
-        key = f"otp:{phone}"
-        redis_client.setex(key, self.ttl, code)
+    def set_code(self, phone: str, code: str) -> int:
+        """
+        Store a new code. Returns 0, or the seconds left before one may be
+        sent (resend cooldown or lockout); the old code stays valid then.
+        """
+        return int(self._set(
+            keys=self._keys(phone),
+            args=[code, self.ttl, max(self.cooldown, 1), self.max_attempts],
+        ))
 
-    def verify_code(self, phone: str, code: str) -> bool:
-        key = f"otp:{phone}"
-        saved = redis_client.get(key)
-        if not saved:
-            return False
-        if saved.decode() == code:
-            # consume it
-            redis_client.delete(key)
-            return True
-        return False
+    def verify_code(self, phone: str, code: str) -> Tuple[bool, int]:
+        """
+        Check and consume the code. Returns (ok, locked_for): locked_for > 0
+        means the phone is locked out (the code was not even compared).
+        """
+        ok, locked_for = self._verify(
+            keys=self._keys(phone)[:2],
+            args=[str(code), self.max_attempts, self.ttl, self.lockout],
+        )
+        return bool(ok), int(locked_for)
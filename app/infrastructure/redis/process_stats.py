@@ -0,0 +1,42 @@
+# app/infrastructure/redis/process_stats.py
+"""
+Background workers (outbox dispatcher, SMS worker) run as their own
+processes, so their counters are not in the web workers' memory. They
+publish a JSON snapshot under {prefix}{host}:{pid} with a short TTL, and
+the web side's /metrics collector reads whatever is live.
+"""
+import json
+import logging
+import os
+import socket
+from typing import Dict, Optional
+
+import redis
+
+from .redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def publish(prefix: str, stats: dict, ttl: int = 30, client: redis.Redis = redis_client) -> None:
+    key = f"{prefix}{socket.gethostname()}:{os.getpid()}"
+    try:
+        client.set(key, json.dumps(stats), ex=ttl)
+    except redis.RedisError:
+        logger.warning("could not publish stats under %s", key, exc_info=True)
+
+
+def collect(prefix: str, client: redis.Redis = redis_client) -> Optional[Dict[str, dict]]:
+    """
+    {"host:pid": stats} for every live publisher; None if Redis is down.
+    """
+    try:
+        keys = list(client.scan_iter(match=f"{prefix}*", count=100))
+        values = client.mget(keys) if keys else []
+    except redis.RedisError:
+        return None
+    return {
+        key.decode()[len(prefix):]: json.loads(raw)
+        for key, raw in zip(keys, values)
+        if raw is not None
+    }
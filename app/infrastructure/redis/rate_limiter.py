@@ -0,0 +1,155 @@
+# app/infrastructure/redis/rate_limiter.py
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+import redis
+
+from .redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Sliding-window counters for several limits at once, all or nothing:
+# the request is counted against every limit only if none is exceeded.
+# KEYS: per limit, current window counter then previous window counter
+# ARGV: per limit, max requests, window seconds, seconds into the window
+# -> 0 allowed, or seconds until the request would be allowed
+_HIT_LUA = """
+local wait = 0
+for i = 1, #KEYS / 2 do
+    local limit = tonumber(ARGV[i * 3 - 2])
+    local window = tonumber(ARGV[i * 3 - 1])
+    local elapsed = tonumber(ARGV[i * 3])
+    local curr = tonumber(redis.call('GET', KEYS[i * 2 - 1]) or '0')
+    local prev = tonumber(redis.call('GET', KEYS[i * 2]) or '0')
+    if prev * (window - elapsed) / window + curr + 1 > limit then
+        local w = window - elapsed
+        if curr + 1 <= limit and prev > 0 then
+            w = window * (1 - (limit - 1 - curr) / prev) - elapsed
+        end
+        wait = math.max(wait, w, 1)
+    end
+end
+if wait > 0 then
+    return math.ceil(wait)
+end
+for i = 1, #KEYS / 2 do
+    redis.call('INCR', KEYS[i * 2 - 1])
+    redis.call('EXPIRE', KEYS[i * 2 - 1], tonumber(ARGV[i * 3 - 1]) * 2)
+end
+return 0
+"""
+
+
+class Limit:
+    """
+    At most `limit` requests per `window` seconds for one key
+    (e.g. key="auth.request_otp:phone:0912...").
+    """
+
+    def __init__(self, key: str, limit: int, window: int):
+        self.key = key
+        self.limit = limit
+        self.window = window
+
+    def __repr__(self) -> str:
+        return f"<Limit {self.key} {self.limit}/{self.window}s>"
+
+
+def _windows(limit: Limit, now: float) -> Tuple[int, float]:
+    index = int(now // limit.window)
+    return index, now - index * limit.window
+
+
+class LocalSlidingWindow:
+    """
+    Same algorithm in process memory: the fallback while Redis is down.
+    Limits then hold per process instead of globally. Bounded to
+    `max_keys` counters (least recently used dropped).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, int]" = OrderedDict()  # same keys as in Redis
+        self._lock = threading.Lock()
+
+    def hit(self, limits: Sequence[Limit], now: float) -> int:
+        with self._lock:
+            wait = 0.0
+            for lim in limits:
+                index, elapsed = _windows(lim, now)
+                curr = self._counters.get(f"{lim.key}:{index}", 0)
+                prev = self._counters.get(f"{lim.key}:{index - 1}", 0)
+                if prev * (lim.window - elapsed) / lim.window + curr + 1 > lim.limit:
+                    w = lim.window - elapsed
+                    if curr + 1 <= lim.limit and prev > 0:
+                        w = lim.window * (1 - (lim.limit - 1 - curr) / prev) - elapsed
+                    wait = max(wait, w, 1)
+            if wait:
+                return math.ceil(wait)
+            for lim in limits:
+                index, _ = _windows(lim, now)
+                key = f"{lim.key}:{index}"
+                self._counters[key] = self._counters.get(key, 0) + 1
+                self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+            return 0
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limits, every limit of a request checked and
+    counted in one Lua call (one round trip).
+    Key format:
+        rl:{limit key}:{window index}   requests in that fixed window
+
+    The current window's count plus the previous one's, weighted by how
+    much of it still overlaps the sliding window, approximates a true
+    sliding log with two integers per limit. If Redis is unavailable the
+    limits are enforced per process instead (LocalSlidingWindow).
+    """
+
+    def __init__(self, client: redis.Redis = redis_client, fallback: LocalSlidingWindow | None = None):
+        self.client = client
+        self.fallback = fallback or LocalSlidingWindow()
+        self._hit = client.register_script(_HIT_LUA)
+        self.allowed = 0
+        self.rejected = 0
+        self.fallbacks = 0
+
+    def hit(self, limits: Sequence[Limit]) -> int:
+        """
+        Count one request against all `limits`. Returns 0 if it is allowed,
+        else the seconds to wait (Retry-After); rejected requests are not
+        counted.
+        """
+        if not limits:
+            return 0
+        now = time.time()
+        keys, args = [], []
+        for lim in limits:
+            index, elapsed = _windows(lim, now)
+            keys += [f"rl:{lim.key}:{index}", f"rl:{lim.key}:{index - 1}"]
+            args += [lim.limit, lim.window, elapsed]
+        try:
+            wait = int(self._hit(keys=keys, args=args))
+        except redis.RedisError:
+            self.fallbacks += 1
+            if self.fallbacks == 1 or self.fallbacks % 1000 == 0:
+                logger.warning("rate limiter: Redis unavailable, limiting per process", exc_info=True)
+            wait = self.fallback.hit(limits, now)
+        if wait:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "rejected": self.rejected, "redis_fallbacks": self.fallbacks}
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,123 @@
+# app/infrastructure/redis/sms_queue.py
+import time
+from typing import List, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.domain.repositories.sms_provider import SmsMessage
+from .redis_client import redis_client
+
+# enqueue once per dedupe key (ARGV[2] = "" means always)
+_ENQUEUE_LUA = """
+if ARGV[2] ~= '' then
+    if not redis.call('SET', KEYS[2], '1', 'NX', 'EX', ARGV[3]) then
+        return 0
+    end
+end
+redis.call('LPUSH', KEYS[1], ARGV[1])
+return 1
+"""
+
+# pop up to ARGV[1] messages and park them in the scheduled set until
+# ARGV[2]: if the worker dies before ack/retry they are re-queued then
+_CLAIM_LUA = """
+local out = {}
+for i = 1, tonumber(ARGV[1]) do
+    local raw = redis.call('RPOP', KEYS[1])
+    if not raw then break end
+    redis.call('ZADD', KEYS[2], ARGV[2], raw)
+    out[#out + 1] = raw
+end
+return out
+"""
+
+# move due retries (and abandoned claims) back onto the queue
+_PROMOTE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, raw in ipairs(due) do
+    redis.call('ZREM', KEYS[1], raw)
+    redis.call('RPUSH', KEYS[2], raw)
+end
+return #due
+"""
+
+
+class SmsQueue:
+    """
+    SMS outbox in Redis, consumed by `flask sms-worker`.
+    Key format:
+        sms:queue          LIST, LPUSH in / RPOP out (FIFO)
+        sms:scheduled      ZSET raw message -> unix time it is due back on
+                           the queue: retries waiting out their backoff, and
+                           claimed messages until they are acked
+        sms:dead           LIST, last `dead_max` messages that gave up
+        sms:dedupe:{key}   enqueue-once markers
+
+    Delivery is at least once: a worker that dies mid-send leaves its
+    claimed messages in sms:scheduled, and they come back after
+    `visibility` seconds.
+    """
+
+    QUEUE = "sms:queue"
+    SCHEDULED = "sms:scheduled"
+    DEAD = "sms:dead"
+
+    def __init__(self, client: redis.Redis = redis_client, visibility: float | None = None, dead_max: int = 1000):
+        self.client = client
+        self.visibility = visibility or settings.SMS_TIMEOUT_SECONDS * 3
+        self.dead_max = dead_max
+        self._enqueue = client.register_script(_ENQUEUE_LUA)
+        self._claim = client.register_script(_CLAIM_LUA)
+        self._promote = client.register_script(_PROMOTE_LUA)
+
+    # ---- producer side ----------
+    def enqueue(self, message: SmsMessage, dedupe_key: Optional[str] = None, dedupe_ttl: int = 86400) -> bool:
+        """
+        False if `dedupe_key` was already enqueued within dedupe_ttl.
+        """
+        return bool(self._enqueue(
+            keys=[self.QUEUE, f"sms:dedupe:{dedupe_key}"],
+            args=[message.to_json(), dedupe_key or "", dedupe_ttl],
+        ))
+
+    # ---- worker side ----------
+    def claim(self, limit: int) -> List[Tuple[bytes, SmsMessage]]:
+        """
+        Up to `limit` messages as (raw, message); pass raw back to ack/retry/dead.
+        """
+        if limit <= 0:
+            return []
+        raws = self._claim(keys=[self.QUEUE, self.SCHEDULED], args=[limit, time.time() + self.visibility])
+        return [(raw, SmsMessage.from_json(raw)) for raw in raws]
+
+    def promote(self, limit: int = 1000) -> int:
+        return self._promote(keys=[self.SCHEDULED, self.QUEUE], args=[time.time(), limit])
+
+    def ack(self, raw: bytes) -> None:
+        self.client.zrem(self.SCHEDULED, raw)
+
+    def retry(self, raw: bytes, message: SmsMessage, delay: float) -> None:
+        message.attempts += 1
+        pipe = self.client.pipeline()
+        pipe.zrem(self.SCHEDULED, raw)
+        pipe.zadd(self.SCHEDULED, {message.to_json(): time.time() + delay})
+        pipe.execute()
+
+    def dead(self, raw: bytes, message: SmsMessage) -> None:
+        pipe = self.client.pipeline()
+        pipe.zrem(self.SCHEDULED, raw)
+        pipe.lpush(self.DEAD, message.to_json())
+        pipe.ltrim(self.DEAD, 0, self.dead_max - 1)
+        pipe.execute()
+
+    def depth(self) -> dict:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.llen(self.QUEUE)
+        pipe.zcard(self.SCHEDULED)
+        pipe.llen(self.DEAD)
+        queued, scheduled, dead = pipe.execute()
+        return {"queued": queued, "scheduled": scheduled, "dead": dead}
+
+
+sms_queue = SmsQueue()
@@ -0,0 +1,96 @@
+# app/infrastructure/redis/worker_lease.py
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.order_numbers import MAX_WORKERS, order_numbers
+from .redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# extend the lease only while it is still ours
+_RENEW_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class WorkerIdLease:
+    """
+    One of `size` worker ids, leased per process from Redis.
+    Key format: worker:{name}:{id} -> owner token (expires after ttl)
+
+    current() is called before every id is used: it renews the lease once
+    a third of the ttl has passed, and takes a new id if the lease was
+    lost (e.g. the process was paused longer than ttl). Forked children
+    drop the parent's id and lease their own.
+    """
+
+    def __init__(self, name: str, size: int = MAX_WORKERS, ttl: int | None = None, client: redis.Redis = redis_client):
+        self.name = name
+        self.size = size
+        self.ttl = ttl or settings.ORDER_WORKER_LEASE_SECONDS
+        self.client = client
+        self._renew_script = client.register_script(_RENEW_LUA)
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._id: Optional[int] = None
+        self._token = uuid.uuid4().hex
+        self._renew_at = 0.0
+
+    def _key(self, worker_id: int) -> str:
+        return f"worker:{self.name}:{worker_id}"
+
+    def current(self) -> int:
+        now = time.monotonic()
+        if self._id is not None and now < self._renew_at:
+            return self._id
+        try:
+            if self._id is not None and self._renew_script(
+                keys=[self._key(self._id)], args=[self._token, self.ttl]
+            ):
+                self._renew_at = now + self.ttl / 3
+                return self._id
+            return self._acquire(now)
+        except redis.RedisError:
+            # nobody can take our id while Redis is unreachable either;
+            # keep it and try again shortly
+            if self._id is None:
+                self._id = random.randrange(self.size)
+                logger.warning("worker id lease unavailable, using random id %s", self._id, exc_info=True)
+            self._renew_at = now + 1
+            return self._id
+
+    def _acquire(self, now: float) -> int:
+        start = random.randrange(self.size)
+        for i in range(self.size):
+            worker_id = (start + i) % self.size
+            if self.client.set(self._key(worker_id), self._token, nx=True, ex=self.ttl):
+                if self._id is not None and self._id != worker_id:
+                    logger.warning("worker id lease %s lost, now using %s", self._id, worker_id)
+                self._id = worker_id
+                self._renew_at = now + self.ttl / 3
+                return worker_id
+        raise RuntimeError(f"all {self.size} '{self.name}' worker ids are leased")
+
+
+def install_order_numbers() -> Optional[WorkerIdLease]:
+    """
+    Unless ORDER_WORKER_ID pins it, lease the order number worker id from Redis.
+    """
+    if settings.ORDER_WORKER_ID:
+        return None
+    lease = WorkerIdLease("orders")
+    order_numbers.set_worker_source(lease.current)
+    return lease
@@ -2,8 +2,10 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, build_page, decode_cursor
 from app.domain.entities.blog_post import BlogPost
 from app.domain.repositories.blog_repository import IBlogRepository
+from app.infrastructure.db.keyset import seek_after
 
 
 class SQLAlchemyBlogRepository(IBlogRepository):
@@ -20,26 +22,35 @@ class SQLAlchemyBlogRepository(IBlogRepository):
         self,
         is_published: Optional[bool] = True,
         limit: int = 50,
-        offset: int = 0,
-    ) -> List[BlogPost]:
-        q = self.db.query(BlogPost)
+        cursor: Optional[str] = None,
+    ) -> Page[BlogPost]:
+        base = self.db.query(BlogPost)
         if is_published is not None:
-            q = q.filter(BlogPost.is_published == is_published)
-        return (
-            q.order_by(BlogPost.published_at.desc().nullslast())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+            base = base.filter(BlogPost.is_published == is_published)
+        after = decode_cursor(cursor, 2)
+
+        # NULLS LAST as two range scans of ix_blog_posts_published (ordering
+        # by "published_at IS NULL" would sort instead): dated posts, then,
+        # once those run out, the undated ones by id
+        rows = []
+        if not after or after[0] is not None:
+            q = base.filter(BlogPost.published_at.isnot(None))
+            if after:
+                q = q.filter(seek_after(BlogPost.published_at, after[0], BlogPost.id, after[1]))
+            rows = q.order_by(BlogPost.published_at.desc(), BlogPost.id.desc()).limit(limit + 1).all()
+        if len(rows) <= limit:
+            q = base.filter(BlogPost.published_at.is_(None))
+            if after and after[0] is None:
+                q = q.filter(BlogPost.id < after[1])
+            rows += q.order_by(BlogPost.id.desc()).limit(limit + 1 - len(rows)).all()
+        return build_page(rows, limit, lambda p: (p.published_at, p.id))
 
     def create(self, post: BlogPost) -> BlogPost:
         self.db.add(post)
-        self.db.commit()
-        self.db.refresh(post)
+        self.db.flush()
         return post
 
     def update(self, post: BlogPost) -> BlogPost:
         self.db.add(post)
-        self.db.commit()
-        self.db.refresh(post)
+        self.db.flush()
         return post
@@ -0,0 +1,368 @@
+# app/infrastructure/repositories/cached.py
+"""
+Read-through caching wrappers around the SQLAlchemy repositories.
+
+They implement the same I*Repository interfaces, so services don't know
+whether they talk to the cache or the database. Cached reads return
+*detached* entities; writes re-attach them with session.merge() and
+invalidate the affected tags once the unit of work commits.
+
+Tags:
+    product:{id}     every cached entry that contains that product
+    catalog          every product-derived entry (purge-all switch)
+    catalog:lists    product listings (top sellers, ...)
+    blog:{id}        a blog post
+    categories       the category set (per-process slug map, see category_map.py)
+    roles:{user_id}  a user's role set
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import inspect
+
+from app.core.pagination import Page
+from app.domain.entities.blog_post import BlogPost
+from app.domain.entities.category import Category
+from app.domain.entities.inventory_ledger import InventoryLedgerEntry
+from app.domain.entities.product import Product
+from app.domain.entities.role import Role
+from app.domain.entities.user import User
+from app.domain.repositories.blog_repository import IBlogRepository
+from app.domain.repositories.category_repository import ICategoryRepository
+from app.domain.repositories.inventory_repository import IInventoryRepository
+from app.domain.repositories.product_repository import IProductRepository
+from app.domain.repositories.user_repository import IUserRepository
+from app.infrastructure.cache.category_map import CATEGORIES_TAG, category_slugs
+from app.infrastructure.cache.redis_cache import RedisTagCache
+from app.infrastructure.cache.serialization import entity_from_dict, entity_to_dict
+from app.infrastructure.db.session import primary_reads
+
+
+def _run_now(callback: Callable[[], None]) -> None:
+    callback()
+
+
+def _dict_or_none(obj) -> Optional[dict]:
+    return entity_to_dict(obj) if obj is not None else None
+
+
+class _CachedRepository:
+    # method name -> TTL in seconds (0 disables caching for that method)
+    default_ttls: Dict[str, int] = {}
+    name = "repo"
+
+    def __init__(
+        self,
+        inner,
+        cache: RedisTagCache,
+        after_commit: Callable[[Callable[[], None]], None] = _run_now,
+        ttls: Optional[Dict[str, int]] = None,
+    ):
+        self.inner = inner
+        self.cache = cache
+        self.after_commit = after_commit
+        self.ttls = dict(self.default_ttls, **(ttls or {}))
+
+    def _ttl(self, method: str) -> int:
+        return self.ttls.get(method, 0)
+
+    def _stat(self, method: str) -> str:
+        return f"{self.name}.{method}"
+
+    def _attach(self, obj):
+        # entities served from the cache are detached; bring them back
+        if inspect(obj).detached:
+            return self.inner.db.merge(obj)
+        return obj
+
+    def _load(self, loader: Callable[[], Any]) -> Any:
+        # cache misses are read from the primary: a lagging replica's row
+        # would be cached after the invalidation for it already fired
+        with primary_reads(self.inner.db):
+            return loader()
+
+    def _invalidate_on_commit(self, *tags: str) -> None:
+        self.after_commit(lambda: self.cache.invalidate(*tags))
+
+
+class CachedProductRepository(_CachedRepository, IProductRepository):
+    default_ttls = {
+        "get_by_id": 300,
+        "get_by_slug": 300,
+        "get_top_selling_products_for_last_days": 60,
+    }
+    name = "product"
+
+    @staticmethod
+    def _tags(data: dict) -> List[str]:
+        return [f"product:{data['id']}", "catalog"]
+
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        data, _ = self.cache.get_or_load(
+            self._stat("get_by_id"),
+            f"product:id:{product_id}",
+            self._ttl("get_by_id"),
+            lambda: self._load(lambda: _dict_or_none(self.inner.get_by_id(product_id))),
+            self._tags,
+        )
+        return entity_from_dict(Product, data) if data else None
+
+    def get_for_update(self, product_id: int) -> Optional[Product]:
+        return self.inner.get_for_update(product_id)
+
+    def get_by_slug(self, slug: str) -> Optional[Product]:
+        data, _ = self.cache.get_or_load(
+            self._stat("get_by_slug"),
+            f"product:slug:{slug}",
+            self._ttl("get_by_slug"),
+            lambda: self._load(lambda: _dict_or_none(self.inner.get_by_slug(slug))),
+            self._tags,
+        )
+        return entity_from_dict(Product, data) if data else None
+
+    def get_many_by_ids(self, product_ids: Iterable[int]) -> Dict[int, Product]:
+        """
+        Same entries as get_by_id: one cache round trip for all ids, one
+        IN query for the misses.
+        """
+        ids = list(dict.fromkeys(product_ids))
+        keys = {pid: f"product:id:{pid}" for pid in ids}
+        found = self.cache.get_many(self._stat("get_by_id"), list(keys.values()))
+
+        out = {pid: entity_from_dict(Product, found[key]) for pid, key in keys.items() if key in found}
+        missing = [pid for pid in ids if pid not in out]
+        if missing:
+            since = self.cache.version()
+            loaded = self._load(lambda: self.inner.get_many_by_ids(missing))
+            ttl = self._ttl("get_by_id")
+            if ttl > 0 and loaded and since is not None:
+                self.cache.set_many(
+                    (
+                        (keys[pid], data, ttl, self._tags(data))
+                        for pid, data in ((pid, entity_to_dict(p)) for pid, p in loaded.items())
+                    ),
+                    since=since,
+                )
+            out.update(loaded)
+        return out
+
+    def list_products(
+        self,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
+        return self.inner.list_products(
+            category_id=category_id,
+            search=search,
+            is_active=is_active,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def create(self, product: Product) -> Product:
+        created = self.inner.create(product)
+        # product:{id} also tells other workers (e.g. their suggest index) it exists
+        self._invalidate_on_commit(f"product:{created.id}", "catalog:lists")
+        return created
+
+    def update(self, product: Product) -> Product:
+        updated = self.inner.update(self._attach(product))
+        self._invalidate_on_commit(f"product:{updated.id}", "catalog:lists")
+        return updated
+
+    def get_top_selling_products_for_last_days(
+        self, days: int, limit: int = 8
+    ) -> List[Product]:
+        rows, _ = self.cache.get_or_load(
+            self._stat("get_top_selling_products_for_last_days"),
+            f"product:top:{days}:{limit}",
+            self._ttl("get_top_selling_products_for_last_days"),
+            lambda: self._load(lambda: [
+                entity_to_dict(p)
+                for p in self.inner.get_top_selling_products_for_last_days(days=days, limit=limit)
+            ]),
+            lambda rows: ["catalog", "catalog:lists"] + [f"product:{r['id']}" for r in rows],
+        )
+        return [entity_from_dict(Product, r) for r in rows]
+
+
+class CachedInventoryRepository(_CachedRepository, IInventoryRepository):
+    """
+    Nothing is cached here: stock changes go straight to the database,
+    and the cached entries of a product whose stock changed are dropped
+    once the transaction commits.
+    """
+
+    name = "inventory"
+
+    def reserve(self, product_id: int, quantity: int) -> bool:
+        reserved = self.inner.reserve(product_id, quantity)
+        if reserved:
+            self._invalidate_on_commit(f"product:{product_id}")
+        return reserved
+
+    def release(self, product_id: int, quantity: int) -> None:
+        self.inner.release(product_id, quantity)
+        self._invalidate_on_commit(f"product:{product_id}")
+
+    def append(self, entries: List[InventoryLedgerEntry]) -> None:
+        self.inner.append(entries)
+
+    def reserved_for_order(self, order_id: int) -> Dict[int, int]:
+        return self.inner.reserved_for_order(order_id)
+
+
+class CachedBlogRepository(_CachedRepository, IBlogRepository):
+    default_ttls = {"get_by_slug": 300}
+    name = "blog"
+
+    def get_by_id(self, post_id: int) -> Optional[BlogPost]:
+        return self.inner.get_by_id(post_id)
+
+    def get_by_slug(self, slug: str) -> Optional[BlogPost]:
+        data, _ = self.cache.get_or_load(
+            self._stat("get_by_slug"),
+            f"blog:slug:{slug}",
+            self._ttl("get_by_slug"),
+            lambda: self._load(lambda: _dict_or_none(self.inner.get_by_slug(slug))),
+            lambda d: [f"blog:{d['id']}"],
+        )
+        return entity_from_dict(BlogPost, data) if data else None
+
+    def list_posts(
+        self,
+        is_published: Optional[bool] = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Page[BlogPost]:
+        return self.inner.list_posts(is_published=is_published, limit=limit, cursor=cursor)
+
+    def create(self, post: BlogPost) -> BlogPost:
+        return self.inner.create(post)
+
+    def update(self, post: BlogPost) -> BlogPost:
+        updated = self.inner.update(self._attach(post))
+        self._invalidate_on_commit(f"blog:{updated.id}")
+        return updated
+
+
+class CachedCategoryRepository(_CachedRepository, ICategoryRepository):
+    """
+    Slugs resolve through the per-process map; entities are not cached.
+    """
+
+    name = "category"
+
+    def get_by_id(self, category_id: int) -> Optional[Category]:
+        return self.inner.get_by_id(category_id)
+
+    def get_by_slug(self, slug: str) -> Optional[Category]:
+        return self.inner.get_by_slug(slug)
+
+    def get_id_by_slug(self, slug: str) -> Optional[int]:
+        return category_slugs.resolve(slug, self.inner.slug_map)
+
+    def list_categories(self, is_active: Optional[bool] = True) -> List[Category]:
+        return self.inner.list_categories(is_active=is_active)
+
+    def create(self, category: Category) -> Category:
+        created = self.inner.create(category)
+        self._changed()
+        return created
+
+    def update(self, category: Category) -> Category:
+        updated = self.inner.update(self._attach(category))
+        self._changed()
+        return updated
+
+    def _changed(self) -> None:
+        # local map right away; other processes hear the tag on the channel
+        self.after_commit(category_slugs.invalidate)
+        self._invalidate_on_commit(CATEGORIES_TAG)
+
+
+class CachedUserRepository(_CachedRepository, IUserRepository):
+    """
+    Users themselves are not cached (profile/auth data must be fresh);
+    only the role set used when issuing tokens and checking roles is.
+    add_role / remove_role drop it (here and in every worker's local
+    tier) once the change commits, and it is always reloaded from the
+    primary, so a grant or revoke is seen by the very next request.
+    """
+
+    default_ttls = {"get_roles": 300}
+    name = "user"
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        return self.inner.get_by_id(user_id)
+
+    def get_by_phone(self, phone: str) -> Optional[User]:
+        return self.inner.get_by_phone(phone)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        return self.inner.get_by_email(email)
+
+    def list_users(self, limit: int = 50, cursor: Optional[str] = None) -> Page[User]:
+        return self.inner.list_users(limit=limit, cursor=cursor)
+
+    def create(self, user: User) -> User:
+        return self.inner.create(user)
+
+    def update(self, user: User) -> User:
+        return self.inner.update(user)
+
+    def get_roles(self, user_id: int) -> List[Role]:
+        rows, _ = self.cache.get_or_load(
+            self._stat("get_roles"),
+            f"user:roles:{user_id}",
+            self._ttl("get_roles"),
+            lambda: self._load(lambda: [entity_to_dict(r) for r in self.inner.get_roles(user_id)]),
+            lambda _: [f"roles:{user_id}"],
+        )
+        return [entity_from_dict(Role, r) for r in rows]
+
+    def get_roles_for_users(self, user_ids: Iterable[int]) -> Dict[int, List[Role]]:
+        """
+        Same entries as get_roles: one cache round trip for all ids, one
+        query for the misses.
+        """
+        ids = list(dict.fromkeys(user_ids))
+        keys = {uid: f"user:roles:{uid}" for uid in ids}
+        found = self.cache.get_many(self._stat("get_roles"), list(keys.values()))
+
+        out = {
+            uid: [entity_from_dict(Role, r) for r in found[key]]
+            for uid, key in keys.items() if key in found
+        }
+        missing = [uid for uid in ids if uid not in out]
+        if missing:
+            since = self.cache.version()
+            loaded = self._load(lambda: self.inner.get_roles_for_users(missing))
+            ttl = self._ttl("get_roles")
+            if ttl > 0 and since is not None:
+                self.cache.set_many(
+                    (
+                        (keys[uid], [entity_to_dict(r) for r in roles], ttl, [f"roles:{uid}"])
+                        for uid, roles in loaded.items()
+                    ),
+                    since=since,
+                )
+            out.update(loaded)
+        return out
+
+    def get_role_by_name(self, name: str) -> Optional[Role]:
+        return self.inner.get_role_by_name(name)
+
+    def add_role(self, user_id: int, role_id: int) -> bool:
+        added = self.inner.add_role(user_id, role_id)
+        if added:
+            self._invalidate_on_commit(f"roles:{user_id}")
+        return added
+
+    def remove_role(self, user_id: int, role_id: int) -> bool:
+        removed = self.inner.remove_role(user_id, role_id)
+        if removed:
+            self._invalidate_on_commit(f"roles:{user_id}")
+        return removed
@@ -0,0 +1,540 @@
+# app/infrastructure/repositories/cart_redis.py
+"""
+Redis cart store (CART_STORE=redis) with write-behind to carts/cart_items.
+
+Layout (prefix "cart"):
+    cart:{id}             hash: "meta" -> cart row, "item:{item_id}" -> item row,
+                          "qty:{item_id}" -> the item's quantity (authoritative;
+                          its line_total is unit_price * qty),
+                          "version" -> bumped by every mutation
+    cart:user:{user_id}   -> cart id (expires with the cart hash)
+    cart:item:{item_id}   -> cart id, until the item is deleted or the key
+                          expires (lookups fall back to cart_items)
+    cart:seq:cart|item    id sequences, seeded above MAX(id) of the SQL tables
+    cart:dirty            set of cart ids changed since they were last persisted
+
+Item mutations are single Lua calls (atomic: concurrent adds to the
+same line never lose an increment) that bump the version, refresh both
+TTLs and mark the cart dirty; CartFlusher copies dirty carts to MariaDB in batches. Carts that
+are not in Redis (expired, or written by the SQL store) are loaded from
+the database on first access. A cart's total_amount / item_count are
+summed from its hash when it is read (the same HGETALL that returns the
+items).
+
+Writes are not part of the unit of work's transaction: they are visible
+as soon as the call returns, even if the request fails afterwards.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.domain.entities.cart import Cart
+from app.domain.entities.cart_item import CartItem
+from app.domain.repositories.cart_repository import ICartRepository
+from app.infrastructure.cache.serialization import dumps, loads
+from app.infrastructure.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "cart"
+DIRTY_KEY = f"{PREFIX}:dirty"
+
+_CART_COLUMNS = ("id", "user_id", "status", "created_at", "updated_at")
+_TOTAL_COLUMNS = ("total_amount", "item_count", "version")
+_ITEM_COLUMNS = ("id", "cart_id", "product_id", "title_snapshot", "unit_price", "quantity", "line_total")
+
+# SET key to max(current, ARGV[1])
+_SEED_SEQUENCE_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+# Shared by the item scripts below.
+# KEYS: cart hash, dirty set
+# ARGV: ttl, cart id, key prefix ("cart:"), then the script's own arguments
+_ITEM_LUA_PRELUDE = """
+local function touch()
+    redis.call('HINCRBY', KEYS[1], 'version', 1)
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    redis.call('SADD', KEYS[2], ARGV[2])
+    local meta = redis.call('HGET', KEYS[1], 'meta')
+    if meta then
+        -- the user -> cart pointer lives as long as the cart itself
+        local user_id = cjson.decode(meta)['user_id']
+        redis.call('SET', ARGV[3] .. 'user:' .. string.format('%d', user_id), ARGV[2], 'EX', ARGV[1])
+    end
+end
+
+local function map_item(id)
+    -- item -> cart pointer for items not flushed to MariaDB yet. Not
+    -- refreshed by touch(): by the time it expires the item is long
+    -- persisted and found in cart_items instead
+    redis.call('SET', ARGV[3] .. 'item:' .. id, ARGV[2], 'EX', ARGV[1])
+end
+
+local function qty_field(id)
+    -- hashes written before quantities had their own field
+    local field = 'qty:' .. id
+    if redis.call('HEXISTS', KEYS[1], field) == 0 then
+        local row = redis.call('HGET', KEYS[1], 'item:' .. id)
+        redis.call('HSET', KEYS[1], field, cjson.decode(row)['quantity'])
+    end
+    return field
+end
+"""
+
+# Add ARGV[7] units of product ARGV[4]: to its existing line, else as a
+# new line (id ARGV[5], row ARGV[6]). -> {item id, new quantity}
+_ADD_QUANTITY_LUA = _ITEM_LUA_PRELUDE + """
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    if string.sub(fields[i], 1, 5) == 'item:'
+        and cjson.decode(fields[i + 1])['product_id'] == tonumber(ARGV[4]) then
+        local id = string.sub(fields[i], 6)
+        local qty = redis.call('HINCRBY', KEYS[1], qty_field(id), ARGV[7])
+        touch()
+        return {tonumber(id), qty}
+    end
+end
+redis.call('HSET', KEYS[1], 'item:' .. ARGV[5], ARGV[6])
+redis.call('HSET', KEYS[1], 'qty:' .. ARGV[5], ARGV[7])
+map_item(ARGV[5])
+touch()
+return {tonumber(ARGV[5]), tonumber(ARGV[7])}
+"""
+
+# Store item ARGV[4] (row ARGV[5], quantity ARGV[6]) as given.
+_PUT_ITEM_LUA = _ITEM_LUA_PRELUDE + """
+redis.call('HSET', KEYS[1], 'item:' .. ARGV[4], ARGV[5])
+redis.call('HSET', KEYS[1], 'qty:' .. ARGV[4], ARGV[6])
+map_item(ARGV[4])
+touch()
+return 1
+"""
+
+# Set the quantity of item ARGV[4] to ARGV[5], if it is still in the cart.
+_SET_QUANTITY_LUA = _ITEM_LUA_PRELUDE + """
+if redis.call('HEXISTS', KEYS[1], 'item:' .. ARGV[4]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'qty:' .. ARGV[4], ARGV[5])
+touch()
+return 1
+"""
+
+# Remove items ARGV[4..] (none given: every item of the cart).
+_DELETE_ITEMS_LUA = _ITEM_LUA_PRELUDE + """
+local ids = {}
+if #ARGV > 3 then
+    for i = 4, #ARGV do
+        ids[#ids + 1] = ARGV[i]
+    end
+else
+    for _, name in ipairs(redis.call('HKEYS', KEYS[1])) do
+        if string.sub(name, 1, 5) == 'item:' then
+            ids[#ids + 1] = string.sub(name, 6)
+        end
+    end
+end
+for _, id in ipairs(ids) do
+    redis.call('HDEL', KEYS[1], 'item:' .. id, 'qty:' .. id)
+    redis.call('DEL', ARGV[3] .. 'item:' .. id)
+end
+touch()
+return #ids
+"""
+
+# Load a persisted cart into an absent hash only: if someone else already
+# did (and maybe changed it since), leave their version alone.
+_HYDRATE_LUA = """
+if redis.call('HSETNX', KEYS[1], 'meta', ARGV[2]) == 0 then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def _cart_key(cart_id: int) -> str:
+    return f"{PREFIX}:{cart_id}"
+
+
+def _user_key(user_id: int) -> str:
+    return f"{PREFIX}:user:{user_id}"
+
+
+def _item_key(item_id: int) -> str:
+    return f"{PREFIX}:item:{item_id}"
+
+
+def _seq_key(name: str) -> str:
+    return f"{PREFIX}:seq:{name}"
+
+
+def _row(obj, columns) -> dict:
+    return {c: getattr(obj, c) for c in columns}
+
+
+def _item_row(fields: Dict[bytes, bytes], field: bytes) -> dict:
+    row = loads(fields[field])
+    qty = fields.get(b"qty:" + field[5:])
+    if qty is not None:
+        row["quantity"] = int(qty)
+        row["line_total"] = Decimal(str(row["unit_price"])) * row["quantity"]
+    return row
+
+
+def _item_rows(fields: Dict[bytes, bytes]) -> List[dict]:
+    return [_item_row(fields, k) for k in fields if k.startswith(b"item:")]
+
+
+def _cart_row(fields: Dict[bytes, bytes]) -> Optional[dict]:
+    """
+    Cart columns (totals included) from a cart hash; None if it has no meta.
+    """
+    meta = fields.get(b"meta")
+    if meta is None:
+        return None
+    row = loads(meta)
+    items = _item_rows(fields)
+    row["total_amount"] = sum((Decimal(str(it["line_total"])) for it in items), Decimal("0.00"))
+    row["item_count"] = sum(int(it["quantity"]) for it in items)
+    row["version"] = int(fields.get(b"version") or 0)
+    return row
+
+
+def _cart_items(fields: Dict[bytes, bytes]) -> List[CartItem]:
+    items = [CartItem(**row) for row in _item_rows(fields)]
+    return sorted(items, key=lambda it: it.id)
+
+
+class RedisCartRepository(ICartRepository):
+    transactional = False
+
+    def __init__(self, db: Session, client: redis.Redis = redis_client):
+        # db is only used to load carts that aren't in Redis yet
+        self.db = db
+        self.client = client
+        self.ttl = settings.CART_REDIS_TTL_DAYS * 86400
+        self._hydrate_script = client.register_script(_HYDRATE_LUA)
+        self._add_quantity_script = client.register_script(_ADD_QUANTITY_LUA)
+        self._put_item_script = client.register_script(_PUT_ITEM_LUA)
+        self._set_quantity_script = client.register_script(_SET_QUANTITY_LUA)
+        self._delete_items_script = client.register_script(_DELETE_ITEMS_LUA)
+        if cart_flusher is not None:
+            cart_flusher.ensure_running()  # e.g. first request after a fork
+
+    # ---- carts ----------
+    def get_by_user(self, user_id: int) -> Optional[Cart]:
+        cart_id = self.client.get(_user_key(user_id))
+        if cart_id is not None:
+            cart = self.get_by_id(int(cart_id))
+            if cart is not None:
+                return cart
+        row = self.db.query(Cart).filter(Cart.user_id == user_id).first()
+        return self._hydrate(row) if row else None
+
+    def get_by_id(self, cart_id: int) -> Optional[Cart]:
+        row = _cart_row(self._load_hash(cart_id))
+        return Cart(**row) if row else None
+
+    def create(self, cart: Cart) -> Cart:
+        now = datetime.utcnow()
+        cart.id = int(self.client.incr(_seq_key("cart")))
+        cart.status = cart.status or "ACTIVE"
+        cart.created_at = cart.created_at or now
+        cart.updated_at = now
+        cart.total_amount, cart.item_count, cart.version = Decimal("0.00"), 0, 0
+        pipe = self.client.pipeline()
+        pipe.hset(_cart_key(cart.id), mapping={"meta": dumps(_row(cart, _CART_COLUMNS)), "version": 0})
+        pipe.expire(_cart_key(cart.id), self.ttl)
+        pipe.set(_user_key(cart.user_id), cart.id, ex=self.ttl)
+        pipe.sadd(DIRTY_KEY, cart.id)
+        pipe.execute()
+        return cart
+
+    # ---- items ----------
+    def get_items(self, cart_id: int) -> List[CartItem]:
+        return _cart_items(self._load_hash(cart_id))
+
+    def get_cart_with_items(self, cart_id: int) -> Optional[Tuple[Cart, List[CartItem]]]:
+        fields = self._load_hash(cart_id)
+        row = _cart_row(fields)
+        return (Cart(**row), _cart_items(fields)) if row else None
+
+    def get_item_by_id(self, item_id: int) -> Optional[CartItem]:
+        found = self.get_item_with_cart(item_id)
+        return found[0] if found else None
+
+    def get_item_with_cart(self, item_id: int) -> Optional[Tuple[CartItem, Cart]]:
+        cart_id = self.client.get(_item_key(item_id))
+        if cart_id is None:
+            row = self.db.query(CartItem.cart_id).filter(CartItem.id == item_id).first()
+            if row is None:
+                return None
+            cart_id = row[0]
+        fields = self._load_hash(int(cart_id))
+        field = f"item:{item_id}".encode()
+        if field not in fields:
+            return None
+        return CartItem(**_item_row(fields, field)), Cart(**_cart_row(fields))
+
+    def get_item_by_cart_and_product(
+        self, cart_id: int, product_id: int
+    ) -> Optional[CartItem]:
+        for item in self.get_items(cart_id):
+            if item.product_id == product_id:
+                return item
+        return None
+
+    def add_item(self, item: CartItem) -> CartItem:
+        item.id = int(self.client.incr(_seq_key("item")))
+        self._run(self._put_item_script, item.cart_id, item.id, dumps(_row(item, _ITEM_COLUMNS)), item.quantity)
+        return item
+
+    def add_quantity(self, item: CartItem) -> CartItem:
+        self._load_hash(item.cart_id)  # a persisted cart must be in Redis first
+        new_id = int(self.client.incr(_seq_key("item")))  # unused if the line exists
+        row = dumps(_row(item, _ITEM_COLUMNS) | {"id": new_id})
+        item_id, quantity = self._run(
+            self._add_quantity_script, item.cart_id, item.product_id, new_id, row, item.quantity
+        )
+        if int(item_id) == new_id:
+            item.id = new_id
+            return item
+        return self.get_item_by_id(int(item_id))
+
+    def update_item(self, item: CartItem) -> CartItem:
+        # only the quantity of a line changes (line_total follows from it)
+        self._run(self._set_quantity_script, item.cart_id, item.id, item.quantity)
+        return item
+
+    def delete_item(self, item: CartItem) -> None:
+        self._run(self._delete_items_script, item.cart_id, item.id)
+
+    def clear_items(self, cart_id: int) -> None:
+        self._load_hash(cart_id)
+        self._run(self._delete_items_script, cart_id)
+
+    # ---- helpers ----------
+    def _run(self, script, cart_id: int, *args):
+        return script(
+            keys=[_cart_key(cart_id), DIRTY_KEY],
+            args=[self.ttl, cart_id, f"{PREFIX}:", *args],
+        )
+
+    def _load_hash(self, cart_id: int) -> Dict[bytes, bytes]:
+        fields = self.client.hgetall(_cart_key(cart_id))
+        if fields:
+            return fields
+        row = self.db.query(Cart).filter(Cart.id == cart_id).first()
+        if row is None:
+            return {}
+        self._hydrate(row)
+        return self.client.hgetall(_cart_key(cart_id))
+
+    def _hydrate(self, row: Cart) -> Cart:
+        """
+        Copy a persisted cart (and its items) into Redis. Not marked dirty.
+        """
+        items = self.db.query(CartItem).filter(CartItem.cart_id == row.id).all()
+        args = [self.ttl, dumps(_row(row, _CART_COLUMNS)), "version", row.version or 0]
+        for it in items:
+            args += [f"item:{it.id}", dumps(_row(it, _ITEM_COLUMNS)), f"qty:{it.id}", it.quantity]
+        self._hydrate_script(keys=[_cart_key(row.id)], args=args)
+
+        # its items are in cart_items, so get_item_with_cart finds them
+        # without an item -> cart key
+        self.client.set(_user_key(row.user_id), row.id, ex=self.ttl)
+        return Cart(**_row(row, _CART_COLUMNS + _TOTAL_COLUMNS))
+
+
+# ---- write-behind ----------
+def seed_sequences(session_factory: sessionmaker, client: redis.Redis = redis_client) -> None:
+    """
+    Make Redis-issued ids start above what the SQL tables already hold.
+    """
+    seed = client.register_script(_SEED_SEQUENCE_LUA)
+    session = session_factory()
+    try:
+        max_cart = session.query(func.max(Cart.id)).scalar() or 0
+        max_item = session.query(func.max(CartItem.id)).scalar() or 0
+    finally:
+        session.close()
+    seed(keys=[_seq_key("cart")], args=[max_cart])
+    seed(keys=[_seq_key("item")], args=[max_item])
+
+
+class CartFlusher:
+    """
+    Copies dirty carts to MariaDB: SPOP a batch of ids, snapshot their
+    hashes, then in one transaction upsert the cart rows and replace
+    their items (DELETE + one multi-row INSERT). On failure the ids go
+    back into the dirty set.
+
+    A per-cart lock keeps two workers from writing the same cart out of
+    order; a cart changed during a flush is simply dirty again.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        client: redis.Redis = redis_client,
+        batch_size: int = 200,
+        interval: float = 2.0,
+    ):
+        self.session_factory = session_factory
+        self.client = client
+        self.batch_size = batch_size
+        self.interval = interval
+        self.flushed = 0
+        self.failures = 0
+        self.last_flush_at: Optional[float] = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def flush_once(self) -> int:
+        ids = [int(i) for i in self.client.spop(DIRTY_KEY, self.batch_size) or []]
+        if not ids:
+            return 0
+
+        locked, busy = [], []
+        for cart_id in ids:
+            if self.client.set(f"{PREFIX}:flushlock:{cart_id}", os.getpid(), nx=True, px=30000):
+                locked.append(cart_id)
+            else:
+                busy.append(cart_id)
+        if busy:
+            self.client.sadd(DIRTY_KEY, *busy)
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for cart_id in locked:
+                pipe.hgetall(_cart_key(cart_id))
+            snapshots = dict(zip(locked, pipe.execute()))
+            self._persist(snapshots)
+            self.flushed += len(locked)
+            self.last_flush_at = time.time()
+            return len(locked)
+        except Exception:
+            self.failures += 1
+            if locked:
+                self.client.sadd(DIRTY_KEY, *locked)
+            raise
+        finally:
+            if locked:
+                self.client.delete(*[f"{PREFIX}:flushlock:{cart_id}" for cart_id in locked])
+
+    def flush_all(self) -> int:
+        total = 0
+        while True:
+            n = self.flush_once()
+            total += n
+            if n == 0:
+                return total
+
+    def _persist(self, snapshots: Dict[int, Dict[bytes, bytes]]) -> None:
+        carts, items = [], []
+        for cart_id, fields in snapshots.items():
+            row = _cart_row(fields)
+            if row is None:
+                continue  # expired before we got to it
+            carts.append(row)
+            items.extend(_item_rows(fields))
+        if not carts:
+            return
+
+        session = self.session_factory()
+        try:
+            cart_ids = [c["id"] for c in carts]
+            existing = {
+                cart_id for (cart_id,) in session.query(Cart.id).filter(Cart.id.in_(cart_ids)).all()
+            }
+            new_rows = [c for c in carts if c["id"] not in existing]
+            old_rows = [c for c in carts if c["id"] in existing]
+            if new_rows:
+                session.execute(insert(Cart).values(new_rows))
+            if old_rows:
+                # executemany UPDATE ... WHERE id = :id
+                session.execute(update(Cart), old_rows)
+            session.execute(delete(CartItem).where(CartItem.cart_id.in_(cart_ids)))
+            if items:
+                session.execute(insert(CartItem).values(items))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    # ---- background thread ----------
+    def ensure_running(self) -> None:
+        """
+        Start the flush loop in this process (again after a fork).
+        """
+        pid = os.getpid()
+        if self._pid == pid or self.interval <= 0:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            threading.Thread(target=self._run, name="cart-write-behind", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                while self.flush_once() == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("cart write-behind flush failed")
+
+    def stats(self) -> dict:
+        try:
+            dirty = self.client.scard(DIRTY_KEY)
+        except redis.RedisError:
+            dirty = None
+        return {
+            "dirty": dirty,
+            "flushed": self.flushed,
+            "failures": self.failures,
+            "last_flush_at": self.last_flush_at,
+        }
+
+
+cart_flusher: Optional[CartFlusher] = None
+
+
+def install_cart_store(session_factory: sessionmaker) -> Optional[CartFlusher]:
+    """
+    With CART_STORE=redis: seed the id sequences and start write-behind.
+    """
+    global cart_flusher
+    if settings.CART_STORE != "redis":
+        return None
+    seed_sequences(session_factory)
+    cart_flusher = CartFlusher(
+        session_factory,
+        batch_size=settings.CART_FLUSH_BATCH_SIZE,
+        interval=settings.CART_FLUSH_INTERVAL_SECONDS,
+    )
+    cart_flusher.ensure_running()
+    register_collector("cart_write_behind", cart_flusher.stats)
+    return cart_flusher
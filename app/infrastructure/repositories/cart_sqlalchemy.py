@@ -1,5 +1,8 @@
 # app/infrastructure/repositories/cart_sqlalchemy.py
-from typing import Optional, List
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, List, Tuple
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
 from app.domain.entities.cart import Cart
@@ -7,6 +10,16 @@ from app.domain.entities.cart_item import CartItem
 from app.domain.repositories.cart_repository import ICartRepository
 
 
+def _previous(item: CartItem, attr: str):
+    """
+    Value of attr before the caller changed it (current value if unchanged).
+    """
+    history = inspect(item).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(item, attr)
+
+
 class SQLAlchemyCartRepository(ICartRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -19,8 +32,7 @@ class SQLAlchemyCartRepository(ICartRepository):
 
     def create(self, cart: Cart) -> Cart:
         self.db.add(cart)
-        self.db.commit()
-        self.db.refresh(cart)
+        self.db.flush()
         return cart
 
     def get_items(self, cart_id: int) -> List[CartItem]:
@@ -31,9 +43,30 @@ class SQLAlchemyCartRepository(ICartRepository):
             .all()
         )
 
+    def get_cart_with_items(self, cart_id: int) -> Optional[Tuple[Cart, List[CartItem]]]:
+        rows = (
+            self.db.query(Cart, CartItem)
+            .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+            .filter(Cart.id == cart_id)
+            .order_by(CartItem.id.asc())
+            .all()
+        )
+        if not rows:
+            return None
+        return rows[0][0], [item for _, item in rows if item is not None]
+
     def get_item_by_id(self, item_id: int) -> Optional[CartItem]:
         return self.db.query(CartItem).filter(CartItem.id == item_id).first()
 
+    def get_item_with_cart(self, item_id: int) -> Optional[Tuple[CartItem, Cart]]:
+        row = (
+            self.db.query(CartItem, Cart)
+            .join(Cart, Cart.id == CartItem.cart_id)
+            .filter(CartItem.id == item_id)
+            .first()
+        )
+        return (row[0], row[1]) if row else None
+
     def get_item_by_cart_and_product(
         self, cart_id: int, product_id: int
     ) -> Optional[CartItem]:
@@ -45,20 +78,61 @@ class SQLAlchemyCartRepository(ICartRepository):
 
     def add_item(self, item: CartItem) -> CartItem:
         self.db.add(item)
-        self.db.commit()
-        self.db.refresh(item)
+        self.db.flush()
+        self._bump(item.cart_id, Decimal(str(item.line_total)), item.quantity)
         return item
 
+    def add_quantity(self, item: CartItem) -> CartItem:
+        existing = self.get_item_by_cart_and_product(item.cart_id, item.product_id)
+        if existing is None:
+            return self.add_item(item)
+        amount = Decimal(str(existing.unit_price)) * item.quantity
+        # relative UPDATE, like _bump: concurrent adds can't lose units
+        self.db.query(CartItem).filter(CartItem.id == existing.id).update(
+            {
+                CartItem.quantity: CartItem.quantity + item.quantity,
+                CartItem.line_total: CartItem.line_total + amount,
+            },
+            synchronize_session=False,
+        )
+        self._bump(item.cart_id, amount, item.quantity)
+        self.db.refresh(existing)
+        return existing
+
     def update_item(self, item: CartItem) -> CartItem:
+        amount = Decimal(str(item.line_total)) - Decimal(str(_previous(item, "line_total")))
+        count = item.quantity - _previous(item, "quantity")
         self.db.add(item)
-        self.db.commit()
-        self.db.refresh(item)
+        self.db.flush()
+        self._bump(item.cart_id, amount, count)
         return item
 
     def delete_item(self, item: CartItem) -> None:
         self.db.delete(item)
-        self.db.commit()
+        self.db.flush()
+        self._bump(item.cart_id, -Decimal(str(item.line_total)), -item.quantity)
 
     def clear_items(self, cart_id: int) -> None:
         self.db.query(CartItem).filter(CartItem.cart_id == cart_id).delete()
-        self.db.commit()
+        self.db.query(Cart).filter(Cart.id == cart_id).update(
+            {
+                Cart.total_amount: 0,
+                Cart.item_count: 0,
+                Cart.version: Cart.version + 1,
+                Cart.updated_at: datetime.utcnow(),
+            },
+            synchronize_session="evaluate",
+        )
+        self.db.flush()
+
+    def _bump(self, cart_id: int, amount: Decimal, count: int) -> None:
+        # relative UPDATE: concurrent changes to the same cart can't lose a delta
+        self.db.query(Cart).filter(Cart.id == cart_id).update(
+            {
+                Cart.total_amount: Cart.total_amount + amount,
+                Cart.item_count: Cart.item_count + count,
+                Cart.version: Cart.version + 1,
+                Cart.updated_at: datetime.utcnow(),
+            },
+            synchronize_session="evaluate",
+        )
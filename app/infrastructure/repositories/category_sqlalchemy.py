@@ -0,0 +1,48 @@
+# app/infrastructure/repositories/category_sqlalchemy.py
+from typing import Dict, Optional, List
+from sqlalchemy.orm import Session
+
+from app.domain.entities.category import Category
+from app.domain.repositories.category_repository import ICategoryRepository
+
+
+class SQLAlchemyCategoryRepository(ICategoryRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, category_id: int) -> Optional[Category]:
+        return self.db.query(Category).filter(Category.id == category_id).first()
+
+    def get_by_slug(self, slug: str) -> Optional[Category]:
+        return self.db.query(Category).filter(Category.slug == slug).first()
+
+    def get_id_by_slug(self, slug: str) -> Optional[int]:
+        row = (
+            self.db.query(Category.id)
+            .filter(Category.slug == slug, Category.is_active.is_(True))
+            .first()
+        )
+        return row[0] if row else None
+
+    def slug_map(self) -> Dict[str, int]:
+        """
+        slug -> id of every active category (see CategorySlugMap).
+        """
+        rows = self.db.query(Category.slug, Category.id).filter(Category.is_active.is_(True)).all()
+        return {slug: category_id for slug, category_id in rows}
+
+    def list_categories(self, is_active: Optional[bool] = True) -> List[Category]:
+        q = self.db.query(Category)
+        if is_active is not None:
+            q = q.filter(Category.is_active == is_active)
+        return q.order_by(Category.title).all()
+
+    def create(self, category: Category) -> Category:
+        self.db.add(category)
+        self.db.flush()
+        return category
+
+    def update(self, category: Category) -> Category:
+        self.db.add(category)
+        self.db.flush()
+        return category
@@ -0,0 +1,64 @@
+# app/infrastructure/repositories/inventory_sqlalchemy.py
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.domain.entities.inventory_ledger import InventoryLedgerEntry
+from app.domain.entities.product import Product
+from app.domain.repositories.inventory_repository import IInventoryRepository
+
+
+class SQLAlchemyInventoryRepository(IInventoryRepository):
+    """
+    No SELECT ... FOR UPDATE: the stock check and the decrement are one
+    statement, so concurrent buyers of a SKU only queue on the row lock
+    of that UPDATE, never on a read-then-write round trip.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def reserve(self, product_id: int, quantity: int) -> bool:
+        result = self.db.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.stock >= quantity)
+            .values(stock=Product.stock - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def release(self, product_id: int, quantity: int) -> None:
+        self.db.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.stock.isnot(None))
+            .values(stock=Product.stock + quantity)
+            .execution_options(synchronize_session=False)
+        )
+
+    def append(self, entries: List[InventoryLedgerEntry]) -> None:
+        if not entries:
+            return
+        now = datetime.utcnow()
+        self.db.execute(
+            insert(InventoryLedgerEntry).values([
+                {
+                    "product_id": e.product_id,
+                    "order_id": e.order_id,
+                    "delta": e.delta,
+                    "reason": e.reason,
+                    "created_at": e.created_at or now,
+                }
+                for e in entries
+            ])
+        )
+
+    def reserved_for_order(self, order_id: int) -> Dict[int, int]:
+        rows = (
+            self.db.query(InventoryLedgerEntry.product_id, func.sum(InventoryLedgerEntry.delta))
+            .filter(InventoryLedgerEntry.order_id == order_id)
+            .group_by(InventoryLedgerEntry.product_id)
+            .all()
+        )
+        # reservations are negative deltas
+        return {product_id: -int(net) for product_id, net in rows if net and net < 0}
@@ -1,7 +1,10 @@
 # app/infrastructure/repositories/order_sqlalchemy.py
+from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, build_page, decode_cursor
 from app.domain.entities.order import Order
 from app.domain.entities.order_item import OrderItem
 from app.domain.repositories.order_repository import IOrderRepository
@@ -14,42 +17,108 @@ class SQLAlchemyOrderRepository(IOrderRepository):
     def get_by_id(self, order_id: int) -> Optional[Order]:
         return self.db.query(Order).filter(Order.id == order_id).first()
 
-    def get_by_order_number(self, order_number: str) -> Optional[Order]:
-        return self.db.query(Order).filter(Order.order_number == order_number).first()
-
-    def list_by_user(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Order]:
+    def get_for_update(self, order_id: int) -> Optional[Order]:
+        # populate_existing: refresh an instance this session already holds
         return (
             self.db.query(Order)
-            .filter(Order.user_id == user_id)
-            .order_by(Order.id.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+            .filter(Order.id == order_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
         )
 
+    def get_by_order_number(self, order_number: str) -> Optional[Order]:
+        return self.db.query(Order).filter(Order.order_number == order_number).first()
+
+    def list_by_user(self, user_id: int, limit: int = 50, cursor: Optional[str] = None) -> Page[Order]:
+        # served by ix_orders_user_id: InnoDB secondary indexes carry the PK,
+        # so (user_id, id) is already an index range
+        q = self.db.query(Order).filter(Order.user_id == user_id)
+        after = decode_cursor(cursor, 1)
+        if after:
+            q = q.filter(Order.id < after[0])
+        rows = q.order_by(Order.id.desc()).limit(limit + 1).all()
+        return build_page(rows, limit, lambda o: (o.id,))
+
     def create_order(self, order: Order, items: List[OrderItem]) -> Order:
         """
-        Persist order and its items in one transaction.
+        Persist order and its items in one transaction; the items go in
+        with a single multi-row INSERT.
         """
         self.db.add(order)
         self.db.flush()  # so order.id is available
 
-        for it in items:
-            it.order_id = order.id
-            self.db.add(it)
-
-        self.db.commit()
-        self.db.refresh(order)
+        if items:
+            columns = [c.key for c in OrderItem.__table__.columns if c.key != "id"]
+            for it in items:
+                it.order_id = order.id
+            self.db.execute(
+                insert(OrderItem).values([{c: getattr(it, c) for c in columns} for it in items])
+            )
         return order
 
     def add_item(self, order_item: OrderItem) -> OrderItem:
         self.db.add(order_item)
-        self.db.commit()
-        self.db.refresh(order_item)
+        self.db.flush()
         return order_item
 
     def update(self, order: Order) -> Order:
         self.db.add(order)
-        self.db.commit()
-        self.db.refresh(order)
+        self.db.flush()
         return order
+
+    def get_items(self, order_id: int) -> List[OrderItem]:
+        return (
+            self.db.query(OrderItem)
+            .filter(OrderItem.order_id == order_id)
+            .order_by(OrderItem.id)
+            .all()
+        )
+
+    def mark_paid(self, order_id: int) -> bool:
+        # conditional UPDATE: of two concurrent callbacks only one matches,
+        # and an order cancelled or expired meanwhile (stock released,
+        # rollup reversed) is never marked paid
+        updated = (
+            self.db.query(Order)
+            .filter(Order.id == order_id, Order.status == "PENDING", Order.payment_status != "PAID")
+            .update(
+                {
+                    Order.payment_status: "PAID",
+                    Order.status: "PAID",
+                    Order.updated_at: datetime.utcnow(),
+                },
+                synchronize_session="fetch",
+            )
+        )
+        return updated == 1
+
+    def cancel(self, order_id: int, status: str = "CANCELLED") -> bool:
+        updated = (
+            self.db.query(Order)
+            .filter(
+                Order.id == order_id,
+                Order.status == "PENDING",
+                Order.payment_status != "PAID",
+            )
+            .update(
+                {Order.status: status, Order.updated_at: datetime.utcnow()},
+                synchronize_session="fetch",
+            )
+        )
+        return updated == 1
+
+    def list_expired_ids(self, created_before: datetime, limit: int = 100) -> List[int]:
+        # ix_orders_status_created_at
+        rows = (
+            self.db.query(Order.id)
+            .filter(
+                Order.status == "PENDING",
+                Order.created_at < created_before,
+                Order.payment_status != "PAID",
+            )
+            .order_by(Order.created_at)
+            .limit(limit)
+            .all()
+        )
+        return [order_id for (order_id,) in rows]
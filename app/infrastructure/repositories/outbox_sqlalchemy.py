@@ -0,0 +1,97 @@
+# app/infrastructure/repositories/outbox_sqlalchemy.py
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import case, delete, func, insert, update
+from sqlalchemy.orm import Session
+
+from app.domain.entities.outbox_event import OutboxEvent
+from app.domain.repositories.outbox_repository import IOutboxRepository
+
+# dialects with SELECT ... FOR UPDATE SKIP LOCKED (MariaDB >= 10.6)
+_SKIP_LOCKED_DIALECTS = ("mysql", "mariadb", "postgresql")
+
+
+class SQLAlchemyOutboxRepository(IOutboxRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, event_type: str, aggregate_id: Optional[int], payload: dict) -> None:
+        now = datetime.utcnow()
+        self.db.execute(
+            insert(OutboxEvent).values(
+                event_type=event_type,
+                aggregate_id=aggregate_id,
+                payload=json.dumps(payload, separators=(",", ":")),
+                status="PENDING",
+                attempts=0,
+                available_at=now,
+                created_at=now,
+            )
+        )
+
+    def claim(self, limit: int, now: datetime, lease_until: datetime) -> List[OutboxEvent]:
+        # a PROCESSING row's available_at is the end of its lease
+        q = (
+            self.db.query(OutboxEvent)
+            .filter(OutboxEvent.status.in_(("PENDING", "PROCESSING")), OutboxEvent.available_at <= now)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+        )
+        if self.db.get_bind().dialect.name in _SKIP_LOCKED_DIALECTS:
+            q = q.with_for_update(skip_locked=True)
+        # SQLite has no row locks (and one writer at a time): concurrent
+        # dispatchers may both deliver an event, which at-least-once allows
+        rows = q.all()
+        if rows:
+            self.db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([r.id for r in rows]))
+                .values(status="PROCESSING", claimed_at=now, available_at=lease_until)
+                .execution_options(synchronize_session=False)
+            )
+        return rows
+
+    def delete(self, event_ids: List[int], claimed_at: datetime) -> None:
+        if event_ids:
+            self.db.execute(
+                delete(OutboxEvent).where(
+                    OutboxEvent.id.in_(event_ids),
+                    OutboxEvent.status == "PROCESSING",
+                    OutboxEvent.claimed_at == claimed_at,
+                )
+            )
+
+    def reschedule(
+        self, event_id: int, claimed_at: datetime, available_at: datetime, error: str, dead: bool = False
+    ) -> None:
+        self.db.execute(
+            update(OutboxEvent)
+            .where(
+                OutboxEvent.id == event_id,
+                OutboxEvent.status == "PROCESSING",
+                OutboxEvent.claimed_at == claimed_at,
+            )
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                available_at=available_at,
+                last_error=error[:2000],
+                status="DEAD" if dead else "PENDING",
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def backlog(self, now: datetime) -> dict:
+        pending, processing, dead, oldest = self.db.query(
+            func.sum(case((OutboxEvent.status == "PENDING", 1), else_=0)),
+            func.sum(case((OutboxEvent.status == "PROCESSING", 1), else_=0)),
+            func.sum(case((OutboxEvent.status == "DEAD", 1), else_=0)),
+            func.min(case((OutboxEvent.status.in_(("PENDING", "PROCESSING")), OutboxEvent.created_at))),
+        ).one()
+        return {
+            "pending": int(pending or 0),
+            "processing": int(processing or 0),
+            "dead": int(dead or 0),
+            "oldest_pending_age_seconds": (now - oldest).total_seconds() if oldest else None,
+        }
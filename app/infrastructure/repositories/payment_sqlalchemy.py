@@ -1,5 +1,6 @@
 # app/infrastructure/repositories/payment_sqlalchemy.py
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Sequence
 from sqlalchemy.orm import Session
 
 from app.domain.entities.payment import Payment
@@ -13,6 +14,9 @@ class SQLAlchemyPaymentRepository(IPaymentRepository):
     def get_by_id(self, payment_id: int) -> Optional[Payment]:
         return self.db.query(Payment).filter(Payment.id == payment_id).first()
 
+    def get_by_gateway_ref(self, gateway_ref: str) -> Optional[Payment]:
+        return self.db.query(Payment).filter(Payment.gateway_ref == gateway_ref).first()
+
     def list_by_order(self, order_id: int) -> List[Payment]:
         return (
             self.db.query(Payment)
@@ -23,12 +27,32 @@ class SQLAlchemyPaymentRepository(IPaymentRepository):
 
     def create(self, payment: Payment) -> Payment:
         self.db.add(payment)
-        self.db.commit()
-        self.db.refresh(payment)
+        self.db.flush()
         return payment
 
     def update(self, payment: Payment) -> Payment:
         self.db.add(payment)
-        self.db.commit()
-        self.db.refresh(payment)
+        self.db.flush()
         return payment
+
+    def transition(self, payment_id: int, from_statuses: Sequence[str], to_status: str, **values) -> bool:
+        # conditional UPDATE: of two concurrent callbacks/workers only one matches
+        updated = (
+            self.db.query(Payment)
+            .filter(Payment.id == payment_id, Payment.status.in_(from_statuses))
+            .update(
+                {**{getattr(Payment, k): v for k, v in values.items()}, Payment.status: to_status},
+                synchronize_session="fetch",
+            )
+        )
+        return updated == 1
+
+    def list_ids_by_status(self, statuses: Sequence[str], created_before: datetime, limit: int = 100) -> List[int]:
+        rows = (
+            self.db.query(Payment.id)
+            .filter(Payment.status.in_(statuses), Payment.created_at < created_before)
+            .order_by(Payment.id)
+            .limit(limit)
+            .all()
+        )
+        return [r[0] for r in rows]
@@ -1,13 +1,17 @@
 # app/infrastructure/repositories/product_sqlalchemy.py
 from datetime import datetime, timedelta
-from typing import Optional, List
+from contextlib import nullcontext
+from typing import Dict, Iterable, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func, select
 
+from app.core.pagination import Page, build_page, decode_cursor
 from app.domain.entities.product import Product
-from app.domain.entities.order_item import OrderItem
-from app.domain.entities.order import Order
+from app.domain.entities.product_sales_daily import ProductSalesDaily
 from app.domain.repositories.product_repository import IProductRepository
+from app.infrastructure.db.keyset import seek_after
+from app.infrastructure.db.session import primary_reads
+from app.infrastructure.search.fulltext import get_search_backend, search_on_primary
 
 
 class SQLAlchemyProductRepository(IProductRepository):
@@ -17,17 +21,26 @@ class SQLAlchemyProductRepository(IProductRepository):
     def get_by_id(self, product_id: int) -> Optional[Product]:
         return self.db.query(Product).filter(Product.id == product_id).first()
 
+    def get_for_update(self, product_id: int) -> Optional[Product]:
+        return self.db.query(Product).filter(Product.id == product_id).with_for_update().first()
+
     def get_by_slug(self, slug: str) -> Optional[Product]:
         return self.db.query(Product).filter(Product.slug == slug).first()
 
+    def get_many_by_ids(self, product_ids: Iterable[int]) -> Dict[int, Product]:
+        ids = set(product_ids)
+        if not ids:
+            return {}
+        return {p.id: p for p in self.db.query(Product).filter(Product.id.in_(ids)).all()}
+
     def list_products(
         self,
         category_id: Optional[int] = None,
         search: Optional[str] = None,
         is_active: Optional[bool] = True,
         limit: int = 50,
-        offset: int = 0,
-    ) -> List[Product]:
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
         q = self.db.query(Product)
 
         if is_active is not None:
@@ -36,50 +49,65 @@ class SQLAlchemyProductRepository(IProductRepository):
         if category_id is not None:
             q = q.filter(Product.category_id == category_id)
 
+        rank = None
         if search:
-            like = f"%{search}%"
-            q = q.filter(
-                or_(
-                    Product.title.ilike(like),
-                    Product.slug.ilike(like),
-                    Product.platform.ilike(like),
-                )
+            # full-text match, ordered by relevance
+            backend = get_search_backend(self.db.get_bind().dialect.name)
+            q, rank, rank_desc = backend.search(q, search)
+
+        if rank is None:
+            after = decode_cursor(cursor, 1)
+            if after:
+                q = q.filter(Product.id < after[0])
+            rows = q.order_by(Product.id.desc()).limit(limit + 1).all()
+            return build_page(rows, limit, lambda p: (p.id,))
+
+        # (rank, id) keyset; the rank of the last row goes into the cursor
+        after = decode_cursor(cursor, 2)
+        if after:
+            q = q.filter(seek_after(rank, after[0], Product.id, after[1], descending=rank_desc))
+        with primary_reads(self.db) if search_on_primary() else nullcontext():
+            rows = (
+                q.add_columns(rank)
+                .order_by(rank.desc() if rank_desc else rank.asc(), Product.id.desc())
+                .limit(limit + 1)
+                .all()
             )
-
-        return (
-            q.order_by(Product.id.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        page = build_page(rows, limit, lambda row: (row[1], row[0].id))
+        page.items = [row[0] for row in page.items]
+        return page
 
     def create(self, product: Product) -> Product:
         self.db.add(product)
-        self.db.commit()
-        self.db.refresh(product)
+        self.db.flush()
         return product
 
     def update(self, product: Product) -> Product:
         self.db.add(product)
-        self.db.commit()
-        self.db.refresh(product)
+        self.db.flush()
         return product
 
     def get_top_selling_products_for_last_days(
         self, days: int, limit: int = 8
     ) -> List[Product]:
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        total_sold = func.sum(OrderItem.quantity).label("total_sold")
+        # reads the product_sales_daily rollup: ~days x products-sold rows
+        # instead of every order item of the period
+        since = (datetime.utcnow() - timedelta(days=days)).date()
+
+        total_sold = func.sum(ProductSalesDaily.units_sold).label("total_sold")
+        top = (
+            select(ProductSalesDaily.product_id, total_sold)
+            .where(ProductSalesDaily.day >= since)
+            .group_by(ProductSalesDaily.product_id)
+            .order_by(total_sold.desc(), ProductSalesDaily.product_id.desc())
+            .limit(limit)
+            .subquery("top_sold")
+        )
 
         query = (
             self.db.query(Product)
-            .join(OrderItem, OrderItem.product_id == Product.id)
-            .join(Order, Order.id == OrderItem.order_id)
-            .filter(Order.created_at >= cutoff_date)
-            .group_by(Product.id)
-            .order_by(total_sold.desc())
-            .limit(limit)
+            .join(top, top.c.product_id == Product.id)
+            .order_by(top.c.total_sold.desc(), Product.id.desc())
         )
 
         return query.all()
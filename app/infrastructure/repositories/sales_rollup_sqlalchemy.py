@@ -0,0 +1,146 @@
+# app/infrastructure/repositories/sales_rollup_sqlalchemy.py
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, delete, func, insert, literal, select, DateTime
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.domain.entities.order import Order
+from app.domain.entities.order_item import OrderItem
+from app.domain.entities.product_sales_daily import ProductSalesDaily
+from app.domain.repositories.sales_rollup_repository import ISalesRollupRepository
+
+_COUNTERS = ("orders_count", "units_sold", "revenue", "paid_units", "paid_revenue")
+
+
+class SQLAlchemySalesRollupRepository(ISalesRollupRepository):
+    """
+    Counters are bumped with a single multi-row upsert
+    (ON DUPLICATE KEY UPDATE / ON CONFLICT DO UPDATE) adding deltas to the
+    stored values, so concurrent orders for the same product/day never
+    lose updates and no row is read first.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_order(self, order: Order, items: List[OrderItem]) -> None:
+        rows = self._rows(order, items, paid=False)
+        for row in rows:
+            row["orders_count"] = 1
+        self._add(rows)
+
+    def record_payment(self, order: Order, items: List[OrderItem]) -> None:
+        self._add(self._rows(order, items, paid=True))
+
+    def record_cancellation(self, order: Order, items: List[OrderItem]) -> None:
+        rows = self._rows(order, items, paid=False)
+        for row in rows:
+            row["orders_count"] = -1
+            row["units_sold"] = -row["units_sold"]
+            row["revenue"] = -row["revenue"]
+        self._add(rows)
+
+    def rebuild(self, since: Optional[date] = None) -> int:
+        """
+        Delete and recompute the affected days with one INSERT ... SELECT.
+        Orders created while this runs may be counted twice or not at all
+        for today; run it off-peak (re-running is always safe).
+        """
+        table = ProductSalesDaily.__table__
+
+        wipe = delete(table)
+        if since is not None:
+            wipe = wipe.where(table.c.day >= since)
+        self.db.execute(wipe)
+
+        day = func.date(Order.created_at)
+        is_paid = Order.payment_status == "PAID"
+        source = (
+            select(
+                day.label("day"),
+                OrderItem.product_id,
+                func.count(func.distinct(Order.id)),
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.line_total),
+                func.sum(case((is_paid, OrderItem.quantity), else_=0)),
+                func.sum(case((is_paid, OrderItem.line_total), else_=0)),
+                literal(datetime.utcnow(), DateTime),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.status.notin_(("CANCELLED", "EXPIRED")))
+            .group_by(day, OrderItem.product_id)
+        )
+        if since is not None:
+            source = source.where(Order.created_at >= datetime.combine(since, datetime.min.time()))
+
+        result = self.db.execute(
+            insert(table).from_select(["day", "product_id", *_COUNTERS, "updated_at"], source)
+        )
+        return result.rowcount
+
+    # ---- helpers ----------
+    @staticmethod
+    def _rows(order: Order, items: List[OrderItem], paid: bool) -> List[dict]:
+        day = (order.created_at or datetime.utcnow()).date()
+        per_product: Dict[int, dict] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        for it in items:
+            row = per_product[it.product_id]
+            qty = int(it.quantity or 0)
+            amount = Decimal(str(it.line_total or 0))
+            if paid:
+                row["paid_units"] += qty
+                row["paid_revenue"] += amount
+            else:
+                row["units_sold"] += qty
+                row["revenue"] += amount
+        now = datetime.utcnow()
+        return [
+            {"day": day, "product_id": product_id, **counters, "updated_at": now}
+            for product_id, counters in per_product.items()
+        ]
+
+    def _add(self, rows: List[dict]) -> None:
+        if not rows:
+            return
+        table = ProductSalesDaily.__table__
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ("mysql", "mariadb"):
+            stmt = mysql_insert(table).values(rows)
+            stmt = stmt.on_duplicate_key_update(
+                {**{c: table.c[c] + stmt.inserted[c] for c in _COUNTERS}, "updated_at": stmt.inserted.updated_at}
+            )
+        elif dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite_insert if dialect == "sqlite" else pg_insert
+            stmt = dialect_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["day", "product_id"],
+                set_={**{c: table.c[c] + stmt.excluded[c] for c in _COUNTERS}, "updated_at": stmt.excluded.updated_at},
+            )
+        else:
+            self._add_portable(rows)
+            return
+
+        self.db.execute(stmt)
+
+    def _add_portable(self, rows: List[dict]) -> None:
+        # no native upsert: locked read, then update or insert
+        for row in rows:
+            existing = (
+                self.db.query(ProductSalesDaily)
+                .filter(ProductSalesDaily.day == row["day"], ProductSalesDaily.product_id == row["product_id"])
+                .with_for_update()
+                .first()
+            )
+            if existing is None:
+                self.db.add(ProductSalesDaily(**row))
+            else:
+                for c in _COUNTERS:
+                    setattr(existing, c, getattr(existing, c) + row[c])
+        self.db.flush()
@@ -1,7 +1,8 @@
 # app/infrastructure/repositories/user_sqlalchemy.py
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, build_page, decode_cursor
 from app.domain.entities.user import User
 from app.domain.repositories.user_repository import IUserRepository
 
@@ -21,29 +22,54 @@ class SQLAlchemyUserRepository(IUserRepository):
     def get_by_email(self, email: str) -> Optional[User]:
         return self.db.query(User).filter(User.email == email).first()
 
-    def list_users(self, limit: int = 50, offset: int = 0) -> List[User]:
-        return (
-            self.db.query(User)
-            .order_by(User.id.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+    def list_users(self, limit: int = 50, cursor: Optional[str] = None) -> Page[User]:
+        q = self.db.query(User)
+        after = decode_cursor(cursor, 1)
+        if after:
+            q = q.filter(User.id < after[0])
+        rows = q.order_by(User.id.desc()).limit(limit + 1).all()
+        return build_page(rows, limit, lambda u: (u.id,))
 
     def create(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
 
     def update(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
 
     def get_roles(self, user_id: int) -> List[Role]:
         return (self.db.query(Role)
             .join(UserRole, UserRole.role_id == Role.id)
             .filter(UserRole.user_id == user_id)
-            .all())
\ No newline at end of file
+            .all())
+
+    def get_roles_for_users(self, user_ids: Iterable[int]) -> Dict[int, List[Role]]:
+        out: Dict[int, List[Role]] = {uid: [] for uid in user_ids}
+        if not out:
+            return out
+        rows = (self.db.query(UserRole.user_id, Role)
+            .join(Role, UserRole.role_id == Role.id)
+            .filter(UserRole.user_id.in_(list(out)))
+            .all())
+        for user_id, role in rows:
+            out[user_id].append(role)
+        return out
+
+    def get_role_by_name(self, name: str) -> Optional[Role]:
+        return self.db.query(Role).filter(Role.name == name).first()
+
+    def add_role(self, user_id: int, role_id: int) -> bool:
+        if self.db.get(UserRole, (user_id, role_id)) is not None:
+            return False
+        self.db.add(UserRole(user_id=user_id, role_id=role_id))
+        self.db.flush()
+        return True
+
+    def remove_role(self, user_id: int, role_id: int) -> bool:
+        deleted = (self.db.query(UserRole)
+            .filter(UserRole.user_id == user_id, UserRole.role_id == role_id)
+            .delete(synchronize_session=False))
+        return deleted > 0
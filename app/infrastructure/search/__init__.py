@@ -0,0 +1 @@
+# app/infrastructure/search/__init__.py
@@ -0,0 +1,176 @@
+# app/infrastructure/search/fulltext.py
+"""
+Full-text product search backends used by SQLAlchemyProductRepository.
+
+- MariaDB/MySQL: FULLTEXT index ft_products_search(title, slug, platform)
+  queried with MATCH ... AGAINST in boolean mode, ranked by relevance.
+- SQLite (local/test runs): FTS5 external-content table products_fts kept
+  in sync by triggers, ranked by bm25(). Created on the primary and on
+  every read replica; if a replica can't have it, searches are pinned to
+  the primary (search_on_primary()).
+- anything else: the old ILIKE scan.
+
+Every search term becomes a required prefix match, so "net fli" finds
+"Netflix Premium" on both backends.
+
+Backends only filter; search() returns (query, rank, rank_desc) and the
+repository orders/pages on (rank, id). rank is None for the LIKE
+fallback, which has no relevance and is ordered by id alone.
+"""
+import logging
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Float, Integer, or_, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.domain.entities.product import Product
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        title, slug, platform,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, title, slug, platform)
+        VALUES (new.id, new.title, new.slug, new.platform);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, title, slug, platform)
+        VALUES ('delete', old.id, old.title, old.slug, old.platform);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF title, slug, platform ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, title, slug, platform)
+        VALUES ('delete', old.id, old.title, old.slug, old.platform);
+        INSERT INTO products_fts(rowid, title, slug, platform)
+        VALUES (new.id, new.title, new.slug, new.platform);
+    END
+    """,
+]
+
+# set by install_fulltext(); SQLite builds without FTS5 fall back to LIKE
+_sqlite_fts_ready = False
+# set by install_fulltext() when a replica has no products_fts
+_search_on_primary = False
+
+SearchResult = Tuple[Query, Optional[ColumnElement], bool]
+
+
+def tokenize(term: str) -> List[str]:
+    return _TOKEN_RE.findall(term.lower())
+
+
+class LikeSearch:
+    """
+    Fallback: leading-wildcard ILIKE (full scan). Kept for dialects
+    without a full-text backend.
+    """
+
+    def search(self, q: Query, term: str) -> SearchResult:
+        like = f"%{term}%"
+        q = q.filter(
+            or_(
+                Product.title.ilike(like),
+                Product.slug.ilike(like),
+                Product.platform.ilike(like),
+            )
+        )
+        return q, None, True
+
+
+class MariaDBFullTextSearch:
+    def search(self, q: Query, term: str) -> SearchResult:
+        tokens = tokenize(term)
+        if not tokens:
+            return q.filter(text("1 = 0")), None, True
+        against = " ".join(f"+{t}*" for t in tokens)
+        score = mysql.match(
+            Product.title, Product.slug, Product.platform, against=against
+        ).in_boolean_mode()
+        return q.filter(score), score, True
+
+
+class SQLiteFTS5Search:
+    def search(self, q: Query, term: str) -> SearchResult:
+        tokens = tokenize(term)
+        if not tokens:
+            return q.filter(text("1 = 0")), None, True
+        fts_query = " ".join('"' + t.replace('"', '""') + '"*' for t in tokens)
+        hits = (
+            text(
+                "SELECT rowid AS id, bm25(products_fts) AS rank "
+                "FROM products_fts WHERE products_fts MATCH :fts_query"
+            )
+            .bindparams(fts_query=fts_query)
+            .columns(id=Integer, rank=Float)
+            .subquery("fts_hits")
+        )
+        # bm25(): lower is better
+        return q.join(hits, hits.c.id == Product.id), hits.c.rank, False
+
+
+def get_search_backend(dialect_name: str):
+    if dialect_name in ("mysql", "mariadb"):
+        return MariaDBFullTextSearch()
+    if dialect_name == "sqlite" and _sqlite_fts_ready:
+        return SQLiteFTS5Search()
+    return LikeSearch()
+
+
+def search_on_primary() -> bool:
+    """
+    True if full-text searches must not run on a read replica.
+    """
+    return _search_on_primary
+
+
+def _install_sqlite_fts(engine: Engine) -> bool:
+    try:
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+            ).first()
+            for ddl in _SQLITE_FTS_DDL:
+                conn.execute(text(ddl))
+            if not existed:
+                conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+        return True
+    except OperationalError:
+        logger.warning("SQLite FTS5 not available on %s", engine.url, exc_info=True)
+        return False
+
+
+def install_fulltext(engine: Engine, replicas: Sequence[Engine] = ()) -> None:
+    """
+    Create the SQLite FTS5 table/triggers (idempotent) and backfill it, on
+    the primary and on each read replica (search reads go to replicas).
+    On MariaDB the FULLTEXT index comes from the Product model / migrations
+    and reaches replicas through replication.
+    """
+    global _sqlite_fts_ready, _search_on_primary
+    if engine.dialect.name != "sqlite":
+        return
+    _sqlite_fts_ready = _install_sqlite_fts(engine)
+    if not _sqlite_fts_ready:
+        logger.warning("product search falls back to LIKE")
+        return
+    missing = [r.url for r in replicas if not _install_sqlite_fts(r)]
+    _search_on_primary = bool(missing)
+    if missing:
+        logger.warning("no products_fts on replicas %s, product search reads the primary", missing)
@@ -0,0 +1,115 @@
+# app/infrastructure/search/persian.py
+"""
+Text normalization for Persian/Latin product search.
+
+normalize() folds the variants people actually type into one form:
+Arabic ye/kaf -> Persian, hamza/madda alefs -> ا, ZWNJ and other
+zero-width characters dropped, harakat and tatweel removed,
+Persian/Arabic digits -> ASCII, lowercase, single spaces.
+
+aliases() returns the other-script spellings of brand names found in a
+text, so "نتفلیکس" finds Netflix products and "netflix" finds products
+titled in Persian.
+"""
+import re
+from typing import Dict, List, Set
+
+_CHAR_MAP = str.maketrans({
+    "ي": "ی",   # Arabic yeh
+    "ى": "ی",   # alef maksura
+    "ئ": "ی",
+    "ك": "ک",   # Arabic kaf
+    "ة": "ه",
+    "ۀ": "ه",
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ؤ": "و",
+    "\u200c": None,  # ZWNJ
+    "\u200d": None,  # ZWJ
+    "\u200b": None,  # zero width space
+    "\ufeff": None,  # BOM
+    "\u0640": None,  # tatweel
+    **{chr(0x06F0 + i): str(i) for i in range(10)},  # Persian digits
+    **{chr(0x0660 + i): str(i) for i in range(10)},  # Arabic-Indic digits
+})
+
+# harakat, tanwin, superscript alef
+_DIACRITICS_RE = re.compile("[\u064b-\u065f\u0670]")
+_SPACES_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# latin brand -> common Persian spellings (already normalized form)
+_BRANDS: Dict[str, List[str]] = {
+    "netflix": ["نتفلیکس", "نت فلیکس"],
+    "spotify": ["اسپاتیفای", "اسپوتیفای"],
+    "youtube": ["یوتیوب", "یوتوب"],
+    "apple": ["اپل"],
+    "itunes": ["ایتونز", "ای تونز"],
+    "icloud": ["ایکلود", "ای کلود"],
+    "music": ["موزیک"],
+    "premium": ["پریمیوم", "پرمیوم"],
+    "google": ["گوگل"],
+    "play": ["پلی"],
+    "playstation": ["پلی استیشن", "پلیاستیشن"],
+    "psn": ["پی اس ان"],
+    "xbox": ["ایکس باکس", "ایکسباکس"],
+    "steam": ["استیم"],
+    "chatgpt": ["چت جی پی تی", "چتجیپیتی"],
+    "openai": ["اوپن ای ای"],
+    "telegram": ["تلگرام"],
+    "instagram": ["اینستاگرام"],
+    "discord": ["دیسکورد"],
+    "amazon": ["امازون"],
+    "prime": ["پرایم"],
+    "disney": ["دیزنی"],
+    "hbo": ["اچ بی او"],
+    "pubg": ["پابجی"],
+    "canva": ["کانوا"],
+    "adobe": ["ادوبی"],
+    "gift": ["گیفت"],
+    "card": ["کارت"],
+}
+
+
+def normalize(text: str | None) -> str:
+    if not text:
+        return ""
+    text = text.translate(_CHAR_MAP)
+    text = _DIACRITICS_RE.sub("", text)
+    return _SPACES_RE.sub(" ", text.lower()).strip()
+
+
+def tokens(text: str | None) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _build_alias_index():
+    by_latin: Dict[str, List[str]] = {}
+    by_persian: Dict[str, str] = {}
+    for latin, persian_forms in _BRANDS.items():
+        forms = [normalize(p) for p in persian_forms]
+        by_latin[latin] = forms
+        for form in forms:
+            by_persian[form] = latin
+    return by_latin, by_persian
+
+
+_BY_LATIN, _BY_PERSIAN = _build_alias_index()
+
+
+def aliases(normalized_text: str) -> Set[str]:
+    """
+    Other-script spellings of the brand names contained in an
+    already normalized text.
+    """
+    out: Set[str] = set()
+    words = set(_TOKEN_RE.findall(normalized_text))
+    for word in words:
+        for persian in _BY_LATIN.get(word, ()):
+            out.add(persian)
+    for persian, latin in _BY_PERSIAN.items():
+        if persian in normalized_text:
+            out.add(latin)
+    return out
@@ -0,0 +1,252 @@
+# app/infrastructure/search/suggest_index.py
+"""
+In-memory autocomplete index over active products (GET /products/suggest).
+
+Each product contributes the normalized words of its title, slug and
+platform plus the other-script spellings of any brand it mentions
+(see persian.py). Words are indexed by prefix (up to MAX_PREFIX chars)
+and by trigram, so a lookup is a handful of dict/set operations:
+
+- every query token must match some word of the product, by prefix
+  first and, failing that, anywhere inside a word (trigram candidates
+  verified with a substring check)
+- prefix matches rank above infix ones, then shorter titles first
+
+The index is built at startup and updated incrementally:
+- in the writing process, from ORM flush events once the session commits
+- in other workers/nodes, from the product:{id} tags published on the
+  cache invalidation channel (see TwoTierCache)
+"""
+import heapq
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session, sessionmaker
+
+from app.core.metrics import register_collector
+from app.domain.entities.product import Product
+from app.infrastructure.search.persian import aliases, normalize, tokens
+
+logger = logging.getLogger(__name__)
+
+MAX_PREFIX = 12
+
+
+def _trigrams(word: str) -> Set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def _product_doc(p: Product) -> dict:
+    return {
+        "id": p.id,
+        "title": p.title,
+        "slug": p.slug,
+        "platform": p.platform,
+        "price": float(p.price) if p.price is not None else None,
+        "image_url": p.image_url,
+    }
+
+
+def _product_words(p: Product) -> Set[str]:
+    text = normalize(" ".join(filter(None, [p.title, (p.slug or "").replace("-", " "), p.platform])))
+    words = set(tokens(text))
+    for alias in aliases(text):
+        words.update(tokens(alias))
+        words.add(alias.replace(" ", ""))
+    return words
+
+
+class ProductSuggestIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.ready = False
+
+    def _reset(self):
+        self._docs: Dict[int, dict] = {}
+        self._words: Dict[int, Set[str]] = {}
+        self._prefix: Dict[str, Set[int]] = defaultdict(set)
+        self._trigram: Dict[str, Set[int]] = defaultdict(set)
+
+    # ---- writes ----------
+    def rebuild(self, session_factory: sessionmaker) -> None:
+        fresh = ProductSuggestIndex()
+        session = session_factory()
+        try:
+            q = session.query(Product).filter(Product.is_active.is_(True)).yield_per(1000)
+            for p in q:
+                fresh._add(p.id, _product_doc(p), _product_words(p))
+        finally:
+            session.close()
+        with self._lock:
+            self._docs, self._words = fresh._docs, fresh._words
+            self._prefix, self._trigram = fresh._prefix, fresh._trigram
+            self.ready = True
+
+    def upsert(self, product: Product) -> None:
+        with self._lock:
+            self._remove(product.id)
+            if product.is_active:
+                self._add(product.id, _product_doc(product), _product_words(product))
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            self._remove(product_id)
+
+    def refresh(self, product_ids: Iterable[int], session_factory: sessionmaker) -> None:
+        """
+        Reload the given products from the database (used when another
+        worker changed them).
+        """
+        ids = set(product_ids)
+        if not ids:
+            return
+        session = session_factory()
+        try:
+            found = session.query(Product).filter(Product.id.in_(ids)).all()
+        finally:
+            session.close()
+        for p in found:
+            self.upsert(p)
+        for missing in ids - {p.id for p in found}:
+            self.remove(missing)
+
+    def _add(self, product_id: int, doc: dict, words: Set[str]) -> None:
+        self._docs[product_id] = doc
+        self._words[product_id] = words
+        for word in words:
+            for k in range(1, min(len(word), MAX_PREFIX) + 1):
+                self._prefix[word[:k]].add(product_id)
+            for tri in _trigrams(word):
+                self._trigram[tri].add(product_id)
+
+    def _remove(self, product_id: int) -> None:
+        words = self._words.pop(product_id, None)
+        self._docs.pop(product_id, None)
+        if not words:
+            return
+        for word in words:
+            for k in range(1, min(len(word), MAX_PREFIX) + 1):
+                self._discard(self._prefix, word[:k], product_id)
+            for tri in _trigrams(word):
+                self._discard(self._trigram, tri, product_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[int]], key: str, product_id: int) -> None:
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(product_id)
+            if not ids:
+                del postings[key]
+
+    # ---- reads ----------
+    def _match_prefix(self, token: str) -> Set[int]:
+        ids = self._prefix.get(token[:MAX_PREFIX], set())
+        if len(token) <= MAX_PREFIX:
+            return ids
+        return {i for i in ids if any(w.startswith(token) for w in self._words[i])}
+
+    def _match_infix(self, token: str) -> Set[int]:
+        grams = _trigrams(token)
+        if not grams:
+            return set()
+        postings = sorted((self._trigram.get(g, set()) for g in grams), key=len)
+        ids = set.intersection(*postings) if postings else set()
+        return {i for i in ids if any(token in w for w in self._words[i])}
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        q_tokens = tokens(query)
+        if not q_tokens:
+            return []
+        with self._lock:
+            candidates: Optional[Set[int]] = None
+            score: Dict[int, int] = defaultdict(int)
+            for token in q_tokens:
+                ids = self._match_prefix(token)
+                weight = 2
+                if not ids:
+                    ids, weight = self._match_infix(token), 1
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+                for i in candidates:
+                    score[i] += weight
+            best = heapq.nsmallest(
+                limit,
+                candidates,
+                key=lambda i: (-score[i], len(self._docs[i]["title"] or ""), i),
+            )
+            return [dict(self._docs[i]) for i in best]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "products": len(self._docs),
+                "prefixes": len(self._prefix),
+                "trigrams": len(self._trigram),
+            }
+
+
+# One index per process
+suggest_index = ProductSuggestIndex()
+
+
+# ---- keeping it in sync ----------
+def _track_product_change(mapper, connection, target: Product) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("suggest_changed", {})[target.id] = target
+
+
+def _track_product_delete(mapper, connection, target: Product) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("suggest_changed", {})[target.id] = None
+
+
+def _apply_after_commit(session) -> None:
+    changed = session.info.pop("suggest_changed", None)
+    if not changed:
+        return
+    for product_id, product in changed.items():
+        if product is None:
+            suggest_index.remove(product_id)
+        else:
+            suggest_index.upsert(product)
+
+
+def _drop_after_rollback(session) -> None:
+    session.info.pop("suggest_changed", None)
+
+
+def install_suggest_index(session_factory: sessionmaker, invalidation_source=None) -> None:
+    """
+    Build the index and subscribe it to product changes.
+    `invalidation_source` is a cache exposing add_listener(fn(tags|None)).
+    """
+    event.listen(Product, "after_insert", _track_product_change)
+    event.listen(Product, "after_update", _track_product_change)
+    event.listen(Product, "after_delete", _track_product_delete)
+    event.listen(session_factory, "after_commit", _apply_after_commit)
+    event.listen(session_factory, "after_rollback", _drop_after_rollback)
+
+    if invalidation_source is not None and hasattr(invalidation_source, "add_listener"):
+        def on_invalidate(tags):
+            if tags is None:
+                # we may have missed messages while disconnected
+                suggest_index.rebuild(session_factory)
+                return
+            ids = [int(t.split(":", 1)[1]) for t in tags if t.startswith("product:") and t[8:].isdigit()]
+            suggest_index.refresh(ids, session_factory)
+
+        invalidation_source.add_listener(on_invalidate)
+
+    register_collector("suggest_index", suggest_index.stats)
+    try:
+        suggest_index.rebuild(session_factory)
+    except Exception:
+        logger.exception("could not build the product suggest index")
@@ -0,0 +1 @@
+# app/infrastructure/sms/__init__.py
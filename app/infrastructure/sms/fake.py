@@ -0,0 +1,36 @@
+# app/infrastructure/sms/fake.py
+import logging
+import random
+import threading
+import time
+from typing import List
+
+from app.domain.repositories.sms_provider import ISmsProvider, SmsError, SmsMessage
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSmsProvider(ISmsProvider):
+    """
+    Sends nothing: logs the message and keeps it in `sent` (SMS_PROVIDER=fake,
+    the default in development, and in tests). `latency` and `fail_rate`
+    simulate a slow or flaky provider.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0, concurrency: int = 100):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.concurrency = concurrency
+        self.sent: List[SmsMessage] = []
+        self._lock = threading.Lock()
+
+    def send(self, message: SmsMessage) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        if random.random() < self.fail_rate:
+            raise SmsError("fake provider failure")
+        with self._lock:
+            self.sent.append(message)
+        logger.info("SMS to %s: %s", message.to, message.text or f"[{message.template}] {message.token}")
@@ -0,0 +1,99 @@
+# app/infrastructure/sms/kavenegar.py
+import json
+import logging
+import os
+import time
+
+import requests
+from kavenegar import APIException, KavenegarAPI
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.domain.repositories.sms_provider import ISmsProvider, SmsError, SmsMessage
+
+logger = logging.getLogger(__name__)
+
+# Kavenegar return.status values worth another try later:
+# 418 = no credit left, 429 = rate limited, 5xx = their side
+_RETRYABLE_STATUSES = {418, 429}
+
+
+class _PooledKavenegarAPI(KavenegarAPI):
+    """
+    The SDK posts with the module-level requests.post: no timeout and a
+    new TLS connection per message. Same API, sent through one pooled,
+    keep-alive session with timeouts.
+    """
+
+    def __init__(self, apikey: str, timeout, pool_size: int):
+        super().__init__(apikey)
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._new_session()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._new_session)
+
+    def _new_session(self) -> None:
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size))
+        self.session.headers.update(self.headers)
+
+    def _request(self, action, method, params=None):
+        url = f"https://{self.host}/{self.version}/{self.apikey}/{action}/{method}.json"
+        try:
+            resp = self.session.post(url, data=params or {}, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise SmsError(f"kavenegar {action}/{method}: {e}") from e
+        try:
+            body = resp.json()
+            status, message = body["return"]["status"], body["return"]["message"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise SmsError(f"kavenegar {action}/{method}: HTTP {resp.status_code}, unusable body") from e
+        if status != 200:
+            exc = APIException(f"APIException[{status}] {message}")
+            exc.status = status
+            raise exc
+        return body["entries"]
+
+
+class KavenegarProvider(ISmsProvider):
+    """
+    OTP codes go through verify/lookup (a template approved in the
+    Kavenegar panel, KAVENEGAR_OTP_TEMPLATE); free text through sms/send.
+    """
+
+    name = "kavenegar"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        sender: str | None = None,
+        timeout: float | None = None,
+        concurrency: int | None = None,
+    ):
+        api_key = api_key or settings.KAVENEGAR_API_KEY
+        if not api_key:
+            raise RuntimeError("KAVENEGAR_API_KEY is not set")
+        self.sender = sender if sender is not None else settings.KAVENEGAR_SENDER
+        self.concurrency = concurrency or settings.KAVENEGAR_CONCURRENCY
+        timeout = timeout or settings.SMS_TIMEOUT_SECONDS
+        self.api = _PooledKavenegarAPI(api_key, (min(timeout, 3), timeout), self.concurrency)
+
+    def send(self, message: SmsMessage) -> None:
+        try:
+            if message.template:
+                self.api.verify_lookup({
+                    "receptor": message.to,
+                    "template": message.template,
+                    "token": message.token,
+                    "type": "sms",
+                })
+            else:
+                params = {"receptor": message.to, "message": message.text}
+                if self.sender:
+                    params["sender"] = self.sender
+                self.api.sms_send(params)
+        except APIException as e:
+            status = getattr(e, "status", None)
+            retryable = status in _RETRYABLE_STATUSES or (status or 0) >= 500
+            raise SmsError(str(e), retryable=retryable) from e
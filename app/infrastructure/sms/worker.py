@@ -0,0 +1,213 @@
+# app/infrastructure/sms/worker.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.metrics import Histogram, register_collector
+from app.domain.repositories.sms_provider import ISmsProvider, SmsError, SmsMessage
+from app.infrastructure.redis import process_stats
+from app.infrastructure.redis.sms_queue import SmsQueue, sms_queue
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY_PREFIX = "sms:worker:"
+
+
+class _ProviderStats:
+    def __init__(self):
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.expired = 0
+        self.latency = Histogram()
+
+    def snapshot(self) -> dict:
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+            "expired": self.expired,
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+
+class SmsWorker:
+    """
+    Drains the SMS queue: one loop claims batches from Redis, a pool of
+    `workers` threads sends them. Each provider has its own semaphore of
+    `provider.concurrency`, so a slow provider can't take every thread and
+    a rate-limited one is never sent more than it allows at once.
+
+    Only as many messages are claimed as there are free threads, so
+    nothing sits claimed in local memory while its visibility runs out.
+    Failed sends are retried with exponential backoff up to max_attempts;
+    messages that expired while waiting are dropped.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, ISmsProvider],
+        default_provider: str,
+        queue: SmsQueue = sms_queue,
+        workers: int = 8,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+    ):
+        self.providers = providers
+        self.default_provider = default_provider
+        self.queue = queue
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sms")
+        self._free = threading.Semaphore(workers)
+        self._limits = {name: threading.BoundedSemaphore(p.concurrency) for name, p in providers.items()}
+        self._stats = {name: _ProviderStats() for name in providers}
+        self._lock = threading.Lock()
+
+    def run_forever(self, poll_interval: float = 0.1) -> None:
+        last_published = 0.0
+        while True:
+            try:
+                claimed = self.run_once()
+            except redis.RedisError:
+                logger.warning("sms queue unavailable", exc_info=True)
+                claimed = 0
+                time.sleep(1)
+            if time.monotonic() - last_published > 5:
+                process_stats.publish(STATS_KEY_PREFIX, self.stats(), ttl=30)
+                last_published = time.monotonic()
+            if not claimed:
+                time.sleep(poll_interval)
+
+    def run_once(self) -> int:
+        """
+        Re-queue due retries, claim what the free threads can take and
+        hand it to them; returns how many messages were claimed.
+        """
+        self.queue.promote()
+        free = 0
+        while free < self.batch_size and self._free.acquire(blocking=free == 0, timeout=1 if free == 0 else None):
+            free += 1
+        if not free:
+            return 0
+        try:
+            claimed = self.queue.claim(free)
+        except BaseException:
+            for _ in range(free):
+                self._free.release()
+            raise
+        for _ in range(free - len(claimed)):
+            self._free.release()
+        for raw, message in claimed:
+            self.pool.submit(self._deliver, raw, message)
+        return len(claimed)
+
+    def drain(self, timeout: float = 30.0) -> None:
+        """
+        Send everything queued now and wait for it (tests, `--once`).
+        """
+        deadline = time.monotonic() + timeout
+        while self.run_once() and time.monotonic() < deadline:
+            pass
+        for _ in range(self.workers):
+            self._free.acquire(timeout=max(deadline - time.monotonic(), 0))
+        for _ in range(self.workers):
+            self._free.release()
+
+    def _deliver(self, raw: bytes, message: SmsMessage) -> None:
+        try:
+            self._send(raw, message)
+        except Exception:
+            logger.exception("sms %r: worker error", message)
+        finally:
+            self._free.release()
+
+    def _send(self, raw: bytes, message: SmsMessage) -> None:
+        name = message.provider or self.default_provider
+        provider = self.providers.get(name)
+        if provider is None:
+            logger.error("sms %r: unknown provider %s", message, name)
+            self.queue.dead(raw, message)
+            return
+        stats = self._stats[name]
+
+        if message.expires_at and time.time() > message.expires_at:
+            self.queue.ack(raw)
+            with self._lock:
+                stats.expired += 1
+            return
+
+        error: Optional[SmsError] = None
+        with self._limits[name]:
+            started = time.perf_counter()
+            try:
+                provider.send(message)
+            except SmsError as e:
+                error = e
+            finally:
+                stats.latency.observe(time.perf_counter() - started)
+
+        if error is None:
+            self.queue.ack(raw)
+            with self._lock:
+                stats.sent += 1
+        elif error.retryable and message.attempts + 1 < self.max_attempts:
+            delay = min(2 ** message.attempts, 300)
+            logger.warning("sms %r via %s failed, retrying in %ss: %s", message, name, delay, error)
+            self.queue.retry(raw, message, delay)
+            with self._lock:
+                stats.retried += 1
+        else:
+            logger.error("sms %r via %s gave up: %s", message, name, error)
+            self.queue.dead(raw, message)
+            with self._lock:
+                stats.dead += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "providers": {name: s.snapshot() for name, s in self._stats.items()},
+        }
+
+
+def build_provider(name: str | None = None) -> ISmsProvider:
+    name = name or settings.SMS_PROVIDER
+    if name == "kavenegar":
+        from app.infrastructure.sms.kavenegar import KavenegarProvider
+
+        return KavenegarProvider()
+    if name == "fake":
+        from app.infrastructure.sms.fake import FakeSmsProvider
+
+        return FakeSmsProvider()
+    raise RuntimeError(f"unknown SMS_PROVIDER {name!r}")
+
+
+def build_worker(workers: int | None = None) -> SmsWorker:
+    provider = build_provider()
+    return SmsWorker(
+        {provider.name: provider},
+        default_provider=provider.name,
+        workers=workers or settings.SMS_WORKERS,
+        batch_size=settings.SMS_BATCH_SIZE,
+        max_attempts=settings.SMS_MAX_ATTEMPTS,
+    )
+
+
+def sms_metrics() -> dict:
+    try:
+        out = sms_queue.depth()
+    except redis.RedisError:
+        out = {}
+    out["workers"] = process_stats.collect(STATS_KEY_PREFIX)
+    return out
+
+
+def install_sms_metrics() -> None:
+    register_collector("sms", sms_metrics)
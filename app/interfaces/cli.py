@@ -0,0 +1,124 @@
+# app/interfaces/cli.py
+"""
+Operational commands, run with the Flask CLI:
+
+    flask --app app.main sales-rollup-backfill --days 30
+    flask --app app.main expire-orders
+    flask --app app.main flush-carts
+    flask --app app.main retry-payments
+    flask --app app.main outbox-dispatch
+    flask --app app.main sms-worker
+"""
+from datetime import datetime, timedelta
+
+import click
+
+from app.core.config import settings
+from app.domain.services.order_service import OrderService
+from app.infrastructure.cache.app_cache import cache
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.db.unit_of_work import UnitOfWork
+from app.infrastructure.outbox.dispatcher import build_dispatcher
+from app.infrastructure.payments import pipeline
+from app.infrastructure.repositories.cart_redis import CartFlusher
+from app.infrastructure.sms.worker import build_worker
+
+
+def register_commands(app):
+    @app.cli.command("sales-rollup-backfill")
+    @click.option("--days", type=int, default=None, help="Only rebuild the last N days (default: everything).")
+    def sales_rollup_backfill(days):
+        """Recompute product_sales_daily from orders and order items."""
+        since = None
+        if days is not None:
+            since = (datetime.utcnow() - timedelta(days=days)).date()
+
+        with UnitOfWork(use_cache=False) as uow:
+            rows = uow.sales.rebuild(since)
+
+        # cached top-seller lists were computed from the old rollup
+        cache.invalidate("catalog:lists")
+        click.echo(f"product_sales_daily: {rows} rows rebuilt" + (f" since {since}" if since else ""))
+
+    @app.cli.command("expire-orders")
+    @click.option("--minutes", type=int, default=None, help="Age of unpaid orders to expire (default: ORDER_RESERVATION_MINUTES).")
+    @click.option("--batch-size", type=int, default=100, show_default=True)
+    def expire_orders(minutes, batch_size):
+        """Expire unpaid pending orders and release their reserved stock."""
+        older_than = timedelta(minutes=minutes if minutes is not None else settings.ORDER_RESERVATION_MINUTES)
+        total = 0
+        while True:
+            # one short transaction per batch
+            with UnitOfWork() as uow:
+                svc = OrderService(
+                    order_repo=uow.orders,
+                    product_repo=uow.products,
+                    sales_repo=uow.sales,
+                    inventory_repo=uow.inventory,
+                    outbox_repo=uow.outbox,
+                )
+                expired = svc.expire_pending_orders(older_than, limit=batch_size)
+            total += len(expired)
+            if len(expired) < batch_size:
+                break
+        click.echo(f"expired {total} orders")
+
+    @app.cli.command("flush-carts")
+    @click.option("--batch-size", type=int, default=None, help="Carts per transaction (default: CART_FLUSH_BATCH_SIZE).")
+    def flush_carts(batch_size):
+        """Persist every dirty Redis cart to carts/cart_items now."""
+        flusher = CartFlusher(
+            SessionLocal,
+            batch_size=batch_size or settings.CART_FLUSH_BATCH_SIZE,
+            interval=0,
+        )
+        click.echo(f"flushed {flusher.flush_all()} carts")
+
+    @app.cli.command("retry-payments")
+    @click.option("--minutes", type=int, default=5, show_default=True, help="Only payments older than this.")
+    @click.option("--batch-size", type=int, default=100, show_default=True)
+    def retry_payments(minutes, batch_size):
+        """Verify payments stuck in VERIFYING and fail ones never sent to the gateway."""
+        older_than = timedelta(minutes=minutes)
+        payments = pipeline.payment_pipeline
+        with UnitOfWork() as uow:
+            svc = payments.service(uow)
+            failed = svc.fail_unsent(older_than, limit=batch_size)
+            unverified = svc.list_unverified(older_than, limit=batch_size)
+
+        verified = 0
+        for payment_id in unverified:
+            try:
+                payments.run_verify(payment_id)  # inline: each in its own transactions
+                verified += 1
+            except Exception as e:
+                click.echo(f"payment {payment_id}: {e}", err=True)
+        click.echo(f"failed {failed} unsent payments, verified {verified}/{len(unverified)}")
+
+    @app.cli.command("outbox-dispatch")
+    @click.option("--batch-size", type=int, default=None, help="Events per round (default: OUTBOX_BATCH_SIZE).")
+    @click.option("--workers", type=int, default=None, help="Handler threads (default: OUTBOX_WORKERS).")
+    @click.option("--poll-interval", type=float, default=None, help="Seconds to sleep when idle (default: OUTBOX_POLL_INTERVAL_SECONDS).")
+    @click.option("--once", is_flag=True, help="Deliver one batch and exit.")
+    def outbox_dispatch(batch_size, workers, poll_interval, once):
+        """Deliver order events from the outbox to their handlers."""
+        dispatcher = build_dispatcher(batch_size=batch_size, workers=workers)
+        if once:
+            claimed = dispatcher.dispatch_once()
+            stats = dispatcher.stats()
+            click.echo(f"claimed {claimed} events, delivered {stats['delivered']}, retrying {stats['retried']}, dead {stats['dead']}")
+            return
+        dispatcher.run_forever(poll_interval if poll_interval is not None else settings.OUTBOX_POLL_INTERVAL_SECONDS)
+
+    @app.cli.command("sms-worker")
+    @click.option("--workers", type=int, default=None, help="Sending threads (default: SMS_WORKERS).")
+    @click.option("--once", is_flag=True, help="Send what is queued now and exit.")
+    def sms_worker(workers, once):
+        """Send queued SMS (OTP codes, order notifications) through SMS_PROVIDER."""
+        worker = build_worker(workers=workers)
+        if once:
+            worker.drain()
+            for name, s in worker.stats()["providers"].items():
+                click.echo(f"{name}: sent {s['sent']}, retrying {s['retried']}, dead {s['dead']}, expired {s['expired']}")
+            return
+        worker.run_forever()
@@ -0,0 +1,152 @@
+# app/interfaces/http/auth.py
+import hashlib
+import time
+from functools import wraps
+from typing import FrozenSet, Optional
+
+import jwt
+from flask import g, jsonify, request
+
+from app.core.config import settings
+from app.core.exceptions import AppError, ForbiddenError, UnauthorizedError
+from app.core.metrics import register_collector
+from app.core.security import decode_access_token
+from app.infrastructure.cache.local_cache import LocalLRUCache
+from app.infrastructure.cache.redis_cache import MISS
+from app.interfaces.http.controllers import get_uow
+
+
+class ClaimsCache:
+    """
+    Verified JWT claims by sha256(token), in process memory, each entry
+    kept only until the token's own `exp`. A hit skips the HMAC check and
+    JSON parsing of a token this process has already verified.
+
+    Only valid tokens are cached, and the key is a hash of the whole
+    token (signature included), so a forged or altered token is never a
+    hit. Claims are shared between requests: treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int):
+        # bounded by count; "size" is the token length, far below the byte cap
+        self.cache = LocalLRUCache(
+            max_entries=max_entries,
+            max_bytes=max_entries * 4096,
+            ttl=settings.JWT_EXPIRE_MINUTES * 60,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self.cache.get(key)
+        if claims is not MISS:
+            self.hits += 1
+            return claims
+
+        self.misses += 1
+        try:
+            claims = decode_access_token(token)
+        except jwt.ExpiredSignatureError:
+            raise UnauthorizedError("token expired")
+        except jwt.InvalidTokenError:
+            raise UnauthorizedError("invalid token")
+
+        exp = claims.get("exp")
+        ttl = exp - time.time() if exp is not None else self.cache.ttl
+        if ttl > 0:
+            self.cache.set(key, claims, size=len(token), ttl=ttl)
+        return claims
+
+    def stats(self) -> dict:
+        local = self.cache.stats()
+        return {"hits": self.hits, "misses": self.misses, "entries": local["entries"], "evictions": local["evictions"]}
+
+
+claims_cache = ClaimsCache(settings.AUTH_CLAIMS_CACHE_SIZE)
+
+
+def init_auth(app):
+    """
+    Authenticate every request once, before anything else runs:
+    g.claims = the verified JWT claims of a "Authorization: Bearer" token,
+    or None. A missing or bad token is not rejected here (public routes
+    ignore it); login_required / roles_required do that.
+    """
+    register_collector("auth", claims_cache.stats)
+
+    @app.before_request
+    def _authenticate():
+        g.claims, g.auth_error = None, None
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return
+        try:
+            g.claims = claims_cache.verify(header[7:].strip())
+        except UnauthorizedError as e:
+            g.auth_error = e
+
+
+def current_user_id() -> Optional[int]:
+    claims = g.get("claims")
+    if not claims or claims.get("sub") is None:
+        return None
+    return int(claims["sub"])
+
+
+def current_roles() -> FrozenSet[str]:
+    """
+    The current user's roles as stored now, not as embedded in the token:
+    a revoked role stops working as soon as the change commits. Served
+    from the role cache (see CachedUserRepository) and memoized on g.
+    """
+    if "roles" not in g:
+        user_id = current_user_id()
+        if user_id is None:
+            g.roles = frozenset()
+        else:
+            g.roles = frozenset(r.name for r in get_uow().users.get_roles(user_id))
+    return g.roles
+
+
+def has_role(*roles: str) -> bool:
+    return not current_roles().isdisjoint(roles)
+
+
+def ensure_self_or_admin(user_id) -> None:
+    """
+    For routes that name a user (e.g. /cart/<user_id>): only that user,
+    or an admin, may use them.
+    """
+    if user_id is None or (str(user_id) != str((g.get("claims") or {}).get("sub")) and not has_role("admin")):
+        raise ForbiddenError("not allowed for this user")
+
+
+def _check(roles) -> None:
+    if g.get("claims") is None:
+        raise g.get("auth_error") or UnauthorizedError("authentication required")
+    if roles and not has_role(*roles):
+        raise ForbiddenError("insufficient role")
+
+
+def roles_required(*roles: str):
+    """
+    401 without a valid token; 403 unless the user has one of `roles`
+    (no roles: any authenticated user).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                _check(roles)
+            except AppError as e:
+                return jsonify(e.to_dict()), e.status_code
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+login_required = roles_required()
@@ -1,11 +1,79 @@
 # app/interfaces/http/controllers/__init__.py
+import time
 
+from flask import g, request
+
+from app.core.config import settings
 from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.db.unit_of_work import UnitOfWork
 
 
 def get_db():
     """
     Returns a new SQLAlchemy session.
     Remember to call db.close() in the controller.
+    Prefer get_uow() inside requests.
     """
     return SessionLocal()
+
+
+def get_uow() -> UnitOfWork:
+    """
+    The unit of work of the current request (opened in before_request).
+    """
+    return g.uow
+
+
+# clients that wrote recently carry this cookie and read from the primary
+# until it expires, so they never see a replica that is behind their write
+PRIMARY_STICKY_COOKIE = "mp_primary_until"
+
+
+def _reads_may_use_replica() -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    try:
+        until = float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0))
+    except ValueError:
+        until = 0
+    return until < time.time()
+
+
+def init_unit_of_work(app):
+    """
+    One session/transaction per request:
+      - before_request opens it (GET/HEAD may read from a replica)
+      - after_request commits it once if the response is not an error
+        (a failing commit still turns into a 500 for the client)
+      - teardown_request rolls back whatever was not committed and closes it
+    """
+
+    @app.before_request
+    def _open_uow():
+        g.uow = UnitOfWork(read_only=_reads_may_use_replica())
+
+    @app.after_request
+    def _commit_uow(response):
+        uow = g.get("uow")
+        if uow is not None and response.status_code < 400:
+            uow.commit()
+            if uow.wrote and settings.DB_REPLICA_URLS:
+                lag = settings.DB_REPLICA_LAG_SECONDS
+                response.set_cookie(
+                    PRIMARY_STICKY_COOKIE,
+                    str(int(time.time()) + lag),
+                    max_age=lag,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        return response
+
+    @app.teardown_request
+    def _close_uow(exc):
+        uow = g.pop("uow", None)
+        if uow is None:
+            return
+        try:
+            uow.rollback()
+        finally:
+            uow.close()
@@ -1,54 +1,104 @@
 # app/interfaces/http/controllers/admin_controller.py
 from flask import Blueprint, request, jsonify
 
-from app.interfaces.http.controllers import get_db
-from app.infrastructure.repositories.product_sqlalchemy import SQLAlchemyProductRepository
+from app.interfaces.http.controllers import get_uow
+from app.domain.entities.category import Category
 from app.domain.entities.product import Product
-from app.core.exceptions import AppError
-from app.core.security import decode_access_token, require_roles
+from app.domain.services.auth_service import AuthService
+from app.core.exceptions import AppError, ValidationError
+from app.core.pagination import clamp_limit
+from app.interfaces.http.auth import roles_required
 
 admin_bp = Blueprint("admin", __name__)
 
 
-def _get_claims_or_401():
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return None
-    token = auth_header.split(" ", 1)[1]
-    claims = decode_access_token(token)
-    # require admin
-    require_roles(claims, ["admin"])
-    return claims
-
-
 @admin_bp.get("/products")
+@roles_required("admin")
 def admin_list_products():
     try:
-        _get_claims_or_401()
-    except Exception as e:
-        return jsonify({"error": "unauthorized"}), 401
+        repo = get_uow().products
+        page = repo.list_products(
+            is_active=None,
+            limit=clamp_limit(request.args.get("limit", type=int), default=200, maximum=500),
+            cursor=request.args.get("cursor"),
+        )
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
 
-    db = get_db()
-    try:
-        repo = SQLAlchemyProductRepository(db)
-        products = repo.list_products(is_active=None, limit=200, offset=0)
-        return jsonify([
+    return jsonify({
+        "items": [
             {
                 "id": p.id,
                 "title": p.title,
-                "price": float(p.price),
+                "price": p.price,
                 "is_active": p.is_active,
-            } for p in products
-        ])
-    finally:
-        db.close()
+            } for p in page.items
+        ],
+        "next_cursor": page.next_cursor,
+    })
+
+
+@admin_bp.get("/users")
+@roles_required("admin")
+def admin_list_users():
+    try:
+        repo = get_uow().users
+        page = repo.list_users(
+            limit=clamp_limit(request.args.get("limit", type=int)),
+            cursor=request.args.get("cursor"),
+        )
+        roles = AuthService(user_repo=repo).get_roles_for_users(u.id for u in page.items)
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+    return jsonify({
+        "items": [
+            {
+                "id": u.id,
+                "phone": u.phone,
+                "email": u.email,
+                "first_name": u.first_name,
+                "last_name": u.last_name,
+                "is_active": u.is_active,
+                "roles": roles.get(u.id, []),
+                "created_at": u.created_at,
+            } for u in page.items
+        ],
+        "next_cursor": page.next_cursor,
+    })
+
+
+@admin_bp.post("/users/<int:user_id>/roles")
+@roles_required("admin")
+def admin_assign_role(user_id: int):
+    try:
+        data = request.get_json() or {}
+        role = data.get("role")
+        if not role:
+            raise ValidationError("role is required")
+        added = AuthService(user_repo=get_uow().users).assign_role(user_id, role)
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+    return jsonify({"user_id": user_id, "role": role}), 201 if added else 200
+
+
+@admin_bp.delete("/users/<int:user_id>/roles/<role>")
+@roles_required("admin")
+def admin_revoke_role(user_id: int, role: str):
+    try:
+        AuthService(user_repo=get_uow().users).revoke_role(user_id, role)
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+    return jsonify({"user_id": user_id, "role": role})
 
 
 @admin_bp.post("/products")
+@roles_required("admin")
 def admin_create_product():
-    db = get_db()
     try:
-        repo = SQLAlchemyProductRepository(db)
+        repo = get_uow().products
         data = request.get_json() or {}
 
         p = Product(
@@ -71,36 +121,70 @@ def admin_create_product():
         return jsonify({"id": created.id}), 201
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 @admin_bp.put("/products/<int:product_id>")
+@roles_required("admin")
 def admin_update_product(product_id: int):
-    db = get_db()
-    try:
-        repo = SQLAlchemyProductRepository(db)
-        p = repo.get_by_id(product_id)
-        if not p:
-            return jsonify({"error": "not found"}), 404
+    repo = get_uow().products
+    # the live row, not a cached copy: stock moves with every order
+    p = repo.get_for_update(product_id)
+    if not p:
+        return jsonify({"error": "not found"}), 404
+
+    data = request.get_json() or {}
+    p.title = data.get("title", p.title)
+    p.slug = data.get("slug", p.slug)
+    p.category_id = data.get("category_id", p.category_id)
+    p.price = data.get("price", p.price)
+    p.compare_at_price = data.get("compare_at_price", p.compare_at_price)
+    p.delivery_type = data.get("delivery_type", p.delivery_type)
+    p.platform = data.get("platform", p.platform)
+    p.duration = data.get("duration", p.duration)
+    p.region = data.get("region", p.region)
+    if "stock" in data:
+        p.stock = data["stock"]
+    p.is_active = data.get("is_active", p.is_active)
+    p.image_url = data.get("image_url", p.image_url)
+    p.short_description = data.get("short_description", p.short_description)
+    p.description = data.get("description", p.description)
 
+    updated = repo.update(p)
+    return jsonify({"id": updated.id})
+
+
+@admin_bp.post("/categories")
+@roles_required("admin")
+def admin_create_category():
+    try:
+        repo = get_uow().categories
         data = request.get_json() or {}
-        p.title = data.get("title", p.title)
-        p.slug = data.get("slug", p.slug)
-        p.category_id = data.get("category_id", p.category_id)
-        p.price = data.get("price", p.price)
-        p.compare_at_price = data.get("compare_at_price", p.compare_at_price)
-        p.delivery_type = data.get("delivery_type", p.delivery_type)
-        p.platform = data.get("platform", p.platform)
-        p.duration = data.get("duration", p.duration)
-        p.region = data.get("region", p.region)
-        p.stock = data.get("stock", p.stock)
-        p.is_active = data.get("is_active", p.is_active)
-        p.image_url = data.get("image_url", p.image_url)
-        p.short_description = data.get("short_description", p.short_description)
-        p.description = data.get("description", p.description)
-
-        updated = repo.update(p)
-        return jsonify({"id": updated.id})
-    finally:
-        db.close()
+
+        c = Category(
+            title=data.get("title"),
+            slug=data.get("slug"),
+            description=data.get("description"),
+            is_active=data.get("is_active", True),
+        )
+        created = repo.create(c)
+        return jsonify({"id": created.id}), 201
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+
+@admin_bp.put("/categories/<int:category_id>")
+@roles_required("admin")
+def admin_update_category(category_id: int):
+    repo = get_uow().categories
+    c = repo.get_by_id(category_id)
+    if not c:
+        return jsonify({"error": "not found"}), 404
+
+    data = request.get_json() or {}
+    c.title = data.get("title", c.title)
+    c.slug = data.get("slug", c.slug)
+    c.description = data.get("description", c.description)
+    c.is_active = data.get("is_active", c.is_active)
+
+    updated = repo.update(c)
+    return jsonify({"id": updated.id})
@@ -1,8 +1,7 @@
 # app/interfaces/http/controllers/auth_controller.py
 from flask import Blueprint, request, jsonify
 
-from app.interfaces.http.controllers import get_db
-from app.infrastructure.repositories.user_sqlalchemy import SQLAlchemyUserRepository
+from app.interfaces.http.controllers import get_uow
 from app.domain.services.auth_service import AuthService
 from app.domain.services.otp_service import OTPService
 from app.core.exceptions import AppError
@@ -17,9 +16,8 @@ def register():
     No password-based login in this app.
     After register, the client should call /auth/request-otp and /auth/verify-otp.
     """
-    db = get_db()
     try:
-        user_repo = SQLAlchemyUserRepository(db)
+        user_repo = get_uow().users
         auth_service = AuthService(user_repo=user_repo)
 
         data = request.get_json() or {}
@@ -37,8 +35,6 @@ def register():
         }), 201
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 # OPTIONAL: if someone still calls /auth/login, tell them it's not allowed
@@ -56,9 +52,8 @@ def request_otp():
     Step 1: client sends phone, we generate OTP and store in Redis.
     Same for normal users and admin users — difference is only in DB roles.
     """
-    db = get_db()
     try:
-        user_repo = SQLAlchemyUserRepository(db)
+        user_repo = get_uow().users
         otp_service = OTPService(user_repo=user_repo)
 
         data = request.get_json() or {}
@@ -69,8 +64,8 @@ def request_otp():
         code = otp_service.send_otp(phone)
         # NOTE: don't return code in production
         return jsonify({"message": "otp sent", "debug_code": code}), 200
-    finally:
-        db.close()
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code, e.headers
 
 
 @auth_bp.post("/verify-otp")
@@ -83,9 +78,8 @@ def verify_otp():
       - issue JWT that includes roles from DB
     So if this phone belongs to an admin (user_roles -> admin), JWT will have roles=["admin"].
     """
-    db = get_db()
     try:
-        user_repo = SQLAlchemyUserRepository(db)
+        user_repo = get_uow().users
         otp_service = OTPService(user_repo=user_repo)
 
         data = request.get_json() or {}
@@ -98,6 +92,4 @@ def verify_otp():
         token = otp_service.verify_otp_and_issue_token(phone, code)
         return jsonify({"access_token": token}), 200
     except AppError as e:
-        return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
+        return jsonify(e.to_dict()), e.status_code, e.headers
@@ -1,35 +1,35 @@
 # app/interfaces/http/controllers/blog_controller.py
 from flask import Blueprint, request, jsonify
 
-from app.interfaces.http.controllers import get_db
-from app.infrastructure.repositories.blog_sqlalchemy import SQLAlchemyBlogRepository
+from app.interfaces.http.controllers import get_uow
 from app.domain.services.content_service import ContentService
 from app.core.exceptions import AppError
+from app.core.pagination import clamp_limit
 
 blog_bp = Blueprint("blog", __name__)
 
 
 @blog_bp.get("/")
 def list_posts():
-    db = get_db()
     try:
-        repo = SQLAlchemyBlogRepository(db)
-        svc = ContentService(blog_repo=repo)
-        posts = svc.list_posts(limit=50)
-        return jsonify([svc.to_dict(p) for p in posts])
-    finally:
-        db.close()
+        svc = ContentService(blog_repo=get_uow().blog)
+        page = svc.list_posts(
+            limit=clamp_limit(request.args.get("limit", type=int)),
+            cursor=request.args.get("cursor"),
+        )
+        return jsonify({
+            "items": [svc.to_dict(p) for p in page.items],
+            "next_cursor": page.next_cursor,
+        })
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
 
 
 @blog_bp.get("/<slug>")
 def get_post(slug: str):
-    db = get_db()
     try:
-        repo = SQLAlchemyBlogRepository(db)
-        svc = ContentService(blog_repo=repo)
+        svc = ContentService(blog_repo=get_uow().blog)
         post = svc.get_post(slug)
         return jsonify(svc.to_dict(post))
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
@@ -1,97 +1,130 @@
 # app/interfaces/http/controllers/cart_controller.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 
-from app.interfaces.http.controllers import get_db
-from app.infrastructure.repositories.cart_sqlalchemy import SQLAlchemyCartRepository
-from app.infrastructure.repositories.product_sqlalchemy import SQLAlchemyProductRepository
+from app.interfaces.http.controllers import get_uow
+from app.interfaces.http.auth import current_user_id, ensure_self_or_admin, has_role, login_required
+from app.interfaces.http.idempotency import idempotent
 from app.domain.services.cart_service import CartService
+from app.domain.services.order_service import OrderService
 from app.core.exceptions import AppError
 
 cart_bp = Blueprint("cart", __name__)
 
 
+def _cart_service() -> CartService:
+    uow = get_uow()
+    return CartService(cart_repo=uow.carts, product_repo=uow.products)
+
+
+def _cart_response(svc: CartService, cart, status: int = 200):
+    body = svc.to_dict(cart)
+    response = jsonify(body)
+    response.status_code = status
+    if body["cart_id"] is not None:
+        response.set_etag(svc.etag(body["cart_id"], body["version"]))
+    # let clients cache it, but always revalidate with If-None-Match
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _item_owner():
+    # admins may edit any cart item; everyone else only their own
+    return None if has_role("admin") else current_user_id()
+
+
 @cart_bp.get("/<int:user_id>")
+@login_required
 def get_cart(user_id: int):
-    db = get_db()
     try:
-        cart_repo = SQLAlchemyCartRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = CartService(cart_repo=cart_repo, product_repo=product_repo)
-
+        ensure_self_or_admin(user_id)
+        svc = _cart_service()
         cart = svc.get_cart(user_id)
-        return jsonify(svc.to_dict(cart))
+        etag = svc.etag(cart.id, cart.version) if cart is not None else None
+        if etag and request.if_none_match.contains(etag):
+            # unchanged: answered from the cart row alone, no item query
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return _cart_response(svc, cart)
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 @cart_bp.post("/items")
+@login_required
 def add_cart_item():
-    db = get_db()
     try:
-        cart_repo = SQLAlchemyCartRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = CartService(cart_repo=cart_repo, product_repo=product_repo)
-
+        svc = _cart_service()
         data = request.get_json() or {}
+        user_id = data.get("user_id", current_user_id())
+        ensure_self_or_admin(user_id)
         cart = svc.add_item(
-            user_id=data.get("user_id"),
+            user_id=user_id,
             product_id=data.get("product_id"),
             quantity=int(data.get("quantity", 1)),
         )
-        return jsonify(svc.to_dict(cart)), 201
+        return _cart_response(svc, cart, 201)
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 @cart_bp.put("/items/<int:item_id>")
+@login_required
 def update_cart_item(item_id: int):
-    db = get_db()
     try:
-        cart_repo = SQLAlchemyCartRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = CartService(cart_repo=cart_repo, product_repo=product_repo)
-
+        svc = _cart_service()
         data = request.get_json() or {}
-        cart = svc.update_item(item_id=item_id, quantity=int(data.get("quantity", 1)))
-        return jsonify(svc.to_dict(cart))
+        cart = svc.update_item(item_id=item_id, quantity=int(data.get("quantity", 1)), user_id=_item_owner())
+        return _cart_response(svc, cart)
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 @cart_bp.delete("/items/<int:item_id>")
+@login_required
 def remove_cart_item(item_id: int):
-    db = get_db()
     try:
-        cart_repo = SQLAlchemyCartRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = CartService(cart_repo=cart_repo, product_repo=product_repo)
-
-        cart = svc.remove_item(item_id)
-        return jsonify(svc.to_dict(cart))
+        svc = _cart_service()
+        cart = svc.remove_item(item_id, user_id=_item_owner())
+        return _cart_response(svc, cart)
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 @cart_bp.delete("/<int:user_id>")
+@login_required
 def clear_cart(user_id: int):
-    db = get_db()
     try:
-        cart_repo = SQLAlchemyCartRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = CartService(cart_repo=cart_repo, product_repo=product_repo)
-
+        ensure_self_or_admin(user_id)
+        svc = _cart_service()
         svc.clear_cart(user_id)
         cart = svc.get_cart(user_id)
-        return jsonify(svc.to_dict(cart))
+        return _cart_response(svc, cart)
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+
+@cart_bp.post("/<int:user_id>/checkout")
+@login_required
+@idempotent("cart.checkout")
+def checkout(user_id: int):
+    try:
+        ensure_self_or_admin(user_id)
+        uow = get_uow()
+        svc = _cart_service()
+        order_svc = OrderService(
+            order_repo=uow.orders,
+            product_repo=uow.products,
+            sales_repo=uow.sales,
+            inventory_repo=uow.inventory,
+            outbox_repo=uow.outbox,
+        )
+        order = svc.checkout(user_id, order_svc, after_commit=uow.after_commit)
+        return jsonify({
+            "order_id": order.id,
+            "order_number": order.order_number,
+            "total_amount": order.total_amount,
+        }), 201
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
@@ -0,0 +1,30 @@
+# app/interfaces/http/controllers/metrics_controller.py
+import hmac
+
+from flask import Blueprint, request, jsonify
+
+from app.core.config import settings
+from app.core.metrics import collect_all
+
+metrics_bp = Blueprint("metrics", __name__)
+
+_LOOPBACK = ("127.0.0.1", "::1")
+
+
+@metrics_bp.get("/")
+def get_metrics():
+    """
+    Process-local runtime metrics (DB pool, ...). Each gunicorn worker
+    answers for itself, so scrape a few times to see every worker.
+
+    With METRICS_TOKEN set, requires it in X-Metrics-Token; without it
+    only loopback clients (a scraper next to the app) are answered,
+    everyone else gets a 404.
+    """
+    if settings.METRICS_TOKEN:
+        token = request.headers.get("X-Metrics-Token", "")
+        if not hmac.compare_digest(token, settings.METRICS_TOKEN):
+            return jsonify({"error": "unauthorized"}), 401
+    elif request.remote_addr not in _LOOPBACK:
+        return jsonify({"error": "not_found"}), 404
+    return jsonify(collect_all())
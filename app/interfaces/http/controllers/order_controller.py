@@ -1,50 +1,94 @@
 # app/interfaces/http/controllers/order_controller.py
 from flask import Blueprint, request, jsonify
 
-from app.interfaces.http.controllers import get_db
-from app.infrastructure.repositories.order_sqlalchemy import SQLAlchemyOrderRepository
-from app.infrastructure.repositories.product_sqlalchemy import SQLAlchemyProductRepository
+from app.interfaces.http.controllers import get_uow
+from app.interfaces.http.auth import current_user_id, has_role, login_required
+from app.interfaces.http.idempotency import idempotent
 from app.domain.services.order_service import OrderService
+from app.core import exceptions
 from app.core.exceptions import AppError
+from app.core.pagination import clamp_limit
 
 order_bp = Blueprint("orders", __name__)
 
 
+def _order_service() -> OrderService:
+    uow = get_uow()
+    return OrderService(
+        order_repo=uow.orders,
+        product_repo=uow.products,
+        sales_repo=uow.sales,
+        inventory_repo=uow.inventory,
+        outbox_repo=uow.outbox,
+    )
+
+
+def _get_own_order(svc: OrderService, order_id: int):
+    order = svc.get_order(order_id)
+    if order.user_id != current_user_id() and not has_role("admin"):
+        raise exceptions.NotFoundError("order not found")
+    return order
+
+
 @order_bp.post("/")
+@login_required
+@idempotent("orders.create")
 def create_order():
-    db = get_db()
     try:
-        order_repo = SQLAlchemyOrderRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = OrderService(order_repo=order_repo, product_repo=product_repo)
-
+        svc = _order_service()
         data = request.get_json() or {}
-        user_id = data.get("user_id")  # TODO: get from JWT
+        user_id = current_user_id()
         items = data.get("items", [])
 
         order = svc.create_order(user_id=user_id, items=items)
         return jsonify({
             "order_id": order.id,
             "order_number": order.order_number,
-            "total_amount": float(order.total_amount),
+            "total_amount": order.total_amount,
         }), 201
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
+
+
+@order_bp.get("/")
+@login_required
+def list_orders():
+    try:
+        svc = _order_service()
+        user_id = current_user_id()
+        if has_role("admin"):
+            user_id = request.args.get("user_id", default=user_id, type=int)
+        page = svc.list_user_orders(
+            user_id=user_id,
+            limit=clamp_limit(request.args.get("limit", type=int)),
+            cursor=request.args.get("cursor"),
+        )
+        return jsonify({
+            "items": [svc.to_dict(o) for o in page.items],
+            "next_cursor": page.next_cursor,
+        })
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
 
 
 @order_bp.get("/<int:order_id>")
+@login_required
 def get_order(order_id: int):
-    db = get_db()
     try:
-        order_repo = SQLAlchemyOrderRepository(db)
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = OrderService(order_repo=order_repo, product_repo=product_repo)
+        svc = _order_service()
+        order = _get_own_order(svc, order_id)
+        return jsonify(svc.to_dict(order))
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
 
-        order = svc.get_order(order_id)
+
+@order_bp.post("/<int:order_id>/cancel")
+@login_required
+def cancel_order(order_id: int):
+    try:
+        svc = _order_service()
+        _get_own_order(svc, order_id)
+        order = svc.cancel_order(order_id)
         return jsonify(svc.to_dict(order))
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
@@ -0,0 +1,86 @@
+# app/interfaces/http/controllers/payment_controller.py
+from urllib.parse import urlencode
+
+from flask import Blueprint, redirect, request, jsonify, url_for
+
+from app.core.config import settings
+from app.core.exceptions import AppError, ServiceUnavailableError
+from app.infrastructure.payments import pipeline
+from app.interfaces.http.auth import current_user_id, has_role, login_required
+from app.interfaces.http.controllers import get_uow
+from app.interfaces.http.idempotency import idempotent
+
+payment_bp = Blueprint("payments", __name__)
+
+
+def _owner():
+    # admins may see any payment; everyone else only those of their own orders
+    return None if has_role("admin") else current_user_id()
+
+
+@payment_bp.post("/")
+@login_required
+@idempotent("payments.start")
+def start_payment():
+    """
+    202: the gateway is contacted in the background; poll GET /payments/<id>
+    until it has a payment_url (status PENDING) to send the user to.
+    """
+    try:
+        payments = pipeline.payment_pipeline
+        if not payments.has_capacity():
+            raise ServiceUnavailableError("payment gateway is busy, try again shortly")
+
+        uow = get_uow()
+        svc = payments.service(uow)
+        data = request.get_json() or {}
+        payment = svc.start(order_id=data.get("order_id"), user_id=_owner())
+
+        payment_id = payment.id
+        callback_url = settings.PAYMENT_CALLBACK_URL or url_for("payments.callback", _external=True)
+        uow.after_commit(lambda: payments.submit_request(payment_id, callback_url))
+        return jsonify(svc.to_dict(payment)), 202
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+
+@payment_bp.get("/<int:payment_id>")
+@login_required
+def get_payment(payment_id: int):
+    try:
+        svc = pipeline.payment_pipeline.service(get_uow())
+        return jsonify(svc.to_dict(svc.get_payment(payment_id, user_id=_owner())))
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+
+@payment_bp.get("/callback")
+def callback():
+    """
+    The gateway redirects the user here (?Authority=...&Status=OK|NOK).
+    Verification is queued; the answer doesn't wait for it.
+
+    Not behind @idempotent: the status changes are conditional, so a
+    repeated callback changes nothing and answers with the payment as it
+    is now (a repeated verification is answered 101 by the gateway).
+    """
+    try:
+        payments = pipeline.payment_pipeline
+        uow = get_uow()
+        uow.use_primary()  # the payment row was written moments ago
+        svc = payments.service(uow)
+        payment = svc.handle_callback(
+            authority=request.args.get("Authority", ""),
+            ok=request.args.get("Status") == "OK",
+        )
+        if payment.status == "VERIFYING":
+            payment_id = payment.id
+            uow.after_commit(lambda: payments.submit_verify(payment_id))
+
+        body = svc.to_dict(payment)
+        if settings.PAYMENT_RETURN_URL:
+            query = urlencode({"payment_id": body["id"], "status": body["status"]})
+            return redirect(f"{settings.PAYMENT_RETURN_URL}?{query}")
+        return jsonify(body), 202
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
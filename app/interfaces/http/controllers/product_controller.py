@@ -1,20 +1,19 @@
 # app/interfaces/http/controllers/product_controller.py
 from flask import Blueprint, request, jsonify
 
-from app.interfaces.http.controllers import get_db
-from app.infrastructure.repositories.product_sqlalchemy import SQLAlchemyProductRepository
+from app.interfaces.http.controllers import get_uow
 from app.domain.services.product_service import ProductService
 from app.core.exceptions import AppError
+from app.core.pagination import clamp_limit
+from app.infrastructure.search.suggest_index import suggest_index
 
 product_bp = Blueprint("products", __name__)
 
 
 @product_bp.post("/")
 def create_product():
-    db = get_db()
     try:
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = ProductService(product_repo=product_repo)
+        svc = ProductService(product_repo=get_uow().products)
 
         data = request.get_json() or {}
         product = svc.create_product(
@@ -37,58 +36,60 @@ def create_product():
         return jsonify(svc.to_dict(product)), 201
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
 
 
 @product_bp.get("/")
 def list_products():
-    db = get_db()
     try:
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = ProductService(product_repo=product_repo)
+        uow = get_uow()
+        svc = ProductService(product_repo=uow.products, category_repo=uow.categories)
 
         category = request.args.get("category")
         search = request.args.get("search")
-        items = svc.list_products(
+        page = svc.list_products(
             category_slug=category,
             search=search,
             is_active=True,
-            limit=50,
-            offset=0,
+            limit=clamp_limit(request.args.get("limit", type=int)),
+            cursor=request.args.get("cursor"),
         )
-        return jsonify([svc.to_dict(p) for p in items])
-    finally:
-        db.close()
+        return jsonify({
+            "items": [svc.to_dict(p) for p in page.items],
+            "next_cursor": page.next_cursor,
+        })
+    except AppError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+
+@product_bp.get("/suggest")
+def suggest_products():
+    """
+    Autocomplete from the in-memory index; no database access.
+    """
+    q = request.args.get("q", "")
+    limit = clamp_limit(request.args.get("limit", type=int), default=10, maximum=50)
+    items = suggest_index.search(q, limit=limit)
+    return jsonify({"items": items, "count": len(items)})
 
 
 @product_bp.get("/top-weekly")
 def get_top_weekly_products():
-    db = get_db()
-    try:
-        limit = request.args.get("limit", default=8, type=int)
+    limit = clamp_limit(request.args.get("limit", type=int), default=8, maximum=50)
 
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = ProductService(product_repo=product_repo)
+    svc = ProductService(product_repo=get_uow().products)
 
-        products = svc.get_top_selling_products_this_week(limit=limit)
-        data = [svc.to_dict(p) for p in products]
+    products = svc.get_top_selling_products_this_week(limit=limit)
+    data = [svc.to_dict(p) for p in products]
 
-        return jsonify({"items": data, "count": len(data)})
-    finally:
-        db.close()
+    return jsonify({"items": data, "count": len(data)})
 
 
 @product_bp.get("/<int:product_id>")
 def get_product(product_id: int):
-    db = get_db()
     try:
-        product_repo = SQLAlchemyProductRepository(db)
-        svc = ProductService(product_repo=product_repo)
+        svc = ProductService(product_repo=get_uow().products)
 
         p = svc.get_product(product_id)
         return jsonify(svc.to_dict(p))
     except AppError as e:
         return jsonify(e.to_dict()), e.status_code
-    finally:
-        db.close()
@@ -0,0 +1,126 @@
+# app/interfaces/http/idempotency.py
+import logging
+from functools import wraps
+from typing import Callable, Optional
+
+import redis
+from flask import current_app, g, jsonify, request
+
+from app.core.exceptions import AppError, ConflictError, ServiceUnavailableError
+from app.infrastructure.redis.idempotency_store import fingerprint, idempotency_store
+from app.interfaces.http.controllers import get_uow
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(scope: str, key: Optional[Callable[[], str]] = None):
+    """
+    Honour an Idempotency-Key header on a write endpoint (or the request's
+    own natural key: pass key=callable).
+
+    The key is reserved before the view runs. A successful (< 400)
+    response is committed with the reservation held for the result's ttl
+    and stored by an after-commit hook, so a replayed response always
+    describes data that exists, and a crash or Redis error between the
+    commit and the store leaves the key in progress (duplicates get a
+    409) instead of running the view a second time. Duplicates get the
+    stored response back (with Idempotent-Replayed: true); reusing a key
+    for a different body is a 422. Error responses are not stored.
+    Without the header, or if Redis is down when the request starts, the
+    view just runs.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            ikey = (key() if key else request.headers.get(HEADER, "")).strip()
+            if not ikey:
+                return view(*args, **kwargs)
+            if len(ikey) > MAX_KEY_LENGTH:
+                return jsonify({"error": "validation_error", "message": "idempotency key is too long"}), 422
+
+            sub = (g.get("claims") or {}).get("sub")
+            if sub is not None:
+                ikey = f"u{sub}:{ikey}"  # each user has their own keys
+            fp = fingerprint(request.method, request.full_path, request.get_data())
+            try:
+                stored, token = idempotency_store.begin(scope, ikey, fp)
+            except AppError as e:
+                return jsonify(e.to_dict()), e.status_code
+            except redis.RedisError:
+                logger.warning("idempotency store unavailable, running %s without it", scope, exc_info=True)
+                return view(*args, **kwargs)
+
+            if stored is not None:
+                result = stored["result"]
+                response = current_app.response_class(
+                    result["body"], status=result["status"], content_type=result["content_type"]
+                )
+                if result.get("location"):
+                    response.headers["Location"] = result["location"]
+                response.headers["Idempotent-Replayed"] = "true"
+                return response
+
+            # registered before the view's own after-commit callbacks, so
+            # the result is stored first, whatever they do
+            outcome = {}
+
+            def store():
+                outcome["committed"] = True
+                if "result" in outcome:
+                    _quietly(idempotency_store.complete, scope, ikey, token, fp, outcome["result"])
+
+            uow = get_uow()
+            uow.after_commit(store)
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code >= 400:
+                    _quietly(idempotency_store.release, scope, ikey, token)
+                    return response
+                error = _hold(scope, ikey, token)
+                if error is not None:
+                    uow.rollback()
+                    return jsonify(error.to_dict()), error.status_code
+                outcome["result"] = {
+                    "status": response.status_code,
+                    "body": response.get_data(as_text=True),
+                    "content_type": response.content_type,
+                    "location": response.headers.get("Location"),
+                }
+                uow.commit()
+            except BaseException:
+                if not outcome.get("committed"):
+                    _quietly(idempotency_store.release, scope, ikey, token)
+                raise
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _hold(scope: str, ikey: str, token: str) -> Optional[AppError]:
+    """
+    Keep the key reserved past the commit; an error if the view's work
+    must not be committed.
+    """
+    try:
+        if idempotency_store.hold(scope, ikey, token):
+            return None
+    except redis.RedisError:
+        logger.warning("idempotency store unavailable, not committing %s", scope, exc_info=True)
+        _quietly(idempotency_store.release, scope, ikey, token)
+        return ServiceUnavailableError("try again shortly")
+    # our lock expired while the view ran: a duplicate may be running it now
+    return ConflictError("a request with this Idempotency-Key is still in progress")
+
+
+def _quietly(fn, *args) -> None:
+    # the request itself succeeded or failed already; don't change that
+    try:
+        fn(*args)
+    except redis.RedisError:
+        logger.warning("idempotency store unavailable", exc_info=True)
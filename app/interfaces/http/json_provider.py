@@ -0,0 +1,85 @@
+# app/interfaces/http/json_provider.py
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: Flask's stdlib provider is used instead
+    orjson = None
+
+
+BACKENDS = ("auto", "orjson", "stdlib")
+
+
+def _default(value: Any):
+    # prices are Decimal columns: sent as JSON numbers, as before
+    if isinstance(value, Decimal):
+        return float(value)
+    # ISO 8601 rather than Flask's RFC 822 dates, like orjson
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    # dataclasses, UUID, __html__
+    return DefaultJSONProvider.default(value)
+
+
+class DecimalJSONProvider(DefaultJSONProvider):
+    """
+    Flask's stdlib provider, plus Decimal (as numbers) and ISO 8601
+    dates, so to_dict helpers can hand over column values as they are.
+    Used when orjson is not installed; keys stay in insertion order and
+    text unescaped, as orjson writes them.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    app.json for jsonify() / request.get_json() on orjson: compact UTF-8,
+    keys in insertion order, Decimal / datetime / dataclasses encoded
+    natively (the same JSON as DecimalJSONProvider writes).
+    """
+
+    mimetype = "application/json"
+
+    def __init__(self, app):
+        if orjson is None:
+            raise RuntimeError("JSON_BACKEND=orjson but orjson is not installed")
+        super().__init__(app)
+        self._stdlib = DecimalJSONProvider(app)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            # explicit json.dumps options (indent=..., sort_keys=...): stdlib only
+            return self._stdlib.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return self._stdlib.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def init_json_provider(app, backend: str = "auto") -> None:
+    """
+    backend "orjson" needs the orjson package; "auto" uses it when it is
+    installed and Flask's stdlib provider (DecimalJSONProvider) otherwise.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown JSON backend {backend!r} (use {', '.join(BACKENDS)})")
+    if backend == "orjson" or (backend == "auto" and orjson is not None):
+        app.json = FastJSONProvider(app)
+    else:
+        app.json = DecimalJSONProvider(app)
@@ -0,0 +1,97 @@
+# app/interfaces/http/rate_limit.py
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import g, jsonify, request
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsError
+from app.core.metrics import register_collector
+from app.infrastructure.redis.rate_limiter import Limit, RateLimiter, rate_limiter
+
+
+# (scope, max requests, window seconds)
+Rule = Tuple[str, int, int]
+
+
+def _client_ip() -> Optional[str]:
+    # behind a reverse proxy, wrap the app in werkzeug's ProxyFix so this
+    # is the client and not the proxy
+    return request.remote_addr
+
+
+def _phone() -> Optional[str]:
+    data = request.get_json(silent=True) or {}
+    phone = data.get("phone") if isinstance(data, dict) else None
+    return str(phone).strip() if phone else None
+
+
+def _user() -> Optional[str]:
+    # only the verified token (set by init_auth, which runs first): a
+    # user_id from the URL or body is the client's word and could be
+    # someone else's, or a fresh value per request
+    sub = (g.get("claims") or {}).get("sub")
+    return str(sub) if sub is not None else None
+
+
+SCOPES: Dict[str, Callable[[], Optional[str]]] = {
+    "ip": _client_ip,
+    "phone": _phone,
+    "user": _user,
+}
+
+
+def parse_rules(spec: str) -> Dict[str, List[Rule]]:
+    """
+    "auth.request_otp=ip:20/3600,phone:5/3600; orders=user:60/60"
+    -> {"auth.request_otp": [("ip", 20, 3600), ("phone", 5, 3600)],
+        "orders": [("user", 60, 60)]}
+
+    Keys are endpoint names (blueprint.view) or whole blueprints.
+    """
+    rules: Dict[str, List[Rule]] = {}
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        target, _, limits = part.partition("=")
+        for item in limits.split(","):
+            try:
+                scope, _, rate = item.strip().partition(":")
+                limit, _, window = rate.partition("/")
+                rule = (scope.strip(), int(limit), int(window))
+            except ValueError:
+                raise ValueError(f"invalid rate limit {item!r} for {target.strip()!r}")
+            if rule[0] not in SCOPES:
+                raise ValueError(f"unknown rate limit scope {rule[0]!r} (use {', '.join(SCOPES)})")
+            rules.setdefault(target.strip(), []).append(rule)
+    return rules
+
+
+def init_rate_limiter(app, rules: Optional[Dict[str, List[Rule]]] = None, limiter: RateLimiter = rate_limiter):
+    """
+    Reject requests over their endpoint's limits with 429 + Retry-After,
+    before any other work (no DB session is opened for them). Limits of
+    the endpoint and of its blueprint all apply; a scope with no value in
+    the request (e.g. no phone in the body) is skipped.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    rules = parse_rules(settings.RATE_LIMITS) if rules is None else rules
+    register_collector("rate_limit", limiter.stats)
+
+    @app.before_request
+    def _rate_limit():
+        endpoint = request.endpoint
+        if not endpoint:
+            return None
+        blueprint = endpoint.rpartition(".")[0]
+        limits = []
+        for target in (endpoint, blueprint):
+            for scope, limit, window in rules.get(target, ()):
+                ident = SCOPES[scope]()
+                if ident:
+                    limits.append(Limit(f"{target}:{scope}:{window}:{ident}", limit, window))
+        wait = limiter.hit(limits)
+        if not wait:
+            return None
+        err = TooManyRequestsError(f"rate limit exceeded, retry in {wait}s", retry_after=wait)
+        return jsonify(err.to_dict()), err.status_code, err.headers
@@ -6,6 +6,8 @@ from app.interfaces.http.controllers.order_controller import order_bp
 from app.interfaces.http.controllers.blog_controller import blog_bp
 from app.interfaces.http.controllers.admin_controller import admin_bp
 from app.interfaces.http.controllers.cart_controller import cart_bp
+from app.interfaces.http.controllers.metrics_controller import metrics_bp
+from app.interfaces.http.controllers.payment_controller import payment_bp
 
 
 def register_routes(app):
@@ -16,3 +18,5 @@ def register_routes(app):
     app.register_blueprint(blog_bp, url_prefix="/blog")
     app.register_blueprint(admin_bp, url_prefix="/admin")
     app.register_blueprint(cart_bp, url_prefix="/cart")
+    app.register_blueprint(metrics_bp, url_prefix="/metrics")
+    app.register_blueprint(payment_bp, url_prefix="/payments")
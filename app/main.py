@@ -4,15 +4,31 @@ from flask_cors import CORS
 
 from app.core.config import settings
 from app.core.exceptions import AppError
-from app.infrastructure.db.session import engine
+from app.infrastructure.db.session import engine, replica_engines, SessionLocal
 from app.infrastructure.db.base import Base
+from app.infrastructure.search.fulltext import install_fulltext
+from app.infrastructure.search.suggest_index import install_suggest_index
+from app.infrastructure.cache.app_cache import cache
+from app.infrastructure.cache.category_map import install_category_map
+from app.infrastructure.repositories.cart_redis import install_cart_store
+from app.infrastructure.redis.worker_lease import install_order_numbers
+from app.infrastructure.payments.pipeline import install_payment_pipeline
+from app.infrastructure.outbox.dispatcher import install_outbox_metrics
+from app.infrastructure.sms.worker import install_sms_metrics
 from app.interfaces.http.routes import register_routes
+from app.interfaces.http.controllers import init_unit_of_work
+from app.interfaces.http.auth import init_auth
+from app.interfaces.http.rate_limit import init_rate_limiter
+from app.interfaces.http.json_provider import init_json_provider
+from app.interfaces.cli import register_commands
 
 FRONTEND_ORIGIN = 'http://localhost:5173'
 
 def create_app() -> Flask:
     app = Flask(__name__)
     app.config["SECRET_KEY"] = settings.SECRET_KEY
+    # jsonify() encodes Decimal / datetime / dataclasses itself (orjson if installed)
+    init_json_provider(app, backend=settings.JSON_BACKEND)
     # CORS(app, resources={r"/auth/*": {"origins": "http://localhost:5173"}}, supports_credentials=True)
     CORS(
         app,
@@ -24,6 +40,7 @@ def create_app() -> Flask:
             r"/blog/*": {"origins": FRONTEND_ORIGIN},
             r"/admin/*": {"origins": FRONTEND_ORIGIN},
             r"/cart/*": {"origins": FRONTEND_ORIGIN},
+            r"/payments/*": {"origins": FRONTEND_ORIGIN},
         },
         supports_credentials=True,
     )
@@ -44,18 +61,74 @@ def create_app() -> Flask:
     from app.domain.entities.payment import Payment
     from app.domain.entities.blog_post import BlogPost
     from app.domain.entities.setting import Setting
+    from app.domain.entities.product_sales_daily import ProductSalesDaily
+    from app.domain.entities.inventory_ledger import InventoryLedgerEntry
+    from app.domain.entities.outbox_event import OutboxEvent
     # (add any other entity files you create later)
 
     # -----------------------------
     # CREATE TABLES (DEV)
     # -----------------------------
     Base.metadata.create_all(bind=engine)
+    install_fulltext(engine, replicas=replica_engines)
+
+    # -----------------------------
+    # IN-MEMORY SEARCH INDEXES
+    # -----------------------------
+    if settings.SUGGEST_ENABLED:
+        install_suggest_index(SessionLocal, invalidation_source=cache)
+    install_category_map(invalidation_source=cache)
+
+    # -----------------------------
+    # CART STORE (CART_STORE=redis: write-behind to MariaDB)
+    # -----------------------------
+    install_cart_store(SessionLocal)
+
+    # -----------------------------
+    # ORDER NUMBERS (per-process worker id leased from Redis)
+    # -----------------------------
+    install_order_numbers()
+
+    # -----------------------------
+    # PAYMENTS (gateway calls on a bounded background pool)
+    # -----------------------------
+    install_payment_pipeline(SessionLocal)
+
+    # -----------------------------
+    # ORDER EVENTS (delivered by `flask outbox-dispatch`; backlog on /metrics)
+    # -----------------------------
+    install_outbox_metrics(SessionLocal)
+
+    # -----------------------------
+    # SMS (queued in Redis, sent by `flask sms-worker`; queue depth on /metrics)
+    # -----------------------------
+    install_sms_metrics()
+
+    # -----------------------------
+    # AUTHENTICATION (g.claims, once per request; the rate limiter keys on it)
+    # -----------------------------
+    init_auth(app)
+
+    # -----------------------------
+    # RATE LIMITS (before anything opens a DB session)
+    # -----------------------------
+    init_rate_limiter(app)
+
+    # -----------------------------
+    # REQUEST-SCOPED UNIT OF WORK
+    # -----------------------------
+    init_unit_of_work(app)
 
     # -----------------------------
     # REGISTER ROUTES
     # -----------------------------
     register_routes(app)
 
+    # -----------------------------
+    # CLI COMMANDS
+    # -----------------------------
+    register_commands(app)
+
     # -----------------------------
     # ERROR HANDLERS
     # -----------------------------
@@ -63,6 +136,7 @@ def create_app() -> Flask:
     def handle_app_error(err: AppError):
         resp = jsonify(err.to_dict())
         resp.status_code = err.status_code
+        resp.headers.update(err.headers)
         return resp
 
     @app.errorhandler(404)
@@ -0,0 +1,135 @@
+# benchmarks/json_encoding.py
+"""
+Serialize a page of the admin product listing (GET /admin/products,
+200 products by default) the old way and with the app's JSON providers.
+
+    python -m benchmarks.json_encoding                    # admin listing rows
+    python -m benchmarks.json_encoding --shape product    # full ProductService.to_dict rows
+    python -m benchmarks.json_encoding --items 500 --repeat 2000
+
+before:  rows built with float()/isoformat(), Flask's default provider
+after:   column values as they are, DecimalJSONProvider (stdlib, used
+         when orjson is missing) and FastJSONProvider (orjson)
+
+No database is needed: products are built in memory.
+"""
+import argparse
+import time
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.domain.entities.product import Product
+from app.domain.services.product_service import ProductService
+from app.interfaces.http.json_provider import DecimalJSONProvider, FastJSONProvider, orjson
+
+
+def _products(n: int):
+    return [
+        Product(
+            id=i,
+            title=f"گیفت کارت استیم {i} دلاری",
+            slug=f"steam-gift-card-{i}",
+            category_id=i % 12 + 1,
+            price=Decimal(f"{100_000 + i * 1250}.00"),
+            compare_at_price=Decimal(f"{120_000 + i * 1250}.00") if i % 3 else None,
+            delivery_type="INSTANT_CODE",
+            platform="steam",
+            duration=None,
+            region="global",
+            stock=i % 40,
+            is_active=i % 7 != 0,
+            image_url=f"https://cdn.example.com/products/{i}.webp",
+            short_description="تحویل فوری کد",
+            description="کد دیجیتال، قابل استفاده در تمام مناطق. " * 4,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def _admin_row_before(p: Product) -> dict:
+    return {
+        "id": p.id,
+        "title": p.title,
+        "price": float(p.price),
+        "is_active": p.is_active,
+    }
+
+
+def _admin_row_after(p: Product) -> dict:
+    return {
+        "id": p.id,
+        "title": p.title,
+        "price": p.price,
+        "is_active": p.is_active,
+    }
+
+
+_service = ProductService()
+
+
+def _product_row_before(p: Product) -> dict:
+    row = _service.to_dict(p)
+    row["price"] = float(p.price) if p.price is not None else None
+    row["compare_at_price"] = float(p.compare_at_price) if p.compare_at_price else None
+    return row
+
+
+SHAPES = {
+    "admin": (_admin_row_before, _admin_row_after),
+    "product": (_product_row_before, _service.to_dict),
+}
+
+
+def _bench(label: str, fn, repeat: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        size = len(fn())
+    per_call = (time.perf_counter() - start) / repeat
+    print(f"  {label:<34} {per_call * 1e6:9.1f} us/page   {size:7d} bytes")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200, help="products per page")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="admin")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    stdlib = DecimalJSONProvider(app)
+    backends = {"stdlib": stdlib.dumps}
+    if orjson is not None:
+        backends["orjson"] = FastJSONProvider(app).dumps_bytes
+
+    products = _products(args.items)
+    before_row, after_row = SHAPES[args.shape]
+
+    def page(row):
+        return {"items": [row(p) for p in products], "next_cursor": None}
+
+    print(f"{args.items} products ({args.shape} rows), {args.repeat} pages")
+    print("encode only:")
+    before_page = page(before_row)
+    after_page = page(after_row)
+    base = _bench("before (default provider)", lambda: default.dumps(before_page), args.repeat)
+    for name, encode in backends.items():
+        t = _bench(f"after ({name})", lambda: encode(after_page), args.repeat)
+        print(f"  {'':<34} {base / t:9.2f}x")
+
+    print("build rows + encode:")
+    base = _bench("before (default provider)", lambda: default.dumps(page(before_row)), args.repeat)
+    for name, encode in backends.items():
+        t = _bench(f"after ({name})", lambda: encode(page(after_row)), args.repeat)
+        print(f"  {'':<34} {base / t:9.2f}x")
+
+    if orjson is None:
+        print("(orjson is not installed: pip install orjson)")
+
+
+if __name__ == "__main__":
+    main()
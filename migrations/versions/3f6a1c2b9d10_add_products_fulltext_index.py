@@ -0,0 +1,36 @@
+"""add products fulltext index
+
+Revision ID: 3f6a1c2b9d10
+Revises: c11685a7fd86
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a1c2b9d10'
+down_revision: Union[str, Sequence[str], None] = 'c11685a7fd86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # MariaDB only; SQLite dev databases get an FTS5 table at app startup
+    if op.get_bind().dialect.name not in ("mysql", "mariadb"):
+        return
+    op.create_index(
+        "ft_products_search",
+        "products",
+        ["title", "slug", "platform"],
+        mysql_prefix="FULLTEXT",
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name not in ("mysql", "mariadb"):
+        return
+    op.drop_index("ft_products_search", table_name="products")
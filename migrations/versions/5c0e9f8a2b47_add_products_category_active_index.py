@@ -0,0 +1,30 @@
+"""add products (category_id, is_active, id) index
+
+Revision ID: 5c0e9f8a2b47
+Revises: d4a97e3b6f21
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e9f8a2b47'
+down_revision: Union[str, Sequence[str], None] = 'd4a97e3b6f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_products_category_active_id",
+        "products",
+        ["category_id", "is_active", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_products_category_active_id", table_name="products")
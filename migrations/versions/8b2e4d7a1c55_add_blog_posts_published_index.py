@@ -0,0 +1,30 @@
+"""add blog_posts published index
+
+Revision ID: 8b2e4d7a1c55
+Revises: 3f6a1c2b9d10
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d7a1c55'
+down_revision: Union[str, Sequence[str], None] = '3f6a1c2b9d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_blog_posts_published",
+        "blog_posts",
+        ["is_published", "published_at", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_blog_posts_published", table_name="blog_posts")
@@ -0,0 +1,55 @@
+"""add inventory_ledger and orders (status, created_at) index
+
+Revision ID: a7d3c5e1f902
+Revises: 5c0e9f8a2b47
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3c5e1f902'
+down_revision: Union[str, Sequence[str], None] = '5c0e9f8a2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "inventory_ledger",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=True),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(length=30), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_inventory_ledger_product_id_id",
+        "inventory_ledger",
+        ["product_id", "id"],
+    )
+    op.create_index(
+        op.f("ix_inventory_ledger_order_id"),
+        "inventory_ledger",
+        ["order_id"],
+    )
+    op.create_index(
+        "ix_orders_status_created_at",
+        "orders",
+        ["status", "created_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_orders_status_created_at", table_name="orders")
+    op.drop_index(op.f("ix_inventory_ledger_order_id"), table_name="inventory_ledger")
+    op.drop_index("ix_inventory_ledger_product_id_id", table_name="inventory_ledger")
+    op.drop_table("inventory_ledger")
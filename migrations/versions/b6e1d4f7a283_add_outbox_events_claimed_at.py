@@ -0,0 +1,27 @@
+"""add outbox_events.claimed_at
+
+Revision ID: b6e1d4f7a283
+Revises: a9c4e7f1b305
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d4f7a283'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e7f1b305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # the claim delivering a PROCESSING event (its lease ends at available_at)
+    op.add_column("outbox_events", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("outbox_events", "claimed_at")
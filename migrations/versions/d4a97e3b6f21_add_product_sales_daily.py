@@ -0,0 +1,46 @@
+"""add product_sales_daily rollup
+
+Revision ID: d4a97e3b6f21
+Revises: 8b2e4d7a1c55
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a97e3b6f21'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d7a1c55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "product_sales_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("orders_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("units_sold", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.DECIMAL(14, 2), nullable=False, server_default="0"),
+        sa.Column("paid_units", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("paid_revenue", sa.DECIMAL(14, 2), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("day", "product_id"),
+    )
+    op.create_index(
+        op.f("ix_product_sales_daily_product_id"),
+        "product_sales_daily",
+        ["product_id"],
+        unique=False,
+    )
+    # run `flask --app app.main sales-rollup-backfill` after upgrading
+
+
+def downgrade():
+    op.drop_index(op.f("ix_product_sales_daily_product_id"), table_name="product_sales_daily")
+    op.drop_table("product_sales_daily")
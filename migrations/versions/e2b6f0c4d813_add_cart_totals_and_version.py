@@ -0,0 +1,47 @@
+"""add carts total_amount, item_count, version
+
+Revision ID: e2b6f0c4d813
+Revises: a7d3c5e1f902
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6f0c4d813'
+down_revision: Union[str, Sequence[str], None] = 'a7d3c5e1f902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column(
+        "carts",
+        sa.Column("total_amount", sa.DECIMAL(precision=12, scale=2), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "carts",
+        sa.Column("item_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "carts",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # backfill from the existing items
+    op.execute(
+        """
+        UPDATE carts SET
+            total_amount = COALESCE((SELECT SUM(ci.line_total) FROM cart_items ci WHERE ci.cart_id = carts.id), 0),
+            item_count = COALESCE((SELECT SUM(ci.quantity) FROM cart_items ci WHERE ci.cart_id = carts.id), 0)
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("carts", "version")
+    op.drop_column("carts", "item_count")
+    op.drop_column("carts", "total_amount")
@@ -0,0 +1,32 @@
+"""add unique payments.gateway_ref index
+
+Revision ID: f3c8a1d9e264
+Revises: e2b6f0c4d813
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d9e264'
+down_revision: Union[str, Sequence[str], None] = 'e2b6f0c4d813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # gateway callbacks look payments up by authority
+    op.create_index(
+        op.f("ix_payments_gateway_ref"),
+        "payments",
+        ["gateway_ref"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_payments_gateway_ref"), table_name="payments")